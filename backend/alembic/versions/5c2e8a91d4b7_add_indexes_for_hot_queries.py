@@ -0,0 +1,51 @@
+"""Add indexes for hot queries
+
+Revision ID: 5c2e8a91d4b7
+Revises: 39bf1f296fd5
+Create Date: 2026-10-18 10:12:45.318204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e8a91d4b7"
+down_revision: Union[str, None] = "39bf1f296fd5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (index name, table, columns). ``init_db`` creates these for fresh databases
+# through the model metadata, so every create is guarded with if_not_exists.
+INDEXES = [
+    (
+        "ix_players_pool_assignment_rank",
+        "players",
+        ["pool_assignment", "composite_rank"],
+    ),
+    ("ix_drafts_pair_id_status", "drafts", ["pair_id", "status"]),
+    (
+        "ix_draft_picks_draft_id_pick_number",
+        "draft_picks",
+        ["draft_id", "pick_number"],
+    ),
+    ("ix_league_users_league_id_user_id", "league_users", ["league_id", "user_id"]),
+    ("ix_league_users_user_id", "league_users", ["user_id"]),
+    ("ix_league_users_pair_id", "league_users", ["pair_id"]),
+    (
+        "ix_draft_pairs_league_id_pool_number",
+        "draft_pairs",
+        ["league_id", "pool_number"],
+    ),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False, if_not_exists=True)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,80 @@
+"""Add trending time-series tables
+
+Revision ID: 8d41f0c7a2e3
+Revises: 5c2e8a91d4b7
+Create Date: 2026-10-18 11:40:02.771950
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d41f0c7a2e3"
+down_revision: Union[str, None] = "5c2e8a91d4b7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # init_db creates these tables from the models on fresh databases
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if "trending_samples" in existing:
+        return
+
+    op.create_table(
+        "trending_samples",
+        sa.Column("sleeper_id", sa.String(), nullable=False),
+        sa.Column("bucket", sa.Integer(), nullable=False),
+        sa.Column("adds", sa.Integer(), nullable=False),
+        sa.Column("drops", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("sleeper_id", "bucket"),
+    )
+    op.create_index(
+        "ix_trending_samples_bucket",
+        "trending_samples",
+        ["bucket"],
+        unique=False,
+    )
+    op.create_table(
+        "trending_aggregates",
+        sa.Column("sleeper_id", sa.String(), nullable=False),
+        sa.Column("window_hours", sa.Integer(), nullable=False),
+        sa.Column("adds", sa.Integer(), nullable=False),
+        sa.Column("drops", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("sleeper_id", "window_hours"),
+    )
+    op.create_index(
+        "ix_trending_aggregates_window_adds",
+        "trending_aggregates",
+        ["window_hours", "adds"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_trending_aggregates_window_drops",
+        "trending_aggregates",
+        ["window_hours", "drops"],
+        unique=False,
+    )
+    op.create_table(
+        "trending_windows",
+        sa.Column("window_hours", sa.Integer(), nullable=False),
+        sa.Column("first_bucket", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("window_hours"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("trending_windows")
+    op.drop_index(
+        "ix_trending_aggregates_window_drops", table_name="trending_aggregates"
+    )
+    op.drop_index(
+        "ix_trending_aggregates_window_adds", table_name="trending_aggregates"
+    )
+    op.drop_table("trending_aggregates")
+    op.drop_index("ix_trending_samples_bucket", table_name="trending_samples")
+    op.drop_table("trending_samples")
@@ -0,0 +1,46 @@
+"""Add refresh sessions table
+
+Revision ID: a3d7e9b2c418
+Revises: f1c8a4e6d305
+Create Date: 2026-10-19 21:14:07.261903
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a3d7e9b2c418"
+down_revision: Union[str, None] = "f1c8a4e6d305"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # init_db creates this table from the models on fresh databases
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if "refresh_sessions" in existing:
+        return
+
+    op.create_table(
+        "refresh_sessions",
+        sa.Column("id", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=False),
+        sa.Column("jti", sa.String(), nullable=False),
+        sa.Column("expires_at", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_refresh_sessions_expires_at",
+        "refresh_sessions",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_refresh_sessions_expires_at", table_name="refresh_sessions")
+    op.drop_table("refresh_sessions")
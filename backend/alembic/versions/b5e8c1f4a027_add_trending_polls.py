@@ -0,0 +1,37 @@
+"""Add trending poll claims table
+
+Revision ID: b5e8c1f4a027
+Revises: a3d7e9b2c418
+Create Date: 2026-10-19 23:02:48.617204
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b5e8c1f4a027"
+down_revision: Union[str, None] = "a3d7e9b2c418"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # init_db creates this table from the models on fresh databases
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if "trending_polls" in existing:
+        return
+
+    op.create_table(
+        "trending_polls",
+        sa.Column("poll_at", sa.Integer(), nullable=False),
+        sa.Column("claimed_at", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("poll_at"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("trending_polls")
@@ -0,0 +1,52 @@
+"""Add projections table
+
+Revision ID: b7e3d2a6f915
+Revises: 8d41f0c7a2e3
+Create Date: 2026-10-19 09:05:31.604877
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7e3d2a6f915"
+down_revision: Union[str, None] = "8d41f0c7a2e3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # init_db creates this table from the models on fresh databases
+    if "projections" in sa.inspect(op.get_bind()).get_table_names():
+        return
+
+    op.create_table(
+        "projections",
+        sa.Column("sleeper_id", sa.String(), nullable=False),
+        sa.Column("season", sa.Integer(), nullable=False),
+        sa.Column("week", sa.Integer(), nullable=False),
+        sa.Column("points", sa.Float(), nullable=False),
+        sa.Column("games_sampled", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("(CURRENT_TIMESTAMP)"),
+            nullable=True,
+        ),
+        sa.PrimaryKeyConstraint("sleeper_id", "season", "week"),
+    )
+    op.create_index(
+        "ix_projections_season_week_points",
+        "projections",
+        ["season", "week", "points"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_projections_season_week_points", table_name="projections")
+    op.drop_table("projections")
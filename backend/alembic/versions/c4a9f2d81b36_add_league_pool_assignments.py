@@ -0,0 +1,50 @@
+"""Add league-scoped pool assignments
+
+Revision ID: c4a9f2d81b36
+Revises: b7e3d2a6f915
+Create Date: 2026-10-19 09:12:44.518203
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4a9f2d81b36"
+down_revision: Union[str, None] = "b7e3d2a6f915"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # init_db creates this table from the models on fresh databases
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if "league_pool_assignments" in existing:
+        return
+
+    op.create_table(
+        "league_pool_assignments",
+        sa.Column("league_id", sa.String(), nullable=False),
+        sa.Column("player_id", sa.String(), nullable=False),
+        sa.Column("pool_number", sa.Integer(), nullable=False),
+        sa.Column("composite_rank", sa.Float(), nullable=True),
+        sa.ForeignKeyConstraint(["league_id"], ["leagues.id"]),
+        sa.ForeignKeyConstraint(["player_id"], ["players.id"]),
+        sa.PrimaryKeyConstraint("league_id", "player_id"),
+    )
+    op.create_index(
+        "ix_league_pool_assignments_pool_rank",
+        "league_pool_assignments",
+        ["league_id", "pool_number", "composite_rank", "player_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_league_pool_assignments_pool_rank", table_name="league_pool_assignments"
+    )
+    op.drop_table("league_pool_assignments")
@@ -0,0 +1,67 @@
+"""Unique league memberships and a league seat counter
+
+Revision ID: d8b1e4c7f203
+Revises: c4a9f2d81b36
+Create Date: 2026-10-19 14:03:27.904117
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d8b1e4c7f203"
+down_revision: Union[str, None] = "c4a9f2d81b36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX = "ix_league_users_league_id_user_id"
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+
+    # init_db creates the column from the models on fresh databases
+    columns = {column["name"] for column in inspector.get_columns("leagues")}
+    if "member_count" not in columns:
+        op.add_column(
+            "leagues",
+            sa.Column("member_count", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+    # Keep the earliest row of each duplicated membership
+    op.execute(
+        """
+        DELETE FROM league_users
+        WHERE user_id IS NOT NULL
+          AND id NOT IN (
+            SELECT MIN(id) FROM league_users
+            WHERE user_id IS NOT NULL
+            GROUP BY league_id, user_id
+          )
+        """
+    )
+    op.execute(
+        """
+        UPDATE leagues SET member_count = (
+            SELECT COUNT(*) FROM league_users
+            WHERE league_users.league_id = leagues.id
+        )
+        """
+    )
+
+    indexes = {index["name"]: index for index in inspector.get_indexes("league_users")}
+    if not indexes.get(INDEX, {}).get("unique"):
+        if INDEX in indexes:
+            op.drop_index(INDEX, table_name="league_users")
+        op.create_index(INDEX, "league_users", ["league_id", "user_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX, table_name="league_users")
+    op.create_index(INDEX, "league_users", ["league_id", "user_id"], unique=False)
+    with op.batch_alter_table("leagues") as batch_op:
+        batch_op.drop_column("member_count")
@@ -0,0 +1,53 @@
+"""Add revoked tokens table
+
+Revision ID: e5f29c3a7b14
+Revises: d8b1e4c7f203
+Create Date: 2026-10-19 17:22:41.508316
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5f29c3a7b14"
+down_revision: Union[str, None] = "d8b1e4c7f203"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # init_db creates this table from the models on fresh databases
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    if "revoked_tokens" in existing:
+        return
+
+    op.create_table(
+        "revoked_tokens",
+        sa.Column("jti", sa.String(), nullable=False),
+        sa.Column("user_id", sa.String(), nullable=True),
+        sa.Column("expires_at", sa.Integer(), nullable=False),
+        sa.Column("revoked_at", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("jti"),
+    )
+    op.create_index(
+        "ix_revoked_tokens_revoked_at",
+        "revoked_tokens",
+        ["revoked_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_revoked_tokens_expires_at",
+        "revoked_tokens",
+        ["expires_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_revoked_tokens_expires_at", table_name="revoked_tokens")
+    op.drop_index("ix_revoked_tokens_revoked_at", table_name="revoked_tokens")
+    op.drop_table("revoked_tokens")
@@ -0,0 +1,41 @@
+"""Add the shared player catalog version row
+
+Revision ID: f1c8a4e6d305
+Revises: e5f29c3a7b14
+Create Date: 2026-10-19 19:05:12.334871
+
+"""
+
+import uuid
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c8a4e6d305"
+down_revision: Union[str, None] = "e5f29c3a7b14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    # init_db creates this table from the models on fresh databases
+    if "catalog_version" not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            "catalog_version",
+            sa.Column("id", sa.Integer(), nullable=False),
+            sa.Column("version", sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint("id"),
+        )
+
+    table = sa.table("catalog_version", sa.column("id"), sa.column("version"))
+    if not bind.execute(sa.select(sa.func.count()).select_from(table)).scalar():
+        op.bulk_insert(table, [{"id": 1, "version": uuid.uuid4().hex[:16]}])
+
+
+def downgrade() -> None:
+    op.drop_table("catalog_version")
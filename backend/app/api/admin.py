@@ -0,0 +1,223 @@
+import hmac
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from pydantic import BaseModel, EmailStr, Field
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.auth.principal_cache import principal_cache
+from app.auth.utils import hash_password_async, token_cache
+from app.config import get_settings
+from app.database import get_db
+from app.models import Draft, DraftPair, League, LeagueUser, User
+from app.services.league_cache import league_detail_cache
+from app.services.league_pools import DEFAULT_NUM_POOLS, league_settings
+
+settings = get_settings()
+
+# Emails per SELECT ... IN (...) when looking up existing users
+LOOKUP_CHUNK = 500
+
+
+async def require_admin(x_admin_key: Optional[str] = Header(None)):
+    """Admin endpoints need ``X-Admin-Key`` to match the configured key; with
+    no key configured they are disabled"""
+    if not settings.admin_api_key or not hmac.compare_digest(
+        (x_admin_key or "").encode(), settings.admin_api_key.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN, detail="Admin key required"
+        )
+
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+class MemberSpec(BaseModel):
+    email: EmailStr
+    username: Optional[str] = None
+    display_name: Optional[str] = None
+
+
+class LeagueSpec(BaseModel):
+    name: str
+    num_pools: int = Field(DEFAULT_NUM_POOLS, ge=1, le=64)
+    position_requirements: Optional[Dict[str, int]] = None
+    members: List[MemberSpec] = Field(..., min_length=1)
+
+
+class BulkLeaguesRequest(BaseModel):
+    leagues: List[LeagueSpec] = Field(..., min_length=1, max_length=5000)
+    # Password for every user this request registers
+    password: str = Field(..., min_length=1)
+    create_pairs: bool = True
+    start_drafts: bool = False
+
+
+@router.post("/leagues/bulk")
+async def provision_leagues(request: BulkLeaguesRequest, db: Session = Depends(get_db)):
+    """Create leagues with their members, pairs and drafts in one transaction.
+
+    Members are matched to existing users by email and registered otherwise,
+    all sharing one password hash. The first member is the commissioner.
+    With ``create_pairs`` each league needs exactly ``2 * num_pools`` members
+    and members are paired in the order given; ``start_drafts`` also starts
+    every pair's draft. Every table is written with one bulk insert.
+    """
+    started = time.perf_counter()
+    if request.start_drafts and not request.create_pairs:
+        raise HTTPException(status_code=400, detail="start_drafts needs create_pairs")
+
+    all_settings = []
+    for n, spec in enumerate(request.leagues):
+        emails = [member.email for member in spec.members]
+        if len(set(emails)) != len(emails):
+            raise HTTPException(
+                status_code=400, detail=f"League {n}: duplicate member emails"
+            )
+        limit = 2 * spec.num_pools
+        if request.create_pairs and len(emails) != limit:
+            raise HTTPException(
+                status_code=400, detail=f"League {n}: needs exactly {limit} members"
+            )
+        if len(emails) > limit:
+            raise HTTPException(
+                status_code=400, detail=f"League {n}: at most {limit} members"
+            )
+        try:
+            all_settings.append(
+                league_settings(spec.num_pools, spec.position_requirements)
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"League {n}: {e}")
+
+    # Existing users by email, then one row per new email
+    members = {m.email: m for spec in request.leagues for m in spec.members}
+    emails = list(members)
+    user_ids: Dict[str, str] = {}
+    for start in range(0, len(emails), LOOKUP_CHUNK):
+        chunk = emails[start : start + LOOKUP_CHUNK]
+        user_ids.update(db.query(User.email, User.id).filter(User.email.in_(chunk)))
+    attached = len(user_ids)
+
+    password_hash = await hash_password_async(request.password)
+    new_users = []
+    for email, member in members.items():
+        if email not in user_ids:
+            user_ids[email] = str(uuid.uuid4())
+            new_users.append(
+                {
+                    "id": user_ids[email],
+                    "email": email,
+                    "username": member.username or email,
+                    "password_hash": password_hash,
+                    "is_active": True,
+                    "is_verified": True,
+                }
+            )
+
+    now = datetime.now(timezone.utc)
+    league_rows, pair_rows = [], []
+    for spec, league_config in zip(request.leagues, all_settings):
+        league_id = str(uuid.uuid4())
+        league_rows.append(
+            {
+                "id": league_id,
+                "name": spec.name,
+                "commissioner_id": user_ids[spec.members[0].email],
+                "status": "draft_ready" if request.create_pairs else "setup",
+                "settings": league_config,
+                "member_count": len(spec.members),
+            }
+        )
+        if request.create_pairs:
+            pair_rows.extend(
+                {"league_id": league_id, "pool_number": i, "draft_order": i}
+                for i in range(spec.num_pools)
+            )
+
+    try:
+        if new_users:
+            db.execute(insert(User), new_users)
+        db.execute(insert(League), league_rows)
+        pair_ids = []
+        if pair_rows:
+            pair_ids = db.scalars(
+                insert(DraftPair).returning(DraftPair.id, sort_by_parameter_order=True),
+                pair_rows,
+            ).all()
+
+        member_rows, draft_rows, results = [], [], []
+        next_pair = 0
+        for spec, league in zip(request.leagues, league_rows):
+            pairs = []
+            for i, member in enumerate(spec.members):
+                pair_id = pair_ids[next_pair + i // 2] if request.create_pairs else None
+                member_rows.append(
+                    {
+                        "league_id": league["id"],
+                        "user_id": user_ids[member.email],
+                        "email": member.email,
+                        "display_name": member.display_name
+                        or member.username
+                        or member.email,
+                        "pair_id": pair_id,
+                    }
+                )
+                if pair_id is None or i % 2:
+                    continue
+                draft_id = None
+                if request.start_drafts:
+                    draft_id = str(uuid.uuid4())
+                    draft_rows.append(
+                        {
+                            "id": draft_id,
+                            "pair_id": pair_id,
+                            "status": "active",
+                            "current_picker_id": user_ids[member.email],
+                            "started_at": now,
+                        }
+                    )
+                pairs.append(
+                    {"pair_id": pair_id, "pool_number": i // 2, "draft_id": draft_id}
+                )
+            if request.create_pairs:
+                next_pair += spec.num_pools
+            results.append(
+                {
+                    "id": league["id"],
+                    "name": league["name"],
+                    "members": len(spec.members),
+                    "pairs": pairs,
+                }
+            )
+
+        db.execute(insert(LeagueUser), member_rows)
+        if draft_rows:
+            db.execute(insert(Draft), draft_rows)
+        db.commit()
+    except IntegrityError as e:
+        db.rollback()
+        raise HTTPException(status_code=409, detail=f"Conflicting rows: {e.orig}")
+
+    return {
+        "leagues": results,
+        "users_created": len(new_users),
+        "users_attached": attached,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+
+@router.get("/caches")
+async def cache_stats():
+    """Size and hit/miss counters of this worker's in-process caches"""
+    return {
+        "tokens": token_cache.stats(),
+        "principals": principal_cache.stats(),
+        "league_detail": league_detail_cache.stats(),
+    }
@@ -1,19 +1,25 @@
 import uuid
 from datetime import datetime, timezone
+from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr
 from sqlalchemy.orm import Session
 
-from app.auth.dependencies import get_current_active_user
+from app.auth.dependencies import get_current_active_user, oauth2_scheme
+from app.auth.revocation import (
+    end_refresh_session,
+    revocation_list,
+    rotate_refresh_token,
+    start_refresh_session,
+)
 from app.auth.utils import (
     create_access_token,
-    create_refresh_token,
     create_verification_token,
     decode_token,
-    get_password_hash,
-    verify_password,
+    hash_password_async,
+    verify_password_async,
 )
 from app.database import get_db
 from app.models import User
@@ -56,6 +62,10 @@ class RefreshTokenRequest(BaseModel):
     refresh_token: str
 
 
+class LogoutRequest(BaseModel):
+    refresh_token: Optional[str] = None
+
+
 @router.post("/register", response_model=UserResponse)
 async def register(user_data: UserRegister, db: Session = Depends(get_db)):
     """Register a new user"""
@@ -82,7 +92,7 @@ async def register(user_data: UserRegister, db: Session = Depends(get_db)):
         id=str(uuid.uuid4()),
         email=user_data.email,
         username=user_data.username,
-        password_hash=get_password_hash(user_data.password),
+        password_hash=await hash_password_async(user_data.password),
         verification_token=create_verification_token(user_data.email),
     )
 
@@ -107,20 +117,27 @@ async def login(
         .first()
     )
 
-    if not user or not verify_password(form_data.password, user.password_hash):
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await verify_password_async(
+            form_data.password, user.password_hash
+        )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Update last login
+    # Update last login, and the hash if it was made with an old cost
     user.last_login = datetime.now(timezone.utc)
+    if new_hash:
+        user.password_hash = new_hash
     db.commit()
 
     # Create tokens
     access_token = create_access_token(data={"sub": user.id})
-    refresh_token = create_refresh_token(data={"sub": user.id})
+    refresh_token = start_refresh_session(db, user.id)
 
     return {
         "access_token": access_token,
@@ -149,9 +166,15 @@ async def refresh_token(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found"
         )
 
-    # Create new tokens
+    # Rotate: each refresh token is good for one refresh, even when two
+    # workers see it at once. Tokens without a session are rejected.
+    refresh_token = rotate_refresh_token(db, payload)
+    if refresh_token is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
+        )
+
     access_token = create_access_token(data={"sub": user.id})
-    refresh_token = create_refresh_token(data={"sub": user.id})
 
     return {
         "access_token": access_token,
@@ -167,9 +190,19 @@ async def get_current_user_info(current_user: User = Depends(get_current_active_
 
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_active_user)):
-    """Logout current user (client should delete tokens)"""
-    # In a production app, you might want to blacklist the token
+async def logout(
+    logout_request: Optional[LogoutRequest] = None,
+    token: str = Depends(oauth2_scheme),
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db),
+):
+    """Logout current user, revoking the access token and, when given, ending
+    the refresh token's session"""
+    revocation_list.revoke(db, decode_token(token))
+    if logout_request and logout_request.refresh_token:
+        payload = decode_token(logout_request.refresh_token)
+        if payload and payload.get("type") == "refresh":
+            end_refresh_session(db, payload, current_user.id)
     return {"message": "Successfully logged out"}
 
 
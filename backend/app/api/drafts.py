@@ -7,7 +7,10 @@ from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import Draft, DraftPair, DraftPick, LeagueUser, Player
-from app.schemas import DraftBase, DraftPickBase, LeagueUserBase, PlayerBase
+from app.models.draft import DRAFT_PICKS
+from app.schemas import DraftBase, DraftPickBase, LeagueUserBase
+from app.services.league_cache import league_detail_cache
+from app.services.league_pools import available_players, player_pool
 
 router = APIRouter()
 
@@ -48,6 +51,7 @@ async def start_draft(request: StartDraftRequest, db: Session = Depends(get_db))
     )
     db.add(draft)
     db.commit()
+    league_detail_cache.pop(pair.league_id)
 
     return {
         "draft": {
@@ -80,7 +84,7 @@ async def make_pick(request: MakePickRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Player not found")
 
     pair = db.query(DraftPair).filter_by(id=draft.pair_id).first()
-    if player.pool_assignment != pair.pool_number:
+    if player_pool(db, pair.league_id, player) != pair.pool_number:
         raise HTTPException(status_code=400, detail="Player not available in your pool")
 
     already_picked = (
@@ -103,13 +107,13 @@ async def make_pick(request: MakePickRequest, db: Session = Depends(get_db)):
     other_user = next(u for u in users if u.user_id != request.user_id)
     draft.current_picker_id = other_user.user_id
 
-    total_picks = pick_number
-    max_picks = 30
-    if total_picks >= max_picks:
+    if pick_number >= DRAFT_PICKS:
         draft.status = "completed"
         draft.completed_at = datetime.now(timezone.utc)
 
     db.commit()
+    if draft.status == "completed":
+        league_detail_cache.pop(pair.league_id)
 
     return {
         "pick": pick,
@@ -135,33 +139,16 @@ async def get_draft(draft_id: str, db: Session = Depends(get_db)):
     pair = db.query(DraftPair).filter_by(id=draft.pair_id).first()
     users = db.query(LeagueUser).filter_by(pair_id=pair.id).all()
 
-    # Get available players - handle empty picks list
-    picked_player_ids = [p.player_id for p in picks] if picks else []
-    if picked_player_ids:
-        available_players = (
-            db.query(Player)
-            .filter(
-                Player.pool_assignment == pair.pool_number,
-                ~Player.id.in_(picked_player_ids),
-            )
-            .order_by(Player.composite_rank)
-            .all()
-        )
-    else:
-        available_players = (
-            db.query(Player)
-            .filter(Player.pool_assignment == pair.pool_number)
-            .order_by(Player.composite_rank)
-            .all()
-        )
+    picked_player_ids = {p.player_id for p in picks}
+    available = available_players(
+        db, pair.league_id, pair.pool_number, picked_player_ids
+    )
 
     return {
         "draft": DraftBase.model_validate(draft).model_dump(),
         "users": [LeagueUserBase.model_validate(u).model_dump() for u in users],
         "picks": [DraftPickBase.model_validate(p).model_dump() for p in picks],
-        "available_players": [
-            PlayerBase.model_validate(p).model_dump() for p in available_players
-        ],
+        "available_players": available,
         "current_picker": draft.current_picker_id,
     }
 
@@ -1,63 +1,109 @@
+import asyncio
 import random
 import uuid
+from functools import partial
+from typing import Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel, Field
+from sqlalchemy import and_, func, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, aliased, selectinload
 
 from app.auth.dependencies import get_current_user
+from app.config import get_settings
 from app.database import get_db
-from app.models import DraftPair, League, LeagueUser, User
+from app.models import Draft, DraftPair, League, LeagueUser, User
+from app.schemas import (
+    ActiveDraftSummary,
+    DraftPairBase,
+    DraftSummary,
+    LeagueBase,
+    LeagueDetail,
+    LeagueUserBase,
+    MyLeagueSummary,
+)
+from app.services.draft_simulation import STRATEGIES, simulate_pools
+from app.services.league_cache import league_detail_cache
+from app.services.league_pools import (
+    DEFAULT_NUM_POOLS,
+    current_layout,
+    division_service,
+    league_settings,
+    pool_rosters,
+    pool_settings,
+    save_changes,
+)
+from app.services.pool_search import (
+    MAX_SEEDS,
+    load_division_players,
+    run_division,
+)
 
 router = APIRouter()
+settings = get_settings()
 
 
-@router.get("/my-leagues")
+@router.get("/my-leagues", response_model=List[MyLeagueSummary])
 async def get_my_leagues(
     current_user: User = Depends(get_current_user), db: Session = Depends(get_db)
 ):
-    """Get all leagues the current user is in"""
-    # Get all league memberships for the user
-    league_users = db.query(LeagueUser).filter_by(user_id=current_user.id).all()
-
-    # Get the league details for each membership
-    user_leagues = []
-    for lu in league_users:
-        league = db.query(League).filter_by(id=lu.league_id).first()
-        if league:
-            # Get user count for each league
-            user_count = db.query(LeagueUser).filter_by(league_id=league.id).count()
-
-            # Check if user has an active draft
-            from app.models import Draft
-
-            active_draft = None
-            if lu.pair_id:
-                draft = (
-                    db.query(Draft)
-                    .filter_by(pair_id=lu.pair_id, status="active")
-                    .first()
-                )
-                if draft:
-                    active_draft = {"id": draft.id, "status": draft.status}
-
-            user_leagues.append(
-                {
-                    "league": league,
-                    "user_count": user_count,
-                    "my_pair_id": lu.pair_id,
-                    "active_draft": active_draft,
-                    "is_commissioner": league.commissioner_id == current_user.id,
-                }
-            )
+    """Get all leagues the current user is in.
+
+    One query: each membership joined to its league, the league's member
+    count (grouped over just this user's leagues) and, through an outer join,
+    the active draft of the user's pair if there is one.
+    """
+    my_league_ids = db.query(LeagueUser.league_id).filter(
+        LeagueUser.user_id == current_user.id
+    )
+    members = aliased(LeagueUser)
+    member_counts = (
+        db.query(members.league_id, func.count(members.id).label("user_count"))
+        .filter(members.league_id.in_(my_league_ids))
+        .group_by(members.league_id)
+        .subquery()
+    )
+    rows = (
+        db.query(
+            League,
+            LeagueUser.pair_id,
+            member_counts.c.user_count,
+            Draft.id,
+            Draft.status,
+        )
+        .join(LeagueUser, LeagueUser.league_id == League.id)
+        .join(member_counts, member_counts.c.league_id == League.id)
+        .outerjoin(
+            Draft, and_(Draft.pair_id == LeagueUser.pair_id, Draft.status == "active")
+        )
+        .filter(LeagueUser.user_id == current_user.id)
+        .order_by(LeagueUser.id)
+        .all()
+    )
 
-    return user_leagues
+    return [
+        MyLeagueSummary(
+            league=LeagueBase.model_validate(league),
+            user_count=user_count,
+            my_pair_id=pair_id,
+            active_draft=(
+                ActiveDraftSummary(id=draft_id, status=draft_status)
+                if draft_id
+                else None
+            ),
+            is_commissioner=league.commissioner_id == current_user.id,
+        )
+        for league, pair_id, user_count, draft_id, draft_status in rows
+    ]
 
 
 class CreateLeagueRequest(BaseModel):
     name: str
     commissioner_name: str
     commissioner_email: str
+    num_pools: int = Field(DEFAULT_NUM_POOLS, ge=1, le=64)
+    position_requirements: Optional[Dict[str, int]] = None
 
 
 class JoinLeagueRequest(BaseModel):
@@ -73,23 +119,17 @@ async def create_league(
     db: Session = Depends(get_db),
 ):
     """Create a new league"""
+    try:
+        new_settings = league_settings(request.num_pools, request.position_requirements)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     league = League(
         id=str(uuid.uuid4()),
         name=request.name,
         commissioner_id=current_user.id,
-        settings={
-            "roster_spots": {
-                "QB": 1,
-                "RB": 2,
-                "WR": 2,
-                "TE": 1,
-                "FLEX": 1,
-                "K": 1,
-                "DEF": 1,
-                "BENCH": 6,
-            },
-            "scoring": "PPR",
-        },
+        settings=new_settings,
+        member_count=1,
     )
     db.add(league)
 
@@ -111,24 +151,17 @@ async def join_league(
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
-    """Join an existing league"""
+    """Join an existing league.
+
+    The membership insert and the seat claim (a conditional UPDATE of
+    ``member_count``) commit together, so concurrent joins can neither
+    overfill the league nor add someone twice: the unique (league_id,
+    user_id) index rejects the second insert.
+    """
     league = db.query(League).filter_by(id=request.league_id).first()
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
 
-    # Check if current user is already in the league
-    existing_user = (
-        db.query(LeagueUser)
-        .filter_by(league_id=league.id, user_id=current_user.id)
-        .first()
-    )
-    if existing_user:
-        raise HTTPException(status_code=400, detail="You are already in this league")
-
-    current_users = db.query(LeagueUser).filter_by(league_id=league.id).count()
-    if current_users >= 12:
-        raise HTTPException(status_code=400, detail="League is full")
-
     user = LeagueUser(
         league_id=league.id,
         user_id=current_user.id,
@@ -136,7 +169,25 @@ async def join_league(
         display_name=request.user_name or current_user.username,
     )
     db.add(user)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="You are already in this league")
+
+    num_pools, _ = pool_settings(league)
+    claimed = db.execute(
+        update(League)
+        .where(League.id == league.id, League.member_count < 2 * num_pools)
+        .values(member_count=League.member_count + 1)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not claimed:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="League is full")
+
     db.commit()
+    league_detail_cache.pop(league.id)
 
     return {"message": "Successfully joined league", "user": user}
 
@@ -148,11 +199,15 @@ async def create_draft_pairs(league_id: str, db: Session = Depends(get_db)):
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
 
+    num_pools, _ = pool_settings(league)
     users = db.query(LeagueUser).filter_by(league_id=league_id).all()
-    if len(users) != 12:
+    if len(users) != 2 * num_pools:
         raise HTTPException(
             status_code=400,
-            detail=f"League needs exactly 12 users, currently has {len(users)}",
+            detail=(
+                f"League needs exactly {2 * num_pools} users, "
+                f"currently has {len(users)}"
+            ),
         )
 
     existing_pairs = db.query(DraftPair).filter_by(league_id=league_id).count()
@@ -161,12 +216,15 @@ async def create_draft_pairs(league_id: str, db: Session = Depends(get_db)):
 
     random.shuffle(users)
 
-    pairs_created = []
-    for i in range(6):
-        pair = DraftPair(league_id=league_id, pool_number=i, draft_order=i)
-        db.add(pair)
-        db.flush()
+    pairs = [
+        DraftPair(league_id=league_id, pool_number=i, draft_order=i)
+        for i in range(num_pools)
+    ]
+    db.add_all(pairs)
+    db.flush()
 
+    pairs_created = []
+    for i, pair in enumerate(pairs):
         users[i * 2].pair_id = pair.id
         users[i * 2 + 1].pair_id = pair.id
 
@@ -180,39 +238,166 @@ async def create_draft_pairs(league_id: str, db: Session = Depends(get_db)):
 
     league.status = "draft_ready"
     db.commit()
+    league_detail_cache.pop(league_id)
 
     return {"message": "Draft pairs created", "pairs": pairs_created}
 
 
-@router.get("/{league_id}")
-async def get_league(league_id: str, db: Session = Depends(get_db)):
-    """Get league details"""
+@router.post("/{league_id}/divide-pools")
+async def divide_league_pools(
+    league_id: str,
+    optimize: bool = False,
+    budget_ms: int = Query(200, ge=1, le=10000),
+    seeds: int = Query(0, ge=0, le=MAX_SEEDS),
+    time_limit_ms: int = Query(2000, ge=10, le=60000),
+    incremental: bool = False,
+    threshold_pct: float = Query(5.0, gt=0),
+    db: Session = Depends(get_db),
+):
+    """Divide players into this league's own pools.
+
+    Uses the league's ``num_pools`` and ``position_requirements`` and only
+    writes this league's changed assignments, so other leagues' drafts are
+    untouched. Options match the global divide-pools. Refused while one of
+    the league's drafts is active.
+    """
     league = db.query(League).filter_by(id=league_id).first()
     if not league:
         raise HTTPException(status_code=404, detail="League not found")
 
-    users = db.query(LeagueUser).filter_by(league_id=league_id).all()
-    pairs = db.query(DraftPair).filter_by(league_id=league_id).all()
-
-    # Get drafts for each pair
-    from app.models import Draft
-
-    drafts = {}
-    for pair in pairs:
-        draft = db.query(Draft).filter_by(pair_id=pair.id).first()
-        if draft:
-            drafts[pair.id] = {
-                "id": draft.id,
-                "status": draft.status,
-                "started_at": (
-                    draft.started_at.isoformat() if draft.started_at else None
-                ),
-            }
+    active = (
+        db.query(Draft.id)
+        .join(DraftPair, Draft.pair_id == DraftPair.id)
+        .filter(DraftPair.league_id == league_id, Draft.status == "active")
+        .first()
+    )
+    if active:
+        raise HTTPException(
+            status_code=400, detail="Cannot re-pool a league with an active draft"
+        )
+
+    pool_service = division_service(league)
+    players = load_division_players(db, pool_service.positions)
+    needed = sum(pool_service.position_requirements.values()) * pool_service.num_pools
+    if len(players) < needed:
+        raise HTTPException(
+            status_code=400, detail="Not enough players to create pools"
+        )
+
+    result = await asyncio.get_running_loop().run_in_executor(
+        None,
+        partial(
+            run_division,
+            players,
+            service=pool_service,
+            optimize=optimize,
+            budget_ms=budget_ms,
+            seeds=seeds,
+            time_limit_ms=time_limit_ms,
+            current=current_layout(db, league_id),
+            threshold_pct=threshold_pct if incremental else None,
+        ),
+    )
+    pools = result["pools"]
+    save_changes(db, league_id, result["changes"])
+    db.commit()
 
     return {
-        "league": league,
-        "users": users,
-        "pairs": pairs,
-        "drafts": drafts,
-        "user_count": len(users),
+        "pools_created": len(pools),
+        "validation": result["validation"],
+        "pool_sizes": {idx: len(players) for idx, players in pools.items()},
+        "search": result["search"],
+        "optimization": result["optimization"],
+        "incremental": result["incremental"],
+        "rows_written": len(result["changes"]),
     }
+
+
+@router.post("/{league_id}/simulate-drafts")
+async def simulate_league_drafts(
+    league_id: str,
+    drafts: int = Query(1000, ge=1, le=100000),
+    time_limit_ms: int = Query(2000, ge=10, le=60000),
+    strategies: Optional[str] = Query(
+        None, description=f"Comma separated, from: {', '.join(STRATEGIES)}"
+    ),
+    seed: int = 0,
+    db: Session = Depends(get_db),
+):
+    """Simulate drafts in every pool and report the roster value gaps.
+
+    Each pool plays up to ``drafts`` simulated 30-pick drafts between bots
+    drawn from ``strategies`` (all of them by default), spread across worker
+    processes off the event loop, until ``time_limit_ms`` runs out.
+    """
+    league = db.query(League).filter_by(id=league_id).first()
+    if not league:
+        raise HTTPException(status_code=404, detail="League not found")
+
+    names = (
+        [s.strip() for s in strategies.split(",") if s.strip()] if strategies else []
+    )
+    unknown = [name for name in names if name not in STRATEGIES]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown strategies: {', '.join(unknown)}"
+        )
+
+    pools = pool_rosters(db, league_id)
+    if not pools:
+        raise HTTPException(status_code=400, detail="Pools have not been divided")
+
+    return await asyncio.get_running_loop().run_in_executor(
+        None,
+        partial(
+            simulate_pools,
+            pools,
+            drafts=drafts,
+            strategies=names or None,
+            seed=seed,
+            workers=settings.draft_simulation_workers or None,
+            time_limit_ms=time_limit_ms,
+        ),
+    )
+
+
+@router.get("/{league_id}", response_model=LeagueDetail)
+async def get_league(league_id: str, db: Session = Depends(get_db)):
+    """Get league details.
+
+    The league, its users, pairs and drafts are loaded in four queries
+    (selectinload), and the result is cached per league for a few seconds.
+    """
+    cached = league_detail_cache.get(league_id)
+    if cached is not None:
+        return cached
+
+    league = (
+        db.query(League)
+        .options(
+            selectinload(League.users),
+            selectinload(League.draft_pairs).selectinload(DraftPair.draft),
+        )
+        .filter_by(id=league_id)
+        .first()
+    )
+    if not league:
+        raise HTTPException(status_code=404, detail="League not found")
+
+    detail = LeagueDetail(
+        league=LeagueBase.model_validate(league),
+        users=[LeagueUserBase.model_validate(u) for u in league.users],
+        pairs=[DraftPairBase.model_validate(p) for p in league.draft_pairs],
+        drafts={
+            pair.id: DraftSummary(
+                id=pair.draft.id,
+                status=pair.draft.status,
+                started_at=pair.draft.started_at,
+            )
+            for pair in league.draft_pairs
+            if pair.draft
+        },
+        user_count=len(league.users),
+    )
+    league_detail_cache.set(league_id, detail)
+    return detail
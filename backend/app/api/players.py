@@ -1,130 +1,387 @@
+import asyncio
+import base64
+import io
+import json
+import time
 import uuid
-from typing import Optional
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    UploadFile,
+)
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.database import get_db
 from app.models import Player
-from app.services.pool_division import PoolDivisionService
+from app.models.player import RETIRED_STATUS
+from app.services.catalog_cache import catalog_cache
+from app.services.player_catalog import CATALOG_FIELDS, player_catalog
+from app.services.player_search import player_search_index
+from app.services.pool_report import pool_report
+from app.services.pool_search import (
+    MAX_SEEDS,
+    load_division_players,
+    run_division,
+)
+from app.services.projections import projections_engine
+from app.services.ranking_import import RANK_COLUMNS, RankingImporter
 from app.services.sleeper_api import sleeper_api
+from app.services.trending import WINDOWS, trending_service
 
 router = APIRouter()
 
 
 @router.post("/sync")
-async def sync_players(db: Session = Depends(get_db)):
-    """Sync all players from Sleeper API"""
+async def sync_players(
+    repool: bool = False,
+    threshold_pct: float = Query(5.0, gt=0),
+    db: Session = Depends(get_db),
+):
+    """Sync all players from Sleeper API.
+
+    Players no longer active on Sleeper are marked retired. With ``repool``
+    the existing pool layout is then updated incrementally for the delta.
+    """
     try:
         players_data = await sleeper_api.get_all_players()
 
+        positions = ["QB", "RB", "WR", "TE", "K", "DEF"]
+        existing = {p.sleeper_id: p for p in db.query(Player) if p.sleeper_id}
         active_players = []
+        seen = set()
         for sleeper_id, player_data in players_data.items():
-            positions = ["QB", "RB", "WR", "TE", "K", "DEF"]
             if player_data.get("active") and player_data.get("position") in positions:
-                player = Player(
-                    id=str(uuid.uuid4()),
-                    sleeper_id=sleeper_id,
-                    first_name=player_data.get("first_name", ""),
-                    last_name=player_data.get("last_name", ""),
-                    full_name=player_data.get("full_name", ""),
-                    team=player_data.get("team", ""),
-                    position=player_data.get("position", ""),
-                    fantasy_positions=player_data.get("fantasy_positions", []),
-                    age=player_data.get("age"),
-                    status=player_data.get("status", ""),
-                    metadata_json=player_data,
-                )
-
-                existing = db.query(Player).filter_by(sleeper_id=sleeper_id).first()
-                if existing:
-                    for key, value in player.__dict__.items():
-                        if not key.startswith("_"):
-                            setattr(existing, key, value)
+                seen.add(sleeper_id)
+                fields = {
+                    "first_name": player_data.get("first_name", ""),
+                    "last_name": player_data.get("last_name", ""),
+                    "full_name": player_data.get("full_name", ""),
+                    "team": player_data.get("team", ""),
+                    "position": player_data.get("position", ""),
+                    "fantasy_positions": player_data.get("fantasy_positions", []),
+                    "age": player_data.get("age"),
+                    "status": player_data.get("status", ""),
+                    "metadata_json": player_data,
+                }
+
+                player = existing.get(sleeper_id)
+                if player:
+                    for key, value in fields.items():
+                        setattr(player, key, value)
                 else:
+                    player = Player(
+                        id=str(uuid.uuid4()), sleeper_id=sleeper_id, **fields
+                    )
                     db.add(player)
                     active_players.append(player)
 
+        retired = 0
+        for sleeper_id, player in existing.items():
+            if sleeper_id not in seen and player.status != RETIRED_STATUS:
+                player.status = RETIRED_STATUS
+                retired += 1
+
         db.commit()
-        return {"message": f"Synced {len(active_players)} players"}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    result = {"message": f"Synced {len(active_players)} players", "retired": retired}
+    if repool:
+        result["repool"] = await _divide_global(db, threshold_pct=threshold_pct)
+    await player_catalog.refresh_async(db)
+    return result
 
-@router.post("/divide-pools")
-async def divide_player_pools(db: Session = Depends(get_db)):
-    """Divide all players into 6 equal-value pools"""
+
+async def _divide_global(db: Session, **options) -> Dict:
+    """Divide the global layout and write only the rows that changed"""
     positions = ["QB", "RB", "WR", "TE", "K", "DEF"]
-    players = db.query(Player).filter(Player.position.in_(positions)).all()
+    players_dict = load_division_players(db, positions)
 
-    if len(players) < 192:
+    if len(players_dict) < 192:
         raise HTTPException(
             status_code=400, detail="Not enough players to create pools"
         )
 
-    players_dict = []
-    for player in players:
-        players_dict.append(
-            {
-                "id": player.id,
-                "position": player.position,
-                "sleeper_rank": player.sleeper_rank or 999,
-                "espn_rank": player.espn_rank or 999,
-                "yahoo_rank": player.yahoo_rank or 999,
-            }
-        )
-
-    pool_service = PoolDivisionService()
-    pools, pool_values = pool_service.divide_players_into_pools(players_dict)
-    validation = pool_service.validate_pool_balance(pools, pool_values)
-
-    for pool_idx, pool_players in pools.items():
-        for player_data in pool_players:
-            player = db.query(Player).filter_by(id=player_data["id"]).first()
-            if player:
-                player.pool_assignment = pool_idx
-                player.composite_rank = player_data["composite_value"]
+    # Ordered like ix_players_pool_assignment_rank so the index range serves
+    # the read instead of a table scan
+    layout = (
+        db.query(Player.id, Player.pool_assignment, Player.composite_rank)
+        .filter(Player.pool_assignment.isnot(None))
+        .order_by(Player.pool_assignment, Player.composite_rank)
+    )
+    current = {player_id: (pool, rank) for player_id, pool, rank in layout}
+    result = await asyncio.get_running_loop().run_in_executor(
+        None, partial(run_division, players_dict, current=current, **options)
+    )
+    pools = result["pools"]
 
+    if result["changes"]:
+        db.execute(update(Player), result["changes"])
     db.commit()
 
     return {
         "pools_created": len(pools),
-        "validation": validation,
+        "validation": result["validation"],
         "pool_sizes": {idx: len(players) for idx, players in pools.items()},
+        "search": result["search"],
+        "optimization": result["optimization"],
+        "incremental": result["incremental"],
+        "rows_written": len(result["changes"]),
     }
 
 
+@router.post("/divide-pools")
+async def divide_player_pools(
+    optimize: bool = False,
+    budget_ms: int = Query(200, ge=1, le=10000),
+    seeds: int = Query(0, ge=0, le=MAX_SEEDS),
+    time_limit_ms: int = Query(2000, ge=10, le=60000),
+    incremental: bool = False,
+    threshold_pct: float = Query(5.0, gt=0),
+    db: Session = Depends(get_db),
+):
+    """Divide all players into 6 equal-value pools.
+
+    With ``seeds`` that many randomized divisions are scored across a process
+    pool for up to ``time_limit_ms`` and the best is kept. With ``optimize``
+    the result is then rebalanced by same-position swaps for up to
+    ``budget_ms`` milliseconds. With ``incremental`` the existing layout is
+    only patched for added, retired and re-ranked players, unless the result
+    deviates more than ``threshold_pct`` percent. The work runs off the event
+    loop and only changed rows are written.
+    """
+    result = await _divide_global(
+        db,
+        optimize=optimize,
+        budget_ms=budget_ms,
+        seeds=seeds,
+        time_limit_ms=time_limit_ms,
+        threshold_pct=threshold_pct if incremental else None,
+    )
+    await player_catalog.refresh_async(db)
+    return result
+
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    """Validate a comma separated ``fields=`` parameter against PlayerBase"""
+    if not fields:
+        return list(CATALOG_FIELDS)
+
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in CATALOG_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400, detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return requested
+
+
+def _encode_cursor(composite_rank: Optional[float], player_id: str) -> str:
+    raw = json.dumps([composite_rank, player_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[Optional[float], str]:
+    try:
+        composite_rank, player_id = json.loads(base64.urlsafe_b64decode(cursor))
+        if composite_rank is not None:
+            composite_rank = float(composite_rank)
+        return composite_rank, str(player_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/")
 async def get_players(
+    request: Request,
     position: Optional[str] = None,
     pool: Optional[int] = None,
-    limit: int = 100,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
     db: Session = Depends(get_db),
 ):
-    """Get players with optional filters"""
-    query = db.query(Player)
+    """Get players with optional filters.
 
-    if position:
-        query = query.filter(Player.position == position)
-    if pool is not None:
-        query = query.filter(Player.pool_assignment == pool)
+    Pages are ordered by (composite_rank, id) and the body stays a plain list;
+    when more rows follow, the ``X-Next-Cursor`` response header holds the
+    cursor for the next page.
+    """
 
-    players = query.order_by(Player.composite_rank).limit(limit).all()
-    return players
+    catalog = player_catalog.get(db)
 
+    def build():
+        players, next_key = catalog.page(
+            position=position,
+            pool=pool,
+            after=_decode_cursor(cursor) if cursor else None,
+            limit=limit,
+            fields=_parse_fields(fields),
+        )
+        if next_key is None:
+            return players, None
+        return players, {"X-Next-Cursor": _encode_cursor(*next_key)}
 
-@router.get("/pools/{pool_number}")
-async def get_pool_players(pool_number: int, db: Session = Depends(get_db)):
-    """Get all players in a specific pool"""
-    players = (
-        db.query(Player)
-        .filter(Player.pool_assignment == pool_number)
-        .order_by(Player.position, Player.composite_rank)
-        .all()
+    return catalog_cache.respond(request, catalog.version, build)
+
+
+@router.get("/search")
+async def search_players(
+    q: str = Query(..., min_length=1),
+    position: Optional[str] = None,
+    pool: Optional[int] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db),
+):
+    """Prefix and typo-tolerant search on player name and team"""
+    player_catalog.get(db)  # builds the search index on first use
+    return player_search_index.search(q, position=position, pool=pool, limit=limit)
+
+
+@router.get("/trending")
+async def get_trending_players(
+    window: str = Query("24h", pattern="^(24h|7d)$"),
+    type: str = Query("add", pattern="^(add|drop)$"),
+    limit: int = Query(25, ge=1, le=200),
+    db: Session = Depends(get_db),
+):
+    """Most added or dropped players over the last 24 hours or 7 days"""
+    return trending_service.top(db, WINDOWS[window], type=type, limit=limit)
+
+
+@router.get("/projections")
+async def get_projections(
+    season: int,
+    week: int = Query(0, ge=0, le=18),
+    position: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Stored projections for a season (week 0) or a single week"""
+    projections = projections_engine.lookup(
+        db, season, week, [position] if position else None
     )
+    return {"season": season, "week": week, "projections": projections}
+
+
+@router.post("/projections/recompute")
+def recompute_projections(
+    season: Optional[int] = None,
+    week: Optional[int] = Query(None, ge=1, le=18),
+    db: Session = Depends(get_db),
+):
+    """Recompute projections for every player from the stat files on disk.
+
+    A plain ``def`` so the CPU-bound recompute runs in the threadpool instead
+    of blocking the event loop. Rows with an invalid week or points are
+    skipped and counted in ``skipped``.
+    """
+    started = time.perf_counter()
+    try:
+        result = projections_engine.recompute(db, season=season, week=week)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+@router.post("/rankings/import")
+def import_rankings(
+    file: UploadFile = File(...),
+    source: Optional[str] = Query(None, pattern=f"^({'|'.join(RANK_COLUMNS)})$"),
+    db: Session = Depends(get_db),
+):
+    """Import a CSV, JSON or JSON Lines ranking file into the rank columns.
+
+    A plain ``def``: parsing and the batched UPDATEs run in the threadpool
+    instead of blocking the event loop.
+    """
+    name = (file.filename or "").lower()
+    fmt = name.rsplit(".", 1)[-1] if "." in name else "csv"
+    if fmt not in ("csv", "json", "jsonl"):
+        raise HTTPException(status_code=400, detail=f"Unsupported file type: {fmt}")
 
-    if not players:
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        report = RankingImporter(db).run(stream, fmt=fmt, source=source)
+    except (ValueError, UnicodeDecodeError) as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Invalid ranking file: {e}")
+    finally:
+        stream.detach()
+
+    player_catalog.refresh(db)
+    return report
+
+
+@router.get("/pools/report")
+async def get_pool_report(
+    request: Request,
+    top_n: int = Query(5, ge=1, le=50),
+    tiers: int = Query(5, ge=1, le=20),
+    db: Session = Depends(get_db),
+):
+    """Per-pool and per-position value distributions of the current pools.
+
+    Cached with the catalog, so it's only recomputed after players change;
+    clients can revalidate with ``If-None-Match``.
+    """
+    catalog = player_catalog.get(db)
+    return catalog_cache.respond(
+        request, catalog.version, lambda: (pool_report(catalog, top_n, tiers), None)
+    )
+
+
+@router.get("/pools/{pool_number}")
+async def get_pool_players(
+    request: Request,
+    pool_number: int,
+    position: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """Get the players in a specific pool.
+
+    Without ``limit`` or ``cursor`` the whole pool is returned, as before
+    pagination. Otherwise pages hold ``limit`` players (default 100) and the
+    cursor for the next one is both ``next_cursor`` in the body and the
+    ``X-Next-Cursor`` header, as on the player listing.
+    """
+
+    catalog = player_catalog.get(db)
+    # Before the cache: a pool that emptied must 404, not 304
+    total_players = catalog.count(position=position, pool=pool_number)
+    if not total_players:
         raise HTTPException(status_code=404, detail=f"Pool {pool_number} not found")
 
-    return {"pool": pool_number, "total_players": len(players), "players": players}
+    def build():
+        if limit is None:
+            page_size = 100 if cursor else total_players
+        else:
+            page_size = limit
+        players, next_key = catalog.page(
+            position=position,
+            pool=pool_number,
+            after=_decode_cursor(cursor) if cursor else None,
+            limit=page_size,
+            fields=_parse_fields(fields),
+        )
+        next_cursor = _encode_cursor(*next_key) if next_key else None
+        return {
+            "pool": pool_number,
+            "total_players": total_players,
+            "players": players,
+            "next_cursor": next_cursor,
+        }, ({"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+    return catalog_cache.respond(request, catalog.version, build)
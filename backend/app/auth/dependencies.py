@@ -4,6 +4,8 @@ from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 
+from app.auth.principal_cache import cached_principal, remember_principal
+from app.auth.revocation import revocation_list
 from app.auth.utils import decode_token
 from app.database import get_db
 from app.models import User
@@ -32,10 +34,16 @@ async def get_current_user(
     if payload.get("type") != "access":
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id).first()
-    if user is None:
+    if revocation_list.is_revoked(payload.get("jti")):
         raise credentials_exception
 
+    user = cached_principal(db, user_id)
+    if user is None:
+        user = db.query(User).filter(User.id == user_id).first()
+        if user is None:
+            raise credentials_exception
+        remember_principal(user)
+
     return user
 
 
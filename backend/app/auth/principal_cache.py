@@ -0,0 +1,61 @@
+from typing import Optional
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.cache import LRUCache
+from app.config import get_settings
+from app.models import User
+
+settings = get_settings()
+
+# Column values of active users by id, so authenticated requests can resolve
+# the caller without a query. Any ORM update or delete of a user drops its
+# entry at flush and again after commit; bulk UPDATE statements bypass the
+# mapper events, and writes handled by other workers are only bounded by the
+# TTL, as with the other per-process caches.
+principal_cache = LRUCache(
+    maxsize=settings.principal_cache_size, ttl=settings.principal_cache_ttl_seconds
+)
+
+_COLUMNS = [attr.key for attr in inspect(User).column_attrs]
+_STALE_KEY = "stale_principals"
+
+
+def remember_principal(user: User):
+    """Cache an active user's column values; inactive users are never cached"""
+    if user.is_active:
+        principal_cache.set(user.id, {key: getattr(user, key) for key in _COLUMNS})
+
+
+def cached_principal(db: Session, user_id: str) -> Optional[User]:
+    """The cached user attached to ``db`` without loading it, or None"""
+    columns = principal_cache.get(user_id)
+    if columns is None:
+        return None
+    user = User(**columns)
+    make_transient_to_detached(user)
+    return db.merge(user, load=False)
+
+
+def _forget(mapper, connection, user: User):
+    principal_cache.pop(user.id)
+    session = Session.object_session(user)
+    if session is not None:
+        session.info.setdefault(_STALE_KEY, set()).add(user.id)
+
+
+event.listen(User, "after_update", _forget)
+event.listen(User, "after_delete", _forget)
+
+
+@event.listens_for(Session, "after_commit")
+def _forget_committed(session: Session):
+    # A request between the flush and the commit may have cached the old row
+    for user_id in session.info.pop(_STALE_KEY, ()):
+        principal_cache.pop(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stale(session: Session):
+    session.info.pop(_STALE_KEY, None)
@@ -0,0 +1,191 @@
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.auth.utils import REFRESH_TOKEN_EXPIRE_DAYS, create_refresh_token
+from app.database import SessionLocal
+from app.models import RefreshSession, RevokedToken
+
+logger = logging.getLogger(__name__)
+
+# Each sync re-reads revocations this many seconds older than the last one,
+# covering clock skew between workers and slow commits
+SYNC_OVERLAP_SECONDS = 60
+
+
+class RevocationList:
+    """In-process mirror of the revoked_tokens table.
+
+    Authentication checks a token's ``jti`` against the mirror only, a set
+    lookup with no database round trip. Revocations made by this worker are
+    added immediately; those from other workers arrive with the next
+    ``sync``, which reads the rows revoked since the previous one. Entries
+    are dropped from both the mirror and the table once their token has
+    expired, since the signature check rejects it from then on.
+    """
+
+    def __init__(self):
+        self._expires: Dict[str, int] = {}
+        self._synced_at: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._expires
+
+    def revoke(self, db: Session, payload: dict) -> bool:
+        """Revoke a decoded token; False if it was already revoked.
+
+        Tokens issued without a ``jti`` cannot be revoked and are left to
+        expire.
+        """
+        jti = payload.get("jti")
+        if jti is None:
+            return False
+        db.add(
+            RevokedToken(
+                jti=jti,
+                user_id=payload.get("sub"),
+                expires_at=int(payload["exp"]),
+                revoked_at=int(time.time()),
+            )
+        )
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            revoked = False
+        else:
+            revoked = True
+        with self._lock:
+            self._expires[jti] = int(payload["exp"])
+        return revoked
+
+    def sync(self, db: Session) -> int:
+        """Pull revocations made since the last sync (all of them the first
+        time); returns how many ids the mirror holds"""
+        now = int(time.time())
+        query = select(RevokedToken.jti, RevokedToken.expires_at).where(
+            RevokedToken.expires_at > now
+        )
+        if self._synced_at is not None:
+            query = query.where(
+                RevokedToken.revoked_at >= self._synced_at - SYNC_OVERLAP_SECONDS
+            )
+        rows = db.execute(query).all()
+        with self._lock:
+            self._expires.update(rows)
+            for jti in [jti for jti, exp in self._expires.items() if exp <= now]:
+                del self._expires[jti]
+            self._synced_at = now
+            return len(self._expires)
+
+    def compact(self, db: Session) -> int:
+        """Delete revocations and refresh sessions of tokens that have expired"""
+        now = int(time.time())
+        removed = db.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= now)
+        ).rowcount
+        removed += db.execute(
+            delete(RefreshSession).where(RefreshSession.expires_at <= now)
+        ).rowcount
+        db.commit()
+        return removed
+
+    def clear(self):
+        with self._lock:
+            self._expires.clear()
+            self._synced_at = None
+
+    def _sync_and_compact(self) -> int:
+        with SessionLocal() as db:
+            self.sync(db)
+            return self.compact(db)
+
+    async def run_periodically(self, interval_seconds: float):
+        """Background sync and compaction loop started from the app lifespan;
+        the database work runs on a thread, off the event loop"""
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                removed = await asyncio.to_thread(self._sync_and_compact)
+                if removed:
+                    logger.info("Compacted %d expired token revocations", removed)
+            except Exception:
+                logger.exception("Token revocation sync failed")
+
+    def __len__(self) -> int:
+        return len(self._expires)
+
+
+revocation_list = RevocationList()
+
+
+# Refresh tokens are single use without a revocation per refresh: each login
+# opens a RefreshSession holding the one jti it accepts next, so storage grows
+# with live sessions, not with refresh traffic.
+
+
+def _session_expiry() -> int:
+    return int(time.time()) + REFRESH_TOKEN_EXPIRE_DAYS * 24 * 3600
+
+
+def start_refresh_session(db: Session, user_id: str) -> str:
+    """Open a refresh session for ``user_id`` and return its first token"""
+    session_id, jti = uuid.uuid4().hex, uuid.uuid4().hex
+    db.add(
+        RefreshSession(
+            id=session_id, user_id=user_id, jti=jti, expires_at=_session_expiry()
+        )
+    )
+    db.commit()
+    return create_refresh_token({"sub": user_id, "sid": session_id, "jti": jti})
+
+
+def rotate_refresh_token(db: Session, payload: dict) -> Optional[str]:
+    """Swap a decoded refresh token for the next one of its session.
+
+    None when the token isn't its session's latest: already used, logged out,
+    expired, or issued without a session (tokens from before sessions).
+    The compare-and-swap is one UPDATE, so two workers racing on the same
+    token can't both win.
+    """
+    session_id, jti = payload.get("sid"), payload.get("jti")
+    if not session_id or not jti:
+        return None
+    next_jti = uuid.uuid4().hex
+    rotated = db.execute(
+        update(RefreshSession)
+        .where(
+            RefreshSession.id == session_id,
+            RefreshSession.user_id == payload.get("sub"),
+            RefreshSession.jti == jti,
+        )
+        .values(jti=next_jti, expires_at=_session_expiry())
+    ).rowcount
+    db.commit()
+    if not rotated:
+        return None
+    return create_refresh_token(
+        {"sub": payload["sub"], "sid": session_id, "jti": next_jti}
+    )
+
+
+def end_refresh_session(db: Session, payload: dict, user_id: str) -> bool:
+    """Close the session of a decoded refresh token belonging to ``user_id``"""
+    session_id = payload.get("sid")
+    if not session_id:
+        return False
+    ended = db.execute(
+        delete(RefreshSession).where(
+            RefreshSession.id == session_id, RefreshSession.user_id == user_id
+        )
+    ).rowcount
+    db.commit()
+    return bool(ended)
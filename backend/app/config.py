@@ -1,5 +1,6 @@
 from functools import lru_cache
 
+from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -7,6 +8,41 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///./fantasyduel.db"
     sleeper_api_base: str = "https://api.sleeper.app/v1"
     secret_key: str = "your-secret-key-change-in-production"
+    # Minutes between Sleeper trending polls, a divisor of 60; 0 disables
+    # the ingestion job
+    trending_poll_minutes: int = 0
+    # Directory of historical weekly stat files (CSV/JSON) for projections
+    stats_dir: str = "./data/stats"
+    # Processes for the divide-pools seed search; 0 uses every core
+    pool_search_workers: int = 0
+    # Processes for the draft-fairness simulator; 0 uses every core
+    draft_simulation_workers: int = 0
+    # Seconds between checks of the shared player catalog version; catalog
+    # writes made by other workers are picked up within this
+    catalog_version_check_seconds: float = 1.0
+    # Seconds a league detail response is cached between invalidations
+    league_detail_ttl_seconds: float = 5.0
+    # Active users cached for authentication, and for how many seconds
+    principal_cache_size: int = 10000
+    principal_cache_ttl_seconds: float = 60.0
+    # Verified JWTs whose claims are kept until they expire
+    token_cache_size: int = 10000
+    # Seconds between syncs of the revoked-token mirror; 0 disables the loop
+    revocation_sync_seconds: float = 5.0
+    # X-Admin-Key for /api/admin; empty disables the admin endpoints
+    admin_api_key: str = ""
+    # bcrypt cost for new password hashes; older hashes are rehashed on login
+    bcrypt_rounds: int = 12
+    # Threads hashing and verifying passwords off the event loop
+    password_hash_workers: int = 4
+
+    @field_validator("trending_poll_minutes")
+    @classmethod
+    def _poll_divides_hour(cls, value: int) -> int:
+        # Hourly trending buckets only tile time if every hour ends with a poll
+        if value < 0 or (value and 60 % value):
+            raise ValueError("must be 0 or divide 60 minutes")
+        return value
 
     class Config:
         env_file = ".env"
@@ -1,6 +1,30 @@
 from .draft import Draft, DraftPick
-from .league import DraftPair, League, LeagueUser
-from .player import Player
-from .user import User
+from .league import DraftPair, League, LeaguePoolAssignment, LeagueUser
+from .player import CatalogVersion, Player
+from .projection import Projection
+from .trending import (
+    TrendingAggregate,
+    TrendingPoll,
+    TrendingSample,
+    TrendingWindow,
+)
+from .user import RefreshSession, RevokedToken, User
 
-__all__ = ["Player", "League", "LeagueUser", "DraftPair", "Draft", "DraftPick", "User"]
+__all__ = [
+    "Player",
+    "CatalogVersion",
+    "League",
+    "LeagueUser",
+    "DraftPair",
+    "LeaguePoolAssignment",
+    "Draft",
+    "DraftPick",
+    "User",
+    "RevokedToken",
+    "RefreshSession",
+    "Projection",
+    "TrendingSample",
+    "TrendingAggregate",
+    "TrendingWindow",
+    "TrendingPoll",
+]
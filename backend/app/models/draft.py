@@ -1,12 +1,16 @@
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
 
+# Picks in a pair's draft; the two drafters alternate
+DRAFT_PICKS = 30
+
 
 class Draft(Base):
     __tablename__ = "drafts"
+    __table_args__ = (Index("ix_drafts_pair_id_status", "pair_id", "status"),)
 
     id = Column(String, primary_key=True)
     pair_id = Column(Integer, ForeignKey("draft_pairs.id"))
@@ -25,6 +29,9 @@ class Draft(Base):
 
 class DraftPick(Base):
     __tablename__ = "draft_picks"
+    __table_args__ = (
+        Index("ix_draft_picks_draft_id_pick_number", "draft_id", "pick_number"),
+    )
 
     id = Column(Integer, primary_key=True)
     draft_id = Column(String, ForeignKey("drafts.id"))
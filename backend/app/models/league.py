@@ -1,4 +1,13 @@
-from sqlalchemy import JSON, Column, DateTime, ForeignKey, Integer, String
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -13,6 +22,8 @@ class League(Base):
     commissioner_id = Column(String, nullable=False)
     status = Column(String, default="setup")
     settings = Column(JSON)
+    # Seats taken, claimed by join_league with a conditional UPDATE
+    member_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     draft_start_time = Column(DateTime(timezone=True))
@@ -23,13 +34,16 @@ class League(Base):
 
 class LeagueUser(Base):
     __tablename__ = "league_users"
+    __table_args__ = (
+        Index("ix_league_users_league_id_user_id", "league_id", "user_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True)
     league_id = Column(String, ForeignKey("leagues.id"))
-    user_id = Column(String, ForeignKey("users.id"))
+    user_id = Column(String, ForeignKey("users.id"), index=True)
     email = Column(String)  # Keep for backward compatibility
     display_name = Column(String, nullable=False)
-    pair_id = Column(Integer, ForeignKey("draft_pairs.id"))
+    pair_id = Column(Integer, ForeignKey("draft_pairs.id"), index=True)
 
     league = relationship("League", back_populates="users")
     pair = relationship("DraftPair", back_populates="users")
@@ -38,6 +52,9 @@ class LeagueUser(Base):
 
 class DraftPair(Base):
     __tablename__ = "draft_pairs"
+    __table_args__ = (
+        Index("ix_draft_pairs_league_id_pool_number", "league_id", "pool_number"),
+    )
 
     id = Column(Integer, primary_key=True)
     league_id = Column(String, ForeignKey("leagues.id"))
@@ -47,3 +64,24 @@ class DraftPair(Base):
     league = relationship("League", back_populates="draft_pairs")
     users = relationship("LeagueUser", back_populates="pair")
     draft = relationship("Draft", uselist=False, back_populates="pair")
+
+
+class LeaguePoolAssignment(Base):
+    """A player's pool within one league, overriding Player.pool_assignment"""
+
+    __tablename__ = "league_pool_assignments"
+    __table_args__ = (
+        # Covers the available-players read: one pool in rank order
+        Index(
+            "ix_league_pool_assignments_pool_rank",
+            "league_id",
+            "pool_number",
+            "composite_rank",
+            "player_id",
+        ),
+    )
+
+    league_id = Column(String, ForeignKey("leagues.id"), primary_key=True)
+    player_id = Column(String, ForeignKey("players.id"), primary_key=True)
+    pool_number = Column(Integer, nullable=False)
+    composite_rank = Column(Float)
@@ -1,11 +1,17 @@
-from sqlalchemy import JSON, Column, DateTime, Float, Integer, String
+from sqlalchemy import JSON, Column, DateTime, Float, Index, Integer, String
 from sqlalchemy.sql import func
 
 from app.database import Base
 
+# Status set by sync on players that dropped out of Sleeper's active list
+RETIRED_STATUS = "Retired"
+
 
 class Player(Base):
     __tablename__ = "players"
+    __table_args__ = (
+        Index("ix_players_pool_assignment_rank", "pool_assignment", "composite_rank"),
+    )
 
     id = Column(String, primary_key=True)
     sleeper_id = Column(String, unique=True, index=True)
@@ -28,3 +34,13 @@ class Player(Base):
     metadata_json = Column(JSON)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+
+class CatalogVersion(Base):
+    """Single row whose token changes with every committed write to players,
+    so each worker can tell when its in-memory catalog is out of date"""
+
+    __tablename__ = "catalog_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(String, nullable=False)
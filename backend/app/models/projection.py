@@ -0,0 +1,21 @@
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String
+from sqlalchemy.sql import func
+
+from app.database import Base
+
+
+class Projection(Base):
+    """Projected fantasy points for a player; week 0 holds the season total"""
+
+    __tablename__ = "projections"
+    __table_args__ = (
+        Index("ix_projections_season_week_points", "season", "week", "points"),
+    )
+
+    sleeper_id = Column(String, primary_key=True)
+    season = Column(Integer, primary_key=True)
+    week = Column(Integer, primary_key=True)
+    points = Column(Float, nullable=False)
+    games_sampled = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
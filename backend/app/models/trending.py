@@ -0,0 +1,49 @@
+from sqlalchemy import Column, Index, Integer, String
+
+from app.database import Base
+
+
+class TrendingSample(Base):
+    """Trending add/drop count for one player in one hour bucket"""
+
+    __tablename__ = "trending_samples"
+    __table_args__ = (Index("ix_trending_samples_bucket", "bucket"),)
+
+    sleeper_id = Column(String, primary_key=True)
+    bucket = Column(Integer, primary_key=True)  # hours since the Unix epoch
+    adds = Column(Integer, nullable=False, default=0)
+    drops = Column(Integer, nullable=False, default=0)
+
+
+class TrendingAggregate(Base):
+    """Running add/drop totals per player over a rolling window"""
+
+    __tablename__ = "trending_aggregates"
+    __table_args__ = (
+        Index("ix_trending_aggregates_window_adds", "window_hours", "adds"),
+        Index("ix_trending_aggregates_window_drops", "window_hours", "drops"),
+    )
+
+    sleeper_id = Column(String, primary_key=True)
+    window_hours = Column(Integer, primary_key=True)
+    adds = Column(Integer, nullable=False, default=0)
+    drops = Column(Integer, nullable=False, default=0)
+
+
+class TrendingWindow(Base):
+    """Oldest bucket still counted in each rolling window's aggregates"""
+
+    __tablename__ = "trending_windows"
+
+    window_hours = Column(Integer, primary_key=True)
+    first_bucket = Column(Integer, nullable=False)
+
+
+class TrendingPoll(Base):
+    """A claimed slot of the trending poll grid; the first worker to insert
+    it runs that poll, so several workers never ingest the same window"""
+
+    __tablename__ = "trending_polls"
+
+    poll_at = Column(Integer, primary_key=True)  # Unix seconds of the grid slot
+    claimed_at = Column(Integer, nullable=False)  # Unix seconds
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, String
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String
 from sqlalchemy.sql import func
 
 from app.database import Base
@@ -27,3 +27,32 @@ class User(Base):
     # OAuth fields (for future)
     oauth_provider = Column(String)  # google, github, etc
     oauth_id = Column(String)
+
+
+class RevokedToken(Base):
+    """A token id (``jti``) that must no longer be accepted, kept until the
+    token would have expired anyway"""
+
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        Index("ix_revoked_tokens_revoked_at", "revoked_at"),
+        Index("ix_revoked_tokens_expires_at", "expires_at"),
+    )
+
+    jti = Column(String, primary_key=True)
+    user_id = Column(String)
+    expires_at = Column(Integer, nullable=False)  # Unix seconds, the token's exp
+    revoked_at = Column(Integer, nullable=False)  # Unix seconds
+
+
+class RefreshSession(Base):
+    """A login's chain of refresh tokens (the ``sid`` claim). Only the latest
+    token of the chain, ``jti``, is accepted; refreshing swaps in the next"""
+
+    __tablename__ = "refresh_sessions"
+    __table_args__ = (Index("ix_refresh_sessions_expires_at", "expires_at"),)
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String, nullable=False)
+    jti = Column(String, nullable=False)
+    expires_at = Column(Integer, nullable=False)  # Unix seconds, the token's exp
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel
 
@@ -24,6 +24,32 @@ class PlayerBase(BaseModel):
 
 
 # League schemas
+class LeagueBase(BaseModel):
+    id: str
+    name: str
+    commissioner_id: str
+    status: Optional[str]
+    settings: Optional[Dict[str, Any]]
+    created_at: Optional[datetime]
+    draft_start_time: Optional[datetime]
+
+    class Config:
+        from_attributes = True
+
+
+class ActiveDraftSummary(BaseModel):
+    id: str
+    status: str
+
+
+class MyLeagueSummary(BaseModel):
+    league: LeagueBase
+    user_count: int
+    my_pair_id: Optional[int]
+    active_draft: Optional[ActiveDraftSummary]
+    is_commissioner: bool
+
+
 class LeagueUserBase(BaseModel):
     id: int
     league_id: str
@@ -36,6 +62,30 @@ class LeagueUserBase(BaseModel):
         from_attributes = True
 
 
+class DraftPairBase(BaseModel):
+    id: int
+    league_id: str
+    pool_number: int
+    draft_order: Optional[int]
+
+    class Config:
+        from_attributes = True
+
+
+class DraftSummary(BaseModel):
+    id: str
+    status: str
+    started_at: Optional[datetime]
+
+
+class LeagueDetail(BaseModel):
+    league: LeagueBase
+    users: List[LeagueUserBase]
+    pairs: List[DraftPairBase]
+    drafts: Dict[int, DraftSummary]
+    user_count: int
+
+
 # Draft schemas
 class DraftBase(BaseModel):
     id: str
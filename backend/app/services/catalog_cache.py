@@ -0,0 +1,74 @@
+import hashlib
+import json
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from app.cache import LRUCache
+
+
+class CatalogCache:
+    """Cache of serialized player catalog responses, keyed by catalog version.
+
+    Callers pass the version of the catalog snapshot they serve from (see
+    ``PlayerCatalogStore``), which follows the shared version row in the
+    database, so every worker derives the same ETag for the same data and
+    a write on any worker changes it. Until then every response for a given
+    path and query string is served from memory, and its ETag lets clients
+    revalidate with ``If-None-Match`` for a body-less 304.
+    """
+
+    def __init__(self, maxsize: int = 512):
+        self._responses = LRUCache(maxsize=maxsize)
+
+    def clear(self):
+        """Drop every cached response, e.g. once a newer catalog is loaded"""
+        self._responses.clear()
+
+    def etag_for(self, request: Request, version: str) -> str:
+        key = f"{request.url.path}?{sorted(request.query_params.multi_items())}"
+        digest = hashlib.sha1(key.encode(), usedforsecurity=False).hexdigest()[:16]
+        return f'W/"{version}-{digest}"'
+
+    def respond(
+        self,
+        request: Request,
+        version: str,
+        build: Callable[[], Tuple[Any, Optional[Dict[str, str]]]],
+    ) -> Response:
+        """Serve a cached response, a 304, or build, serialize and cache one.
+
+        ``build`` returns the response content and any extra headers. It is
+        only called on a miss; exceptions it raises are not cached. Checks
+        that can turn a request into an error (like a missing pool) belong
+        before this call, since a 304 skips ``build``.
+        """
+        etag = self.etag_for(request, version)
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        cached = self._responses.get(etag)
+        if cached is None:
+            content, headers = build()
+            body = json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+            cached = (body, headers or {})
+            self._responses.set(etag, cached)
+
+        body, headers = cached
+        return Response(
+            content=body,
+            media_type="application/json",
+            headers={"ETag": etag, "Cache-Control": "no-cache", **headers},
+        )
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    # Weak comparison: W/"x" and "x" refer to the same representation
+    return "*" in candidates or etag in candidates or etag[2:] in candidates
+
+
+catalog_cache = CatalogCache()
@@ -0,0 +1,258 @@
+import math
+import multiprocessing
+import os
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import get_settings
+from app.models.draft import DRAFT_PICKS
+
+settings = get_settings()
+
+# Starters a positional-need bot fills before taking the best player left
+ROSTER_NEEDS = {"QB": 2, "RB": 4, "WR": 4, "TE": 2, "K": 1, "DEF": 1}
+
+# One long-lived pool shared by every simulation, started on first use and
+# shut down with the app. Spawned rather than forked, as in pool_search.
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+class BestAvailable:
+    """Always takes the lowest composite value left"""
+
+    name = "best_available"
+
+    def board(self, values: Sequence[float], rng: random.Random) -> List[int]:
+        """The bot's preference order over the pool for one draft"""
+        return sorted(range(len(values)), key=values.__getitem__)
+
+    def pick(
+        self,
+        board: List[int],
+        taken: List[bool],
+        positions: Sequence[str],
+        roster: Dict[str, int],
+    ) -> int:
+        return next(i for i in board if not taken[i])
+
+
+class PositionalNeed(BestAvailable):
+    """Fills ROSTER_NEEDS first, then takes the best available"""
+
+    name = "positional_need"
+
+    def pick(self, board, taken, positions, roster):
+        for i in board:
+            if not taken[i] and roster.get(positions[i], 0) < ROSTER_NEEDS.get(
+                positions[i], 0
+            ):
+                return i
+        return super().pick(board, taken, positions, roster)
+
+
+class NoisyADP(BestAvailable):
+    """Best available on its own board: values with lognormal noise, like a
+    drafter going off a slightly different ADP list"""
+
+    name = "noisy_adp"
+
+    def __init__(self, sigma: float = 0.25):
+        self.sigma = sigma
+
+    def board(self, values, rng):
+        noisy = [value * rng.lognormvariate(0, self.sigma) for value in values]
+        return sorted(range(len(values)), key=noisy.__getitem__)
+
+
+STRATEGIES = {
+    strategy.name: strategy
+    for strategy in (BestAvailable(), PositionalNeed(), NoisyADP())
+}
+
+
+def simulate_draft(
+    values: Sequence[float],
+    positions: Sequence[str],
+    strategies: Tuple[BestAvailable, BestAvailable],
+    rng: random.Random,
+) -> Tuple[float, float]:
+    """Play one draft; returns each drafter's roster value, first picker first.
+
+    Lower is better, as with composite values.
+    """
+    boards = [strategy.board(values, rng) for strategy in strategies]
+    rosters: List[Dict[str, int]] = [{}, {}]
+    totals = [0.0, 0.0]
+    taken = [False] * len(values)
+
+    for pick in range(min(DRAFT_PICKS, len(values))):
+        drafter = pick % 2
+        i = strategies[drafter].pick(
+            boards[drafter], taken, positions, rosters[drafter]
+        )
+        taken[i] = True
+        rosters[drafter][positions[i]] = rosters[drafter].get(positions[i], 0) + 1
+        totals[drafter] += values[i]
+    return totals[0], totals[1]
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """The shared simulation pool, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.draft_simulation_workers or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown_executor():
+    """Stop the shared pool; the next simulation starts a new one"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def play_drafts(
+    pools: Dict[int, Tuple[List[float], List[str]]],
+    pool_idx: int,
+    start: int,
+    count: int,
+    strategies: List[str],
+    seed: int,
+    deadline: float = math.inf,
+) -> Tuple[int, List[Tuple[float, float]]]:
+    """Drafts ``start`` to ``start + count`` of one pool, stopping early at
+    ``deadline``. Each draft has its own RNG, so results don't depend on how
+    the work was batched"""
+    values, positions = pools[pool_idx]
+    results = []
+    for n in range(start, start + count):
+        if time.time() >= deadline:
+            break
+        rng = random.Random(f"{seed}:{pool_idx}:{n}")
+        pair = tuple(STRATEGIES[rng.choice(strategies)] for _ in range(2))
+        results.append(simulate_draft(values, positions, pair, rng))
+    return pool_idx, results
+
+
+def gap_report(results: np.ndarray) -> Dict:
+    """Distribution of roster value gaps for one pool's drafts"""
+    first, second = results[:, 0], results[:, 1]
+    gaps = np.abs(first - second)
+    mean_roster = results.mean()
+    percentiles = np.percentile(gaps, [50, 90, 99])
+    return {
+        "drafts": len(results),
+        "mean_gap": float(gaps.mean()),
+        "p50_gap": float(percentiles[0]),
+        "p90_gap": float(percentiles[1]),
+        "p99_gap": float(percentiles[2]),
+        "max_gap": float(gaps.max()),
+        "mean_gap_pct": float(gaps.mean() / mean_roster * 100) if mean_roster else 0.0,
+        # Positive when picking first ends with the better (lower) roster
+        "first_pick_edge": float((second - first).mean()),
+    }
+
+
+def simulate_pools(
+    pools: Dict[int, List[Tuple[float, str]]],
+    drafts: int = 1000,
+    strategies: Optional[List[str]] = None,
+    seed: int = 0,
+    workers: Optional[int] = None,
+    time_limit_ms: Optional[float] = None,
+) -> Dict:
+    """Play ``drafts`` simulated drafts per pool on the shared process pool.
+
+    ``pools`` maps pool number to its players as (composite value, position).
+    Each draft gives both drafters a strategy drawn from ``strategies`` and
+    the report has the roster value gap distribution per pool. Results are
+    the same for any worker count; ``workers`` caps how many batches run at
+    once. With ``time_limit_ms`` no draft starts after that much wall clock;
+    batches go round the pools so every pool gets a similar share. CPU
+    bound: call it from an executor.
+    """
+    started = time.time()
+    deadline = started + time_limit_ms / 1000 if time_limit_ms else math.inf
+    strategies = strategies or list(STRATEGIES)
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategies: {', '.join(unknown)}")
+
+    arrays = {
+        pool_idx: ([value for value, _ in players], [pos for _, pos in players])
+        for pool_idx, players in pools.items()
+    }
+    workers = min(workers or os.cpu_count() or 1, max(drafts * len(pools), 1))
+    batch = max(1, min(250, drafts * len(pools) // (workers * 4)))
+    tasks = [
+        (pool_idx, start, min(batch, drafts - start))
+        for start in range(0, drafts, batch)
+        for pool_idx in arrays
+    ]
+
+    finished: List[Tuple[Tuple[int, int, int], List[Tuple[float, float]]]] = []
+    if workers == 1:
+        for task in tasks:
+            _, drafted = play_drafts(arrays, *task, strategies, seed, deadline)
+            finished.append((task, drafted))
+    else:
+        executor = get_executor()
+        queue = iter(tasks)
+        pending = {}
+        try:
+            while True:
+                # Each batch carries only its own pool's arrays
+                while len(pending) < workers * 2 and time.time() < deadline:
+                    task = next(queue, None)
+                    if task is None:
+                        break
+                    pool_idx = task[0]
+                    future = executor.submit(
+                        play_drafts,
+                        {pool_idx: arrays[pool_idx]},
+                        *task,
+                        strategies,
+                        seed,
+                        deadline,
+                    )
+                    pending[future] = task
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    finished.append((pending.pop(future), future.result()[1]))
+        finally:
+            for future in pending:
+                future.cancel()
+
+    # Batches finish in any order; collect them in draft order so the
+    # report is identical for any worker count
+    results: Dict[int, List[Tuple[float, float]]] = {i: [] for i in arrays}
+    for (pool_idx, _, _), drafted in sorted(finished, key=lambda item: item[0]):
+        results[pool_idx].extend(drafted)
+
+    return {
+        "drafts_per_pool": drafts,
+        "strategies": strategies,
+        "seed": seed,
+        "workers": workers,
+        "drafts_played": sum(len(drafted) for drafted in results.values()),
+        "elapsed_ms": round((time.time() - started) * 1000, 1),
+        "pools": {
+            pool_idx: gap_report(np.array(drafted))
+            for pool_idx, drafted in results.items()
+            if drafted
+        },
+    }
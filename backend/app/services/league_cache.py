@@ -0,0 +1,11 @@
+from app.cache import LRUCache
+from app.config import get_settings
+
+settings = get_settings()
+
+# League detail responses by league id. Entries live for a few seconds so the
+# dashboard's polling mostly hits memory; the endpoints that change what the
+# detail shows (join, create-pairs, draft start and completion) pop the
+# league's entry after committing. Per process, like the catalog cache, so
+# the TTL bounds staleness from writes handled by other workers.
+league_detail_cache = LRUCache(maxsize=1024, ttl=settings.league_detail_ttl_seconds)
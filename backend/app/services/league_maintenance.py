@@ -0,0 +1,96 @@
+from typing import Dict, List
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.models import League, LeagueUser
+
+
+def _extra_memberships():
+    """Ids of every membership row after the first (lowest id) of its
+    (league_id, user_id) group, as one window-function scan"""
+    ranked = (
+        select(
+            LeagueUser.id,
+            func.row_number()
+            .over(
+                partition_by=(LeagueUser.league_id, LeagueUser.user_id),
+                order_by=LeagueUser.id,
+            )
+            .label("position"),
+        )
+        .where(LeagueUser.user_id.isnot(None))
+        .subquery()
+    )
+    return select(ranked.c.id).where(ranked.c.position > 1)
+
+
+def _member_counts(exclude=None):
+    """Each league's member count, optionally ignoring the ``exclude`` ids"""
+    counts = select(func.count(LeagueUser.id)).where(LeagueUser.league_id == League.id)
+    if exclude is not None:
+        counts = counts.where(LeagueUser.id.not_in(exclude))
+    return counts.correlate(League).scalar_subquery()
+
+
+def cleanup_duplicate_memberships(db: Session, dry_run: bool = False) -> Dict:
+    """Delete duplicate league memberships and resync ``member_count``.
+
+    Each step is a single set-based statement: a window-function DELETE of
+    the non-first rows, then one UPDATE of the leagues whose counter differs
+    from their real member count. With ``dry_run`` both are only counted and
+    nothing is written.
+    """
+    extra = _extra_memberships()
+    if dry_run:
+        duplicates = db.scalar(select(func.count()).select_from(extra.subquery()))
+        drifted = db.scalar(
+            select(func.count(League.id)).where(
+                League.member_count != _member_counts(exclude=extra)
+            )
+        )
+        return {"duplicates": duplicates, "counters": drifted, "dry_run": True}
+
+    removed = db.execute(
+        delete(LeagueUser)
+        .where(LeagueUser.id.in_(extra))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    counts = _member_counts()
+    resynced = db.execute(
+        update(League)
+        .where(League.member_count != counts)
+        .values(member_count=counts)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return {"duplicates": removed, "counters": resynced, "dry_run": False}
+
+
+def membership_report(db: Session, limit: int = 20) -> Dict:
+    """League and member totals plus the fullest leagues, from one grouped
+    query over league_users"""
+    grouped = (
+        select(LeagueUser.league_id, func.count(LeagueUser.id).label("members"))
+        .group_by(LeagueUser.league_id)
+        .subquery()
+    )
+    leagues = db.scalar(select(func.count(League.id)))
+    totals = db.execute(
+        select(func.count(), func.coalesce(func.sum(grouped.c.members), 0))
+    ).one()
+    fullest: List[Dict] = [
+        {"id": league_id, "name": name, "members": members}
+        for league_id, name, members in db.execute(
+            select(League.id, League.name, grouped.c.members)
+            .join(grouped, grouped.c.league_id == League.id)
+            .order_by(grouped.c.members.desc(), League.id)
+            .limit(limit)
+        )
+    ]
+    return {
+        "leagues": leagues,
+        "leagues_with_members": totals[0],
+        "members": totals[1],
+        "fullest": fullest,
+    }
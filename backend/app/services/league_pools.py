@@ -0,0 +1,177 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import League, LeaguePoolAssignment, Player
+from app.services.player_catalog import CATALOG_FIELDS, player_catalog
+from app.services.pool_division import (
+    PoolDivisionService,
+    VectorizedPoolDivisionService,
+)
+
+DEFAULT_NUM_POOLS = 6
+DEFAULT_ROSTER_SPOTS = {
+    "QB": 1,
+    "RB": 2,
+    "WR": 2,
+    "TE": 1,
+    "FLEX": 1,
+    "K": 1,
+    "DEF": 1,
+    "BENCH": 6,
+}
+# Ids per DELETE ... IN (...) statement
+WRITE_CHUNK = 500
+
+
+def pool_settings(league: Optional[League]) -> Tuple[int, Dict[str, int]]:
+    """``num_pools`` and ``position_requirements`` from League.settings"""
+    settings = (league.settings if league else None) or {}
+    requirements = settings.get("position_requirements") or dict(
+        PoolDivisionService().position_requirements
+    )
+    return int(settings.get("num_pools") or DEFAULT_NUM_POOLS), requirements
+
+
+def league_settings(
+    num_pools: int = DEFAULT_NUM_POOLS,
+    position_requirements: Optional[Dict[str, int]] = None,
+) -> Dict:
+    """Settings for a new league; raises ValueError on bad requirements"""
+    pool_service = PoolDivisionService()
+    requirements = position_requirements or pool_service.position_requirements
+    unknown = set(requirements) - set(pool_service.positions)
+    if unknown or any(count < 0 for count in requirements.values()):
+        raise ValueError("Invalid position requirements")
+    return {
+        "roster_spots": dict(DEFAULT_ROSTER_SPOTS),
+        "scoring": "PPR",
+        "num_pools": num_pools,
+        "position_requirements": dict(requirements),
+    }
+
+
+def division_service(league: League) -> VectorizedPoolDivisionService:
+    num_pools, requirements = pool_settings(league)
+    service = VectorizedPoolDivisionService(num_pools=num_pools)
+    service.position_requirements = requirements
+    return service
+
+
+def has_layout(db: Session, league_id: str) -> bool:
+    """Whether the league has been divided with its own pools"""
+    return (
+        db.query(LeaguePoolAssignment.league_id).filter_by(league_id=league_id).first()
+        is not None
+    )
+
+
+def current_layout(db: Session, league_id: str) -> Dict[str, Tuple[int, float]]:
+    """The league's assignments as {player_id: (pool, composite_rank)}"""
+    rows = db.query(
+        LeaguePoolAssignment.player_id,
+        LeaguePoolAssignment.pool_number,
+        LeaguePoolAssignment.composite_rank,
+    ).filter_by(league_id=league_id)
+    return {player_id: (pool, rank) for player_id, pool, rank in rows}
+
+
+def save_changes(db: Session, league_id: str, changes: List[Dict]):
+    """Apply ``layout_changes`` rows: delete what changed, insert what's placed"""
+    ids = [change["id"] for change in changes]
+    for start in range(0, len(ids), WRITE_CHUNK):
+        db.query(LeaguePoolAssignment).filter(
+            LeaguePoolAssignment.league_id == league_id,
+            LeaguePoolAssignment.player_id.in_(ids[start : start + WRITE_CHUNK]),
+        ).delete(synchronize_session=False)
+    rows = [
+        {
+            "league_id": league_id,
+            "player_id": change["id"],
+            "pool_number": change["pool_assignment"],
+            "composite_rank": change["composite_rank"],
+        }
+        for change in changes
+        if change["pool_assignment"] is not None
+    ]
+    if rows:
+        db.execute(insert(LeaguePoolAssignment), rows)
+
+
+def pool_rosters(db: Session, league_id: str) -> Dict[int, List[Tuple[float, str]]]:
+    """Each pool's players as (composite value, position), from the league's
+    layout or else the global one"""
+    if has_layout(db, league_id):
+        rows = (
+            db.query(
+                LeaguePoolAssignment.pool_number,
+                LeaguePoolAssignment.composite_rank,
+                Player.position,
+            )
+            .join(Player, Player.id == LeaguePoolAssignment.player_id)
+            .filter(LeaguePoolAssignment.league_id == league_id)
+        )
+    else:
+        # Ordered like ix_players_pool_assignment_rank, an index range read
+        rows = (
+            db.query(Player.pool_assignment, Player.composite_rank, Player.position)
+            .filter(Player.pool_assignment.isnot(None))
+            .order_by(Player.pool_assignment, Player.composite_rank)
+        )
+
+    pools: Dict[int, List[Tuple[float, str]]] = {}
+    for pool_number, composite_rank, position in rows:
+        pools.setdefault(pool_number, []).append((composite_rank, position))
+    return dict(sorted(pools.items()))
+
+
+def player_pool(db: Session, league_id: str, player: Player) -> Optional[int]:
+    """The player's pool in this league, falling back to the global layout
+    for leagues that were never divided on their own"""
+    row = (
+        db.query(LeaguePoolAssignment.pool_number)
+        .filter_by(league_id=league_id, player_id=player.id)
+        .first()
+    )
+    if row is not None:
+        return row[0]
+    if has_layout(db, league_id):
+        return None
+    return player.pool_assignment
+
+
+def available_players(
+    db: Session,
+    league_id: str,
+    pool_number: int,
+    exclude: Set[str],
+    fields: Iterable[str] = CATALOG_FIELDS,
+) -> List[Dict]:
+    """Players in one of the league's pools in rank order, minus ``exclude``.
+
+    Only ids and ranks come from the (covering) index; the player details are
+    read from the in-memory catalog.
+    """
+    catalog = player_catalog.get(db)
+    rows = (
+        db.query(LeaguePoolAssignment.player_id, LeaguePoolAssignment.composite_rank)
+        .filter_by(league_id=league_id, pool_number=pool_number)
+        .order_by(LeaguePoolAssignment.composite_rank, LeaguePoolAssignment.player_id)
+        .all()
+    )
+    if not rows and not has_layout(db, league_id):
+        return catalog.available(pool_number, exclude, fields)
+
+    players = []
+    for player_id, composite_rank in rows:
+        i = catalog.row_by_id.get(player_id)
+        if player_id in exclude or i is None:
+            continue
+        record = catalog.record(i, fields)
+        if "pool_assignment" in record:
+            record["pool_assignment"] = pool_number
+        if "composite_rank" in record:
+            record["composite_rank"] = composite_rank
+        players.append(record)
+    return players
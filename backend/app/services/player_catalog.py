@@ -0,0 +1,370 @@
+import asyncio
+import logging
+import math
+import sys
+import threading
+import time
+import uuid
+from array import array
+from bisect import bisect_right
+from itertools import chain
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import event, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import CatalogVersion, Player
+from app.schemas import PlayerBase
+from app.services.catalog_cache import catalog_cache
+from app.services.player_search import player_search_index
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FIELDS = tuple(PlayerBase.model_fields)
+
+# Sentinels for missing numbers inside typed arrays
+_NO_RANK = math.nan
+_NO_INT = -1
+
+_INTERNED = {"team", "position", "status"}
+_NUMERIC = {"composite_rank": "d", "age": "i", "pool_assignment": "i"}
+
+CursorKey = Tuple[Optional[float], str]
+
+settings = get_settings()
+
+CATALOG_VERSION_ID = 1
+# Stands in for the shared version until the first recorded catalog write
+_LOCAL_VERSION = f"local-{uuid.uuid4().hex[:8]}"
+
+
+def read_catalog_version(db: Session) -> str:
+    """The shared catalog version: a primary key lookup of one row"""
+    version = db.scalar(
+        select(CatalogVersion.version).where(CatalogVersion.id == CATALOG_VERSION_ID)
+    )
+    return version or _LOCAL_VERSION
+
+
+def bump_catalog_version(db: Session):
+    """Give the shared catalog version a new token, inside the caller's
+    transaction"""
+    token = uuid.uuid4().hex[:16]
+    updated = db.execute(
+        update(CatalogVersion)
+        .where(CatalogVersion.id == CATALOG_VERSION_ID)
+        .values(version=token)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not updated:
+        # No seed row (init_db without the migration): workers writing at
+        # once may both get here, so the insert must not conflict
+        db.execute(
+            sqlite_insert(CatalogVersion)
+            .values(id=CATALOG_VERSION_ID, version=token)
+            .on_conflict_do_update(
+                index_elements=[CatalogVersion.id], set_={"version": token}
+            )
+        )
+
+
+class PlayerCatalog:
+    """Read-only, column-oriented snapshot of the player catalog.
+
+    Each PlayerBase field is a tuple (strings) or a typed ``array`` (numbers,
+    with NaN / -1 standing in for NULL), and rows are addressed by index. The
+    listing order (composite_rank nulls last, then id) is precomputed, along
+    with per-pool and per-position row lists in that order, so filtered pages
+    are a bisect plus a slice instead of a query and a batch of ORM objects.
+    """
+
+    __slots__ = (
+        "version",
+        "columns",
+        "order",
+        "pool_rows",
+        "position_rows",
+        "row_by_id",
+        "size",
+    )
+
+    def __init__(self, rows: Sequence[Sequence], version: str = ""):
+        self.version = version
+        self.size = len(rows)
+        self.columns: Dict[str, Sequence] = {}
+        for col, field in enumerate(CATALOG_FIELDS):
+            values = [row[col] for row in rows]
+            if field in _NUMERIC:
+                missing = _NO_RANK if field == "composite_rank" else _NO_INT
+                self.columns[field] = array(
+                    _NUMERIC[field], [missing if v is None else v for v in values]
+                )
+            elif field in _INTERNED:
+                self.columns[field] = tuple(
+                    sys.intern(v) if isinstance(v, str) else v for v in values
+                )
+            else:
+                self.columns[field] = tuple(values)
+
+        ids = self.columns["id"]
+        self.row_by_id = {player_id: i for i, player_id in enumerate(ids)}
+        self.order = array("i", sorted(range(self.size), key=self.sort_key))
+
+        pool_rows: Dict[int, array] = {}
+        position_rows: Dict[str, array] = {}
+        pools = self.columns["pool_assignment"]
+        positions = self.columns["position"]
+        for i in self.order:
+            if pools[i] != _NO_INT:
+                pool_rows.setdefault(pools[i], array("i")).append(i)
+            position_rows.setdefault(positions[i], array("i")).append(i)
+        self.pool_rows = pool_rows
+        self.position_rows = position_rows
+
+    @classmethod
+    def load(cls, db: Session) -> "PlayerCatalog":
+        """Build a catalog from a single column query (no ORM instances).
+
+        The version is read first, so a write landing in between leaves the
+        catalog looking stale rather than current.
+        """
+        version = read_catalog_version(db)
+        columns = [getattr(Player, field) for field in CATALOG_FIELDS]
+        return cls(db.query(*columns).all(), version)
+
+    def sort_key(self, i: int) -> Tuple[bool, float, str]:
+        rank = self.columns["composite_rank"][i]
+        missing = math.isnan(rank)
+        return (missing, 0.0 if missing else rank, self.columns["id"][i])
+
+    def value(self, field: str, i: int):
+        value = self.columns[field][i]
+        if field == "composite_rank":
+            return None if math.isnan(value) else value
+        if field in _NUMERIC:
+            return None if value == _NO_INT else value
+        return value
+
+    def record(self, i: int, fields: Iterable[str] = CATALOG_FIELDS) -> Dict:
+        return {field: self.value(field, i) for field in fields}
+
+    def cursor_for(self, i: int) -> CursorKey:
+        return self.value("composite_rank", i), self.columns["id"][i]
+
+    def _candidates(
+        self, position: Optional[str], pool: Optional[int]
+    ) -> Tuple[Sequence[int], Optional[Callable[[int], bool]]]:
+        """Smallest precomputed row list for the filters, plus a residual check"""
+        if pool is not None:
+            rows = self.pool_rows.get(pool, ())
+            if position:
+                positions = self.columns["position"]
+                return rows, lambda i: positions[i] == position
+            return rows, None
+        if position:
+            return self.position_rows.get(position, ()), None
+        return self.order, None
+
+    def count(self, position: Optional[str] = None, pool: Optional[int] = None):
+        rows, check = self._candidates(position, pool)
+        if check is None:
+            return len(rows)
+        return sum(1 for i in rows if check(i))
+
+    def page(
+        self,
+        position: Optional[str] = None,
+        pool: Optional[int] = None,
+        after: Optional[CursorKey] = None,
+        limit: int = 100,
+        fields: Iterable[str] = CATALOG_FIELDS,
+    ) -> Tuple[List[Dict], Optional[CursorKey]]:
+        """One page in listing order, and the cursor key of its last row if
+        more rows follow"""
+        rows, check = self._candidates(position, pool)
+
+        start = 0
+        if after is not None:
+            rank, player_id = after
+            key = (rank is None, 0.0 if rank is None else rank, player_id)
+            start = bisect_right(rows, key, key=self.sort_key)
+
+        selected = []
+        for idx in range(start, len(rows)):
+            i = rows[idx]
+            if check is None or check(i):
+                selected.append(i)
+                if len(selected) > limit:
+                    break
+
+        next_key = None
+        if len(selected) > limit:
+            selected = selected[:limit]
+            next_key = self.cursor_for(selected[-1])
+
+        return [self.record(i, fields) for i in selected], next_key
+
+    def available(
+        self, pool: int, exclude: Set[str], fields: Iterable[str] = CATALOG_FIELDS
+    ) -> List[Dict]:
+        """Players in a pool in listing order, minus the excluded ids"""
+        ids = self.columns["id"]
+        return [
+            self.record(i, fields)
+            for i in self.pool_rows.get(pool, ())
+            if ids[i] not in exclude
+        ]
+
+
+class PlayerCatalogStore:
+    """Holds the current catalog snapshot and swaps it atomically on refresh.
+
+    Readers grab ``get()`` once per request and work against that snapshot, so
+    a concurrent refresh never exposes a half-built catalog. Every committed
+    write to players bumps the shared version row (see the session hooks
+    below); this worker rebuilds after its next ``get()``, and other workers
+    once their periodic version check, at most every ``check_seconds``, sees
+    the new token. Rebuilds run on a background thread with their own session
+    while ``get()`` keeps returning the previous snapshot; only the very first
+    load happens inline. Write endpoints that need their own changes visible
+    right away await ``refresh_async``.
+    """
+
+    def __init__(self, check_seconds: float = settings.catalog_version_check_seconds):
+        self.check_seconds = check_seconds
+        self._current: Optional[PlayerCatalog] = None
+        self._stale = False
+        self._checked_at = 0.0
+        self._rebuilding: Optional[threading.Thread] = None
+        self._epoch = 0  # bumped by clear(), so late rebuilds don't land
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> PlayerCatalog:
+        catalog = self._current
+        if catalog is None:
+            return self.refresh(db)
+        if self._stale:
+            self._rebuild_in_background(db.get_bind())
+        elif time.monotonic() - self._checked_at >= self.check_seconds:
+            self._checked_at = time.monotonic()
+            if read_catalog_version(db) != catalog.version:
+                self._rebuild_in_background(db.get_bind())
+        return catalog
+
+    def refresh(self, db: Session) -> PlayerCatalog:
+        """Reload from the database after a committed catalog write"""
+        # Cleared before loading, so a write committed meanwhile marks the
+        # new snapshot stale again
+        self._stale = False
+        epoch = self._epoch
+        try:
+            catalog = PlayerCatalog.load(db)
+            with self._lock:
+                if self._epoch == epoch:
+                    self._swap(catalog)
+        except Exception:
+            self._stale = True
+            raise
+        return catalog
+
+    async def refresh_async(self, db: Session) -> PlayerCatalog:
+        """``refresh`` on a thread with its own session, off the event loop"""
+        return await asyncio.to_thread(self._reload, db.get_bind())
+
+    def _reload(self, bind: Engine) -> PlayerCatalog:
+        with Session(bind=bind) as db:
+            return self.refresh(db)
+
+    def _rebuild_in_background(self, bind: Engine):
+        with self._lock:
+            if self._rebuilding is not None:
+                return
+            self._rebuilding = threading.Thread(
+                target=self._background_reload,
+                args=(bind,),
+                name="catalog-rebuild",
+                daemon=True,
+            )
+            self._rebuilding.start()
+
+    def _background_reload(self, bind: Engine):
+        try:
+            self._reload(bind)
+        except Exception:
+            logger.exception("Player catalog rebuild failed")
+        finally:
+            with self._lock:
+                self._rebuilding = None
+
+    def wait(self, timeout: Optional[float] = None):
+        """Block until a background rebuild in progress has been swapped in"""
+        thread = self._rebuilding
+        if thread is not None:
+            thread.join(timeout)
+
+    def invalidate(self):
+        """Rebuild after the next ``get()``"""
+        self._stale = True
+
+    def clear(self):
+        with self._lock:
+            self._epoch += 1
+            self._current = None
+            self._stale = False
+            player_search_index.clear()
+            catalog_cache.clear()
+
+    def _swap(self, catalog: PlayerCatalog):
+        player_search_index.rebuild(
+            catalog.record(i, player_search_index.fields) for i in range(catalog.size)
+        )
+        self._current = catalog
+        self._checked_at = time.monotonic()
+        catalog_cache.clear()
+
+
+player_catalog = PlayerCatalogStore()
+
+_WRITES_KEY = "player_catalog_writes"
+_BUMPED_KEY = "player_catalog_bumped"
+
+
+@event.listens_for(Session, "before_flush")
+def _note_player_changes(session: Session, flush_context, instances):
+    changed = chain(session.new, session.dirty, session.deleted)
+    if any(isinstance(obj, Player) for obj in changed):
+        session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _note_player_statements(state):
+    mapper = state.bind_mapper
+    if (state.is_insert or state.is_update or state.is_delete) and (
+        mapper is not None and mapper.class_ is Player
+    ):
+        state.session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _bump_version(session: Session):
+    # Flush first so pending player changes are noted, then bump the shared
+    # version in the same transaction as the writes
+    session.flush()
+    if session.info.pop(_WRITES_KEY, False):
+        bump_catalog_version(session)
+        session.info[_BUMPED_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_catalog(session: Session):
+    if session.info.pop(_BUMPED_KEY, False):
+        player_catalog.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_writes(session: Session):
+    session.info.pop(_WRITES_KEY, None)
+    session.info.pop(_BUMPED_KEY, None)
@@ -0,0 +1,192 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+# Shortest query term that is matched with a one-edit typo tolerance. Shorter
+# terms are almost always a prefix still being typed, and fuzzing them would
+# match half the catalog.
+MIN_FUZZY_LENGTH = 4
+
+EXACT_SCORE = 3
+PREFIX_SCORE = 2
+FUZZY_SCORE = 1
+
+_NON_ALNUM = re.compile(r"[^a-z0-9 ]+")
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase and strip accents and punctuation ("St. Brown" -> "st brown")"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    return _NON_ALNUM.sub("", text.replace("-", " ").replace(".", " "))
+
+
+def _deletes(token: str) -> Set[str]:
+    """All variants of a token with one character removed"""
+    return {token[:i] + token[i + 1 :] for i in range(len(token))}
+
+
+class _IndexState:
+    """Immutable snapshot of the index, swapped in whole on rebuild"""
+
+    __slots__ = ("entries", "tokens", "postings", "deletes")
+
+    def __init__(
+        self,
+        entries: List[Dict],
+        tokens: List[str],
+        postings: Dict[str, Tuple[int, ...]],
+        deletes: Dict[str, Tuple[str, ...]],
+    ):
+        self.entries = entries
+        self.tokens = tokens
+        self.postings = postings
+        self.deletes = deletes
+
+
+class PlayerSearchIndex:
+    """In-memory name/team search over the player catalog.
+
+    Tokens from ``full_name``, ``last_name`` and ``team`` are kept in a sorted
+    list for prefix lookups via bisect, and in a one-deletion neighbourhood map
+    (SymSpell style) so a single typo, missing or extra letter still matches.
+    """
+
+    fields = (
+        "id",
+        "sleeper_id",
+        "first_name",
+        "last_name",
+        "full_name",
+        "team",
+        "position",
+        "composite_rank",
+        "pool_assignment",
+    )
+
+    def __init__(self):
+        self._state: Optional[_IndexState] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._state is not None
+
+    def clear(self):
+        self._state = None
+
+    def rebuild(self, players: Iterable):
+        """Rebuild the index from Player rows or dicts with the same keys"""
+        entries = []
+        postings = defaultdict(set)
+
+        for player in players:
+            if isinstance(player, dict):
+                entry = {field: player.get(field) for field in self.fields}
+            else:
+                entry = {field: getattr(player, field, None) for field in self.fields}
+            doc_id = len(entries)
+            entries.append(entry)
+
+            text = " ".join(
+                filter(None, (entry["full_name"], entry["last_name"], entry["team"]))
+            )
+            for token in normalize(text).split():
+                postings[token].add(doc_id)
+
+        deletes = defaultdict(set)
+        for token in postings:
+            if len(token) >= MIN_FUZZY_LENGTH:
+                for variant in _deletes(token):
+                    deletes[variant].add(token)
+
+        self._state = _IndexState(
+            entries=entries,
+            tokens=sorted(postings),
+            postings={token: tuple(ids) for token, ids in postings.items()},
+            deletes={variant: tuple(tokens) for variant, tokens in deletes.items()},
+        )
+
+    def _match_term(self, state: _IndexState, term: str) -> Dict[int, int]:
+        """Score every document matching a single query term"""
+        scores: Dict[int, int] = {}
+
+        def add(token: str, score: int):
+            for doc_id in state.postings[token]:
+                if scores.get(doc_id, 0) < score:
+                    scores[doc_id] = score
+
+        # Prefix matches (includes the exact token itself)
+        start = bisect_left(state.tokens, term)
+        for token in state.tokens[start:]:
+            if not token.startswith(term):
+                break
+            add(token, EXACT_SCORE if token == term else PREFIX_SCORE)
+
+        # One-edit matches: substitutions, insertions, deletions and
+        # adjacent transpositions all share a one-deletion variant
+        if len(term) >= MIN_FUZZY_LENGTH:
+            candidates = set(state.deletes.get(term, ()))
+            for variant in _deletes(term) | {term}:
+                candidates.update(state.deletes.get(variant, ()))
+                if variant in state.postings:
+                    candidates.add(variant)
+            for token in candidates:
+                add(token, FUZZY_SCORE)
+
+        return scores
+
+    def search(
+        self,
+        query: str,
+        position: Optional[str] = None,
+        pool: Optional[int] = None,
+        limit: int = 20,
+    ) -> List[Dict]:
+        """Find players whose tokens match every term of the query"""
+        state = self._state
+        terms = normalize(query).split()
+        if state is None or not terms:
+            return []
+
+        totals: Optional[Dict[int, int]] = None
+        for term in terms:
+            scores = self._match_term(state, term)
+            if totals is None:
+                totals = scores
+            else:
+                totals = {
+                    doc_id: totals[doc_id] + score
+                    for doc_id, score in scores.items()
+                    if doc_id in totals
+                }
+            if not totals:
+                return []
+
+        results = []
+        for doc_id, score in totals.items():
+            entry = state.entries[doc_id]
+            if position and entry["position"] != position:
+                continue
+            if pool is not None and entry["pool_assignment"] != pool:
+                continue
+            results.append((score, entry))
+
+        best = heapq.nsmallest(
+            limit,
+            results,
+            key=lambda item: (
+                -item[0],
+                item[1]["composite_rank"] is None,
+                item[1]["composite_rank"] or 0.0,
+                item[1]["full_name"] or "",
+            ),
+        )
+        return [entry for _, entry in best]
+
+
+player_search_index = PlayerSearchIndex()
@@ -1,5 +1,32 @@
+import time
 from collections import defaultdict
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+RANK_SOURCES = ("sleeper_rank", "espn_rank", "yahoo_rank")
+POSITION_MULTIPLIERS = {
+    "QB": 1.2,
+    "RB": 1.0,
+    "WR": 1.0,
+    "TE": 0.9,
+    "K": 0.5,
+    "DEF": 0.6,
+}
+DEFAULT_MULTIPLIER = 0.8
+UNRANKED_VALUE = 999.0
+
+
+def value_deviation(pool_values: Dict[int, float]) -> Dict[str, float]:
+    """Largest distance of a pool from the mean, as validate_pool_balance sees it"""
+    values = np.array(list(pool_values.values()), dtype=np.float64)
+    if not len(values):
+        return {"max_deviation": 0.0, "max_deviation_pct": 0.0}
+    avg_value = values.mean()
+    deviation = float(np.abs(values - avg_value).max())
+    pct = deviation / avg_value * 100 if avg_value else 0.0
+    return {"max_deviation": deviation, "max_deviation_pct": pct}
 
 
 class PoolDivisionService:
@@ -17,28 +44,16 @@ class PoolDivisionService:
 
     def calculate_player_value(self, player: Dict) -> float:
         """Calculate composite value for a player based on multiple rankings"""
-        rank_sources = []
-
-        if player.get("sleeper_rank"):
-            rank_sources.append(player["sleeper_rank"])
-        if player.get("espn_rank"):
-            rank_sources.append(player["espn_rank"])
-        if player.get("yahoo_rank"):
-            rank_sources.append(player["yahoo_rank"])
+        rank_sources = [player[key] for key in RANK_SOURCES if player.get(key)]
 
         if not rank_sources:
-            return 999.0
+            return UNRANKED_VALUE
 
         avg_rank = sum(rank_sources) / len(rank_sources)
 
-        position_multiplier = {
-            "QB": 1.2,
-            "RB": 1.0,
-            "WR": 1.0,
-            "TE": 0.9,
-            "K": 0.5,
-            "DEF": 0.6,
-        }.get(player.get("position", ""), 0.8)
+        position_multiplier = POSITION_MULTIPLIERS.get(
+            player.get("position", ""), DEFAULT_MULTIPLIER
+        )
 
         return avg_rank * position_multiplier
 
@@ -99,6 +114,176 @@ class PoolDivisionService:
 
         return pools, pool_values
 
+    def place_incremental(
+        self, players: List[Dict], current: Dict[str, int]
+    ) -> Tuple[Dict[int, List[Dict]], Dict[int, float], Dict]:
+        """Update an existing layout for a changed catalog without reshuffling.
+
+        ``current`` maps player id to the pool it's in now. Players still in
+        ``players`` keep their pool (with a fresh composite value), players
+        missing from it drop out, and new players are placed best first into
+        the pool that most needs their position, lowest total value first.
+        Pools left short of a position after removals borrow a player from
+        the pool with the biggest surplus. Nobody else moves.
+        """
+        pools: Dict[int, List[Dict]] = {i: [] for i in range(self.num_pools)}
+        pool_values = {i: 0.0 for i in range(self.num_pools)}
+        counts = {i: defaultdict(int) for i in range(self.num_pools)}
+        added = []
+
+        for player in players:
+            if player.get("position") not in self.positions:
+                continue
+            player["composite_value"] = self.calculate_player_value(player)
+            pool_idx = current.get(player["id"])
+            if pool_idx is None or pool_idx not in pools:
+                added.append(player)
+                continue
+            player["pool_assignment"] = pool_idx
+            pools[pool_idx].append(player)
+            pool_values[pool_idx] += player["composite_value"]
+            counts[pool_idx][player["position"]] += 1
+
+        def need(pool_idx: int, position: str) -> int:
+            required = self.position_requirements.get(position, 0)
+            return counts[pool_idx][position] - required
+
+        for player in sorted(added, key=lambda x: x["composite_value"]):
+            position = player["position"]
+            pool_idx = min(pools, key=lambda i: (need(i, position), pool_values[i]))
+            player["pool_assignment"] = pool_idx
+            pools[pool_idx].append(player)
+            pool_values[pool_idx] += player["composite_value"]
+            counts[pool_idx][position] += 1
+
+        moved = 0
+        for position in self.position_requirements:
+            while True:
+                short = min(pools, key=lambda i: (need(i, position), pool_values[i]))
+                donor = max(pools, key=lambda i: (need(i, position), -pool_values[i]))
+                if need(short, position) >= 0 or need(donor, position) <= 0:
+                    break
+                # The donor player that leaves the two pools closest in value
+                gap = pool_values[donor] - pool_values[short]
+                player = min(
+                    (p for p in pools[donor] if p["position"] == position),
+                    key=lambda p: abs(gap - 2 * p["composite_value"]),
+                )
+                pools[donor].remove(player)
+                pools[short].append(player)
+                pool_values[donor] -= player["composite_value"]
+                pool_values[short] += player["composite_value"]
+                counts[donor][position] -= 1
+                counts[short][position] += 1
+                player["pool_assignment"] = short
+                moved += 1
+
+        kept = {p["id"] for pool_players in pools.values() for p in pool_players}
+        report = {
+            "added": len(added),
+            "removed": sum(1 for player_id in current if player_id not in kept),
+            "moved": moved,
+        }
+        return pools, pool_values, report
+
+    def optimize_pools(
+        self,
+        pools: Dict[int, List[Dict]],
+        pool_values: Dict[int, float],
+        budget_ms: float = 200.0,
+    ) -> Tuple[Dict[int, List[Dict]], Dict[int, float], Dict]:
+        """Rebalance pool values with local search, starting from ``pools``.
+
+        Each step takes the most and least valuable pools and swaps the pair
+        of same-position players whose value difference is closest to half
+        the gap, which strictly lowers the sum of squared deviations. Only
+        same-position swaps are made, so every pool keeps its position counts
+        and any ``position_requirements`` it met still hold. Stops at a local
+        optimum or when ``budget_ms`` runs out.
+        """
+        started = time.perf_counter()
+        deadline = started + budget_ms / 1000
+
+        pool_ids = np.array(sorted(pools), dtype=np.int64)
+        players = [player for idx in pool_ids.tolist() for player in pools[idx]]
+        pool_of = np.repeat(
+            np.arange(len(pool_ids)), [len(pools[idx]) for idx in pool_ids.tolist()]
+        )
+        values = np.array([p["composite_value"] for p in players], dtype=np.float64)
+        _, codes = np.unique(
+            np.array([p.get("position") or "" for p in players], dtype=str),
+            return_inverse=True,
+        )
+        codes = codes.reshape(-1)
+        totals = np.array([pool_values[idx] for idx in pool_ids.tolist()])
+
+        before = value_deviation(pool_values)
+        swaps = 0
+        while time.perf_counter() < deadline:
+            swap = self._best_swap(pool_of, values, codes, totals)
+            if swap is None:
+                break
+            a, b = swap
+            high, low = pool_of[a], pool_of[b]
+            delta = values[a] - values[b]
+            totals[high] -= delta
+            totals[low] += delta
+            pool_of[a], pool_of[b] = low, high
+            swaps += 1
+
+        new_pools: Dict[int, List[Dict]] = {idx: [] for idx in pools}
+        for player, i in zip(players, pool_of.tolist()):
+            player["pool_assignment"] = int(pool_ids[i])
+            new_pools[int(pool_ids[i])].append(player)
+        # Recompute rather than trust the running totals' rounding
+        new_totals = np.bincount(pool_of, weights=values, minlength=len(pool_ids))
+        new_values = dict(zip(pool_ids.tolist(), new_totals.tolist()))
+
+        report = {
+            "before": before,
+            "after": value_deviation(new_values),
+            "swaps": swaps,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        return new_pools, new_values, report
+
+    @staticmethod
+    def _best_swap(
+        pool_of: np.ndarray, values: np.ndarray, codes: np.ndarray, totals: np.ndarray
+    ) -> Optional[Tuple[int, int]]:
+        """Best same-position swap between the top pool and any lower pool,
+        falling back to the bottom pool and any higher pool"""
+        ranked = np.argsort(totals, kind="stable")
+        high, low = ranked[-1], ranked[0]
+        pairs = [(high, q) for q in ranked[:-1]] + [(p, low) for p in ranked[-2:0:-1]]
+
+        for high, low in pairs:
+            gap = totals[high] - totals[low]
+            if gap <= 1e-9 * max(abs(totals[high]), 1.0):
+                continue
+            best, best_score = None, gap / 2
+            for code in np.unique(codes[(pool_of == high) | (pool_of == low)]):
+                give = np.flatnonzero((pool_of == high) & (codes == code))
+                take = np.flatnonzero((pool_of == low) & (codes == code))
+                if not len(give) or not len(take):
+                    continue
+                order = np.argsort(values[take])
+                sorted_take = values[take][order]
+                # For each candidate a, the b nearest to a - gap/2
+                at = np.searchsorted(sorted_take, values[give] - gap / 2)
+                for side in (at - 1, at):
+                    ok = (side >= 0) & (side < len(take))
+                    delta = values[give[ok]] - sorted_take[side[ok]]
+                    score = np.abs(delta - gap / 2)
+                    score[(delta <= 0) | (delta >= gap)] = np.inf
+                    if len(score) and score.min() < best_score:
+                        i = int(score.argmin())
+                        best_score = score[i]
+                        best = (int(give[ok][i]), int(take[order[side[ok][i]]]))
+            if best is not None:
+                return best
+        return None
+
     def validate_pool_balance(
         self, pools: Dict[int, List[Dict]], pool_values: Dict[int, float]
     ) -> Dict:
@@ -138,3 +323,166 @@ class PoolDivisionService:
                     validation_results["warnings"].append(msg)
 
         return validation_results
+
+
+@dataclass
+class PoolAssignment:
+    """Array form of a pool division.
+
+    ``order`` lists input rows in the order they were assigned and ``pools``
+    holds the pool each of those rows went to. Rows with a position outside
+    ``positions`` are left out and keep a NaN ``values`` entry.
+    """
+
+    order: np.ndarray
+    pools: np.ndarray
+    values: np.ndarray
+    pool_values: np.ndarray
+
+    @property
+    def assignment(self) -> np.ndarray:
+        """Pool per input row, -1 for rows that weren't pooled"""
+        assignment = np.full(len(self.values), -1, dtype=np.int64)
+        assignment[self.order] = self.pools
+        return assignment
+
+
+class VectorizedPoolDivisionService(PoolDivisionService):
+    """``PoolDivisionService`` computed with whole-array NumPy operations.
+
+    Produces exactly the same pools, per-pool player order and (bit for bit)
+    pool values as the list-of-dicts implementation: sorts are stable, ties
+    between positions follow first appearance in the input like the
+    ``defaultdict`` did, and pool totals are accumulated by ``np.bincount`` in
+    assignment order.
+
+    Passing a ``seed`` gives a randomized variant instead: ties (and so the
+    leftover order) are broken in a shuffled order and each position's snake
+    starts from a random end.
+    """
+
+    def _position_order(self) -> List[str]:
+        required = [p for p in self.position_requirements if p in self.positions]
+        return required + [p for p in self.positions if p not in required]
+
+    def composite_values(
+        self, multipliers: np.ndarray, ranks: np.ndarray
+    ) -> np.ndarray:
+        """Vectorized ``calculate_player_value``; a rank of 0 counts as missing"""
+        present = ranks != 0
+        total = np.zeros(len(ranks))
+        for column in range(ranks.shape[1]):
+            total = total + np.where(present[:, column], ranks[:, column], 0.0)
+        count = present.sum(axis=1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values = total / count * multipliers
+        return np.where(count > 0, values, UNRANKED_VALUE)
+
+    def assign(
+        self, positions: Sequence[str], ranks: np.ndarray, seed: Optional[int] = None
+    ) -> PoolAssignment:
+        """Divide players given as a position array and an (n, 3) rank array"""
+        n = len(positions)
+        num_pools = self.num_pools
+        names = self._position_order()
+        ranks = np.asarray(ranks, dtype=np.float64).reshape(n, len(RANK_SOURCES))
+        positions = np.asarray(positions, dtype=str)
+
+        rng = np.random.default_rng(seed) if seed is not None else None
+        shuffle = np.arange(n) if rng is None else rng.permutation(n)
+        positions, ranks = positions[shuffle], ranks[shuffle]
+
+        codes = np.full(n, -1, dtype=np.int64)
+        for code, name in enumerate(names):
+            codes[positions == name] = code
+        rows = np.flatnonzero(codes >= 0)
+        codes = codes[rows]
+
+        multipliers = np.array(
+            [POSITION_MULTIPLIERS.get(p, DEFAULT_MULTIPLIER) for p in names]
+        )
+        values = self.composite_values(multipliers[codes], ranks[rows])
+
+        # Tiered snake: the first requirement * num_pools players of each
+        # position, best first, in position_requirements order
+        # Stable value sort then stable (radix) sort on the small int codes:
+        # the same order as lexsort at a fraction of the cost
+        order = np.argsort(values, kind="stable")
+        order = order[np.argsort(codes[order], kind="stable")]
+        grouped = codes[order]
+        counts = np.bincount(codes, minlength=len(names))
+        starts = np.cumsum(counts) - counts
+        depth = np.arange(len(order)) - starts[grouped]
+        required = np.array([self.position_requirements.get(p, 0) for p in names])
+        in_tier = depth < required[grouped] * num_pools
+
+        tier_rows = order[in_tier]
+        slot = depth[in_tier] % num_pools
+        flip = np.zeros(len(names), dtype=np.int64)
+        if rng is not None:
+            flip = rng.integers(0, 2, len(names))
+        forward = (depth[in_tier] // num_pools + flip[grouped[in_tier]]) % 2 == 0
+        tier_pools = np.where(forward, slot, num_pools - 1 - slot)
+        tier_values = np.bincount(
+            tier_pools, weights=values[tier_rows], minlength=num_pools
+        )
+
+        # Leftovers by value, round-robin from the lowest valued pool
+        leftover = order[~in_tier]
+        first_seen = [
+            np.argmax(codes == code) if counts[code] else len(codes)
+            for code in range(len(names))
+        ]
+        appearance = np.argsort(np.argsort(first_seen, kind="stable"))
+        leftover = leftover[np.argsort(appearance[codes[leftover]], kind="stable")]
+        leftover = leftover[np.argsort(values[leftover], kind="stable")]
+        pool_order = np.argsort(tier_values, kind="stable")
+        leftover_pools = pool_order[np.arange(len(leftover)) % num_pools]
+
+        sequence = np.concatenate([tier_rows, leftover])
+        pools = np.concatenate([tier_pools, leftover_pools]).astype(np.int64)
+        pool_values = np.bincount(pools, weights=values[sequence], minlength=num_pools)
+
+        rows = shuffle[rows]
+        all_values = np.full(n, np.nan)
+        all_values[rows] = values
+        return PoolAssignment(
+            order=rows[sequence],
+            pools=pools,
+            values=all_values,
+            pool_values=pool_values,
+        )
+
+    @staticmethod
+    def player_arrays(players: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Position and (n, 3) rank arrays for a list of player dicts"""
+        positions = np.array([player.get("position") or "" for player in players])
+        ranks = np.column_stack(
+            [
+                np.fromiter((p.get(key) or 0 for p in players), float, len(players))
+                for key in RANK_SOURCES
+            ]
+        )
+        return positions.astype(str), ranks
+
+    def divide_players_into_pools(
+        self, players: List[Dict], seed: Optional[int] = None
+    ) -> Tuple[Dict[int, List[Dict]], Dict[int, float]]:
+        """Same contract as the base class, including the dict mutations"""
+        positions, ranks = self.player_arrays(players)
+        return self.apply(players, self.assign(positions, ranks, seed=seed))
+
+    def apply(
+        self, players: List[Dict], result: PoolAssignment
+    ) -> Tuple[Dict[int, List[Dict]], Dict[int, float]]:
+        """Write an assignment back onto the player dicts it was computed from"""
+        values = result.values.tolist()
+        pools: Dict[int, List[Dict]] = {i: [] for i in range(self.num_pools)}
+        for row, pool_idx in zip(result.order.tolist(), result.pools.tolist()):
+            player = players[row]
+            player["composite_value"] = values[row]
+            player["pool_assignment"] = pool_idx
+            pools[pool_idx].append(player)
+
+        pool_values = dict(enumerate(result.pool_values.tolist()))
+        return pools, pool_values
@@ -0,0 +1,107 @@
+from typing import Dict, List
+
+import numpy as np
+
+from app.services.player_catalog import PlayerCatalog
+from app.services.pool_division import value_deviation
+
+
+def _group_stats(
+    groups: np.ndarray,
+    values: np.ndarray,
+    tiers: np.ndarray,
+    size: int,
+    num_tiers: int,
+    top_n: int,
+) -> Dict[str, np.ndarray]:
+    """Per-group count, sum, mean, variance, best-``top_n`` sum and tier
+    histogram, each an array indexed by group"""
+    counts = np.bincount(groups, minlength=size)
+    sums = np.bincount(groups, weights=values, minlength=size)
+    squares = np.bincount(groups, weights=values * values, minlength=size)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(counts > 0, sums / counts, 0.0)
+        variances = np.where(counts > 0, squares / counts - means * means, 0.0)
+
+    # Rank within each group by value (lowest is strongest), keep the first N
+    order = np.lexsort((values, groups))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    within = np.arange(len(order)) - starts[groups[order]]
+    best = order[within < top_n]
+    top = np.bincount(groups[best], weights=values[best], minlength=size)
+
+    histogram = np.bincount(
+        groups * num_tiers + tiers, minlength=size * num_tiers
+    ).reshape(size, num_tiers)
+    return {
+        "count": counts,
+        "sum": sums,
+        "mean": means,
+        "variance": np.maximum(variances, 0.0),
+        "top_n_sum": top,
+        "tiers": histogram,
+    }
+
+
+def _summary(stats: Dict[str, np.ndarray], group: int) -> Dict:
+    return {
+        "count": int(stats["count"][group]),
+        "sum": float(stats["sum"][group]),
+        "mean": float(stats["mean"][group]),
+        "variance": float(stats["variance"][group]),
+        "top_n_sum": float(stats["top_n_sum"][group]),
+        "tiers": stats["tiers"][group].tolist(),
+    }
+
+
+def pool_report(catalog: PlayerCatalog, top_n: int = 5, tiers: int = 5) -> Dict:
+    """Value distributions per pool and per (pool, position) for a catalog.
+
+    Values are composite ranks, so lower is stronger and ``top_n_sum`` is the
+    total of each group's ``top_n`` lowest. Tiers split every pooled player's
+    value into ``tiers`` equal-count bands across the whole catalog, tier 0
+    being the strongest, and each group gets a histogram over them. Computed
+    with grouped NumPy reductions, one pass per statistic.
+    """
+    pools = np.asarray(catalog.columns["pool_assignment"], dtype=np.int64)
+    values = np.asarray(catalog.columns["composite_rank"], dtype=np.float64)
+    position_names: List[str] = sorted(p for p in catalog.position_rows if p)
+    positions = np.full(catalog.size, -1, dtype=np.int64)
+    for code, name in enumerate(position_names):
+        positions[np.asarray(catalog.position_rows[name], dtype=np.int64)] = code
+
+    pooled = (pools >= 0) & ~np.isnan(values) & (positions >= 0)
+    pools, values, positions = pools[pooled], values[pooled], positions[pooled]
+    report = {"top_n": top_n, "tier_edges": [], "spread": None, "pools": {}}
+    if not len(values):
+        return report
+
+    pool_numbers, pool_codes = np.unique(pools, return_inverse=True)
+    edges = np.quantile(values, np.linspace(0, 1, tiers + 1))
+    tier_codes = np.searchsorted(edges[1:-1], values, side="right")
+    num_positions = len(position_names)
+
+    by_pool = _group_stats(
+        pool_codes, values, tier_codes, len(pool_numbers), tiers, top_n
+    )
+    by_position = _group_stats(
+        pool_codes * num_positions + positions,
+        values,
+        tier_codes,
+        len(pool_numbers) * num_positions,
+        tiers,
+        top_n,
+    )
+
+    for p, pool_number in enumerate(pool_numbers.tolist()):
+        entry = _summary(by_pool, p)
+        entry["positions"] = {
+            name: _summary(by_position, p * num_positions + code)
+            for code, name in enumerate(position_names)
+            if by_position["count"][p * num_positions + code]
+        }
+        report["pools"][pool_number] = entry
+
+    report["tier_edges"] = edges.tolist()
+    report["spread"] = value_deviation(dict(enumerate(by_pool["sum"].tolist())))
+    return report
@@ -0,0 +1,302 @@
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import Player
+from app.models.player import RETIRED_STATUS
+from app.services.pool_division import (
+    PoolAssignment,
+    VectorizedPoolDivisionService,
+    value_deviation,
+)
+
+settings = get_settings()
+
+# Seeds a single divide-pools request may ask for; the wall clock limit
+# bounds the search too, this bounds the work queued for it
+MAX_SEEDS = 5000
+
+# One long-lived pool shared by every search, started on first use and shut
+# down with the app. Workers are spawned, not forked: forking a threaded
+# server copies held locks and open connections into the children.
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def balance_score(validation: Dict) -> Tuple[int, float]:
+    """Lower is better: warning count, then the worst pool's value deviation"""
+    deviations = [
+        stats["value_deviation"] for stats in validation["pool_stats"].values()
+    ]
+    return len(validation["warnings"]), max(deviations, default=0.0)
+
+
+def score_assignment(
+    service: VectorizedPoolDivisionService,
+    positions: np.ndarray,
+    result: PoolAssignment,
+) -> Tuple[int, float]:
+    """Score an array assignment with ``validate_pool_balance``"""
+    pools: Dict[int, List[Dict]] = {i: [] for i in range(service.num_pools)}
+    for row, pool_idx in zip(result.order.tolist(), result.pools.tolist()):
+        pools[pool_idx].append({"position": positions[row]})
+    pool_values = dict(enumerate(result.pool_values.tolist()))
+    return balance_score(service.validate_pool_balance(pools, pool_values))
+
+
+def get_executor() -> ProcessPoolExecutor:
+    """The shared seed search pool, created on first use"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ProcessPoolExecutor(
+                max_workers=settings.pool_search_workers or os.cpu_count() or 1,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+def shutdown_executor():
+    """Stop the shared pool; the next search starts a new one"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _run_seeds(
+    job: Tuple, seeds: List[int], deadline: float
+) -> List[Tuple[Tuple, int]]:
+    """Score seeds in order until the batch or the wall clock runs out"""
+    num_pools, position_requirements, positions, ranks = job
+    service = VectorizedPoolDivisionService(num_pools)
+    service.position_requirements = position_requirements
+    scored = []
+    for seed in seeds:
+        if time.time() >= deadline:
+            break
+        result = service.assign(positions, ranks, seed=seed)
+        scored.append((score_assignment(service, positions, result), seed))
+    return scored
+
+
+@dataclass
+class SeedSearchResult:
+    """Best division found by ``search_seeds``; ``seed`` None is the plain one"""
+
+    seed: Optional[int]
+    score: Tuple[int, float]
+    assignment: PoolAssignment
+    seeds_tried: int
+    elapsed_ms: float
+
+
+def search_seeds(
+    service: VectorizedPoolDivisionService,
+    positions: np.ndarray,
+    ranks: np.ndarray,
+    seeds: int,
+    time_limit_ms: float,
+    workers: Optional[int] = None,
+) -> SeedSearchResult:
+    """Run ``seeds`` randomized divisions on the shared pool, keep the best.
+
+    The deterministic division is the baseline, so the result is never worse
+    than it. Seeds are handed out in small batches, two per ``workers`` in
+    flight, so the load stays even, and workers stop starting new seeds once
+    ``time_limit_ms`` of wall clock has passed; anything still queued at that
+    point is cancelled.
+    """
+    started = time.time()
+    deadline = started + time_limit_ms / 1000
+
+    baseline = service.assign(positions, ranks)
+    best_score, best_seed = score_assignment(service, positions, baseline), None
+    tried = 0
+
+    workers = min(workers or os.cpu_count() or 1, max(seeds, 1))
+    batch = max(1, min(16, seeds // (workers * 4)))
+    batches = (list(range(i, min(i + batch, seeds))) for i in range(0, seeds, batch))
+    if seeds > 0:
+        executor = get_executor()
+        job = (service.num_pools, service.position_requirements, positions, ranks)
+        pending = set()
+        try:
+            # Keep two batches per worker in flight rather than queueing every
+            # seed up front, so huge seed counts cost nothing past the deadline
+            while True:
+                while len(pending) < workers * 2 and time.time() < deadline:
+                    seed_batch = next(batches, None)
+                    if seed_batch is None:
+                        break
+                    pending.add(executor.submit(_run_seeds, job, seed_batch, deadline))
+                if not pending or time.time() >= deadline:
+                    break
+                done, pending = wait(
+                    pending,
+                    timeout=max(deadline - time.time(), 0),
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    for score, seed in future.result():
+                        tried += 1
+                        # Batches finish in any order; ties go to the lowest
+                        # seed so a search is reproducible
+                        if score < best_score or (
+                            score == best_score
+                            and best_seed is not None
+                            and seed < best_seed
+                        ):
+                            best_score, best_seed = score, seed
+        finally:
+            # Running batches stop at the deadline on their own
+            for future in pending:
+                future.cancel()
+
+    assignment = baseline
+    if best_seed is not None:
+        assignment = service.assign(positions, ranks, seed=best_seed)
+    return SeedSearchResult(
+        seed=best_seed,
+        score=best_score,
+        assignment=assignment,
+        seeds_tried=tried,
+        elapsed_ms=round((time.time() - started) * 1000, 1),
+    )
+
+
+def run_division(
+    players: List[Dict],
+    service: Optional[VectorizedPoolDivisionService] = None,
+    optimize: bool = False,
+    budget_ms: float = 200.0,
+    seeds: int = 0,
+    time_limit_ms: float = 2000.0,
+    current: Optional[Dict[str, Tuple[int, Optional[float]]]] = None,
+    threshold_pct: Optional[float] = None,
+) -> Dict:
+    """Divide ``players`` (dicts, mutated in place) with the optional seed
+    search and swap optimizer. CPU bound: call it from an executor.
+
+    ``current`` is the existing layout as {player_id: (pool, composite_rank)}.
+    With a ``threshold_pct`` it is updated incrementally, falling back to a
+    full division when the result deviates more than that. Either way
+    ``changes`` lists only the rows whose pool or rank differ from it.
+    """
+    service = service or VectorizedPoolDivisionService()
+    current = current or {}
+    search = incremental = None
+
+    if current and threshold_pct is not None:
+        layout = {player_id: pool for player_id, (pool, _) in current.items()}
+        pools, pool_values, incremental = service.place_incremental(players, layout)
+        incremental["reranked"] = sum(
+            1
+            for pool_players in pools.values()
+            for p in pool_players
+            if p["id"] in current and current[p["id"]][1] != p["composite_value"]
+        )
+        incremental["deviation"] = value_deviation(pool_values)
+        rebuild = incremental["deviation"]["max_deviation_pct"] > threshold_pct
+        incremental["mode"] = "full" if rebuild else "incremental"
+
+    if incremental is None or incremental["mode"] == "full":
+        if seeds:
+            positions, ranks = service.player_arrays(players)
+            found = search_seeds(
+                service,
+                positions,
+                ranks,
+                seeds,
+                time_limit_ms,
+                workers=settings.pool_search_workers or None,
+            )
+            pools, pool_values = service.apply(players, found.assignment)
+            search = {
+                "seed": found.seed,
+                "seeds_tried": found.seeds_tried,
+                "elapsed_ms": found.elapsed_ms,
+            }
+        else:
+            pools, pool_values = service.divide_players_into_pools(players)
+
+    optimization = None
+    if optimize:
+        pools, pool_values, optimization = service.optimize_pools(
+            pools, pool_values, budget_ms=budget_ms
+        )
+
+    return {
+        "pools": pools,
+        "pool_values": pool_values,
+        "validation": service.validate_pool_balance(pools, pool_values),
+        "search": search,
+        "optimization": optimization,
+        "incremental": incremental,
+        "changes": layout_changes(current, pools),
+    }
+
+
+def layout_changes(
+    current: Dict[str, Tuple[int, Optional[float]]], pools: Dict[int, List[Dict]]
+) -> List[Dict]:
+    """Rows to write to move from ``current`` to ``pools``; players that left
+    the layout get a None pool"""
+    changes = []
+    placed = set()
+    for pool_idx, pool_players in pools.items():
+        for player in pool_players:
+            placed.add(player["id"])
+            if current.get(player["id"]) != (pool_idx, player["composite_value"]):
+                changes.append(
+                    {
+                        "id": player["id"],
+                        "pool_assignment": pool_idx,
+                        "composite_rank": player["composite_value"],
+                    }
+                )
+    for player_id, (_, composite_rank) in current.items():
+        if player_id not in placed:
+            changes.append(
+                {
+                    "id": player_id,
+                    "pool_assignment": None,
+                    "composite_rank": composite_rank,
+                }
+            )
+    return changes
+
+
+def load_division_players(db: Session, positions: List[str]) -> List[Dict]:
+    """Poolable player dicts in the shape the division services expect;
+    unranked sources count as 999"""
+    rows = db.query(
+        Player.id,
+        Player.position,
+        Player.sleeper_rank,
+        Player.espn_rank,
+        Player.yahoo_rank,
+    ).filter(
+        Player.position.in_(positions),
+        or_(Player.status.is_(None), Player.status != RETIRED_STATUS),
+    )
+    return [
+        {
+            "id": player_id,
+            "position": position,
+            "sleeper_rank": sleeper_rank or 999,
+            "espn_rank": espn_rank or 999,
+            "yahoo_rank": yahoo_rank or 999,
+        }
+        for player_id, position, sleeper_rank, espn_rank, yahoo_rank in rows
+    ]
@@ -0,0 +1,231 @@
+import csv
+import json
+import math
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models import Player, Projection
+
+settings = get_settings()
+
+WEEKS_PER_SEASON = 18
+SEASON_WEEK = 0  # Projection.week value used for the full-season total
+
+POINT_COLUMNS = ("fantasy_points", "pts_ppr", "points")
+ID_COLUMNS = ("sleeper_id", "player_id")
+
+# Sleeper stats dumps are {player_id: {stat: value}} with the season and week
+# only in the file name, e.g. 2023_week5.json or stats-2023-w05.json
+_FILE_WEEK = re.compile(r"(\d{4})\D+w(?:eek)?(\d{1,2})", re.IGNORECASE)
+
+
+@dataclass
+class WeeklyStats:
+    """Historical weekly fantasy points as parallel arrays"""
+
+    sleeper_ids: np.ndarray  # object array of str
+    season: np.ndarray
+    week: np.ndarray
+    points: np.ndarray
+    skipped: int = 0  # rows dropped for a missing or invalid id, week or points
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+
+def _first(row: Dict, keys) -> Optional[str]:
+    for key in keys:
+        if row.get(key) not in (None, ""):
+            return row[key]
+    return None
+
+
+class ProjectionsEngine:
+    """Per-player weekly and season projections from historical weekly stats.
+
+    A player's weekly projection is an exponentially decayed mean of their
+    past weeks (``decay`` per week of age), shrunk toward the league-wide mean
+    by ``prior_weight`` pseudo-games so small samples don't project as stars.
+    Everything is computed with ``np.bincount`` over the whole stat history at
+    once; there is no per-player Python loop.
+    """
+
+    def __init__(
+        self, decay: float = 0.9, prior_weight: float = 2.0, season_games: int = 17
+    ):
+        self.decay = decay
+        self.prior_weight = prior_weight
+        self.season_games = season_games
+
+    def load_stats(self, path: Optional[str] = None) -> WeeklyStats:
+        """Read every CSV/JSON stat file under ``path`` (default ``stats_dir``)"""
+        root = Path(path or settings.stats_dir)
+        files = [root] if root.is_file() else sorted(root.glob("*"))
+
+        ids: List[str] = []
+        seasons: List[int] = []
+        weeks: List[int] = []
+        points: List[float] = []
+        skipped = 0
+
+        def add(row: Dict, season=None, week=None):
+            nonlocal skipped
+            sleeper_id = _first(row, ID_COLUMNS)
+            try:
+                season = int(row.get("season", season))
+                week = int(row.get("week", week))
+                value = float(_first(row, POINT_COLUMNS))
+            except (TypeError, ValueError):
+                value = math.nan
+            # Week 0 is the stored season total, never a played week
+            if (
+                sleeper_id is None
+                or not math.isfinite(value)
+                or not 1 <= week <= WEEKS_PER_SEASON
+            ):
+                skipped += 1
+                return
+            ids.append(str(sleeper_id))
+            seasons.append(season)
+            weeks.append(week)
+            points.append(value)
+
+        for file in files:
+            suffix = file.suffix.lower()
+            if suffix == ".csv":
+                with file.open(newline="") as f:
+                    for row in csv.DictReader(f):
+                        add(row)
+            elif suffix == ".json":
+                with file.open() as f:
+                    data = json.load(f)
+                if isinstance(data, list):
+                    for row in data:
+                        add(row)
+                else:
+                    match = _FILE_WEEK.search(file.stem)
+                    if not match:
+                        continue
+                    season, week = int(match.group(1)), int(match.group(2))
+                    for sleeper_id, row in data.items():
+                        add({"sleeper_id": sleeper_id, **row}, season, week)
+
+        return WeeklyStats(
+            sleeper_ids=np.array(ids, dtype=object),
+            season=np.array(seasons, dtype=np.int64),
+            week=np.array(weeks, dtype=np.int64),
+            points=np.array(points, dtype=np.float64),
+            skipped=skipped,
+        )
+
+    @staticmethod
+    def next_week(stats: WeeklyStats) -> Tuple[int, int]:
+        """The week after the latest one in the data"""
+        t = int((stats.season * WEEKS_PER_SEASON + stats.week - 1).max()) + 1
+        return t // WEEKS_PER_SEASON, t % WEEKS_PER_SEASON + 1
+
+    def compute(
+        self, stats: WeeklyStats, season: int, week: int
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Project ``season``/``week`` from the weeks before it.
+
+        Returns (sleeper_ids, weekly_points, games_sampled), one entry per
+        player with at least one prior week.
+        """
+        t = stats.season * WEEKS_PER_SEASON + stats.week - 1
+        target = season * WEEKS_PER_SEASON + week - 1
+        mask = t < target
+        if not mask.any():
+            empty = np.array([], dtype=np.float64)
+            return np.array([], dtype=object), empty, empty.astype(np.int64)
+
+        ids, player = np.unique(stats.sleeper_ids[mask], return_inverse=True)
+        points = stats.points[mask]
+        weights = self.decay ** (target - t[mask]).astype(np.float64)
+
+        sum_w = np.bincount(player, weights=weights, minlength=len(ids))
+        sum_wx = np.bincount(player, weights=weights * points, minlength=len(ids))
+        games = np.bincount(player, minlength=len(ids))
+
+        prior = points.mean()
+        weekly = (sum_wx + self.prior_weight * prior) / (sum_w + self.prior_weight)
+        return ids, weekly, games
+
+    def recompute(
+        self,
+        db: Session,
+        path: Optional[str] = None,
+        season: Optional[int] = None,
+        week: Optional[int] = None,
+    ) -> Dict:
+        """Load stats, project every player and replace the stored projections.
+
+        Without a season this projects the week after the latest stats. A season
+        without a week projects the week after that season's latest stats, or
+        its week 1 if there are none yet.
+        """
+        stats = self.load_stats(path)
+        if not len(stats):
+            return {"players": 0, "season": season, "week": week, "skipped": 0}
+        if season is None:
+            season, next_week = self.next_week(stats)
+            week = week or next_week
+        elif week is None:
+            played = stats.week[stats.season == season]
+            week = int(played.max()) + 1 if len(played) else 1
+            if week > WEEKS_PER_SEASON:
+                raise ValueError(f"Season {season} has no weeks left to project")
+
+        ids, weekly, games = self.compute(stats, season, week)
+        season_total = weekly * self.season_games
+
+        db.query(Projection).filter(
+            Projection.season == season, Projection.week.in_([week, SEASON_WEEK])
+        ).delete(synchronize_session=False)
+        rows = [
+            {
+                "sleeper_id": sleeper_id,
+                "season": season,
+                "week": target_week,
+                "points": float(value),
+                "games_sampled": int(count),
+            }
+            for target_week, values in ((week, weekly), (SEASON_WEEK, season_total))
+            for sleeper_id, value, count in zip(ids, values, games)
+        ]
+        if rows:
+            db.execute(insert(Projection), rows)
+        db.commit()
+
+        return {
+            "players": len(ids),
+            "season": season,
+            "week": week,
+            "skipped": stats.skipped,
+        }
+
+    def lookup(
+        self,
+        db: Session,
+        season: int,
+        week: int = SEASON_WEEK,
+        positions: Optional[List[str]] = None,
+    ) -> Dict[str, float]:
+        """Stored projections as {sleeper_id: points}"""
+        query = db.query(Projection.sleeper_id, Projection.points).filter(
+            Projection.season == season, Projection.week == week
+        )
+        if positions:
+            query = query.join(Player, Player.sleeper_id == Projection.sleeper_id)
+            query = query.filter(Player.position.in_(positions))
+        return {sleeper_id: points for sleeper_id, points in query}
+
+
+projections_engine = ProjectionsEngine()
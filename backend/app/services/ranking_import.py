@@ -0,0 +1,191 @@
+import csv
+import json
+import re
+from typing import IO, Dict, Iterator, Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.models import Player
+from app.services.player_search import normalize
+
+RANK_COLUMNS = {
+    "sleeper": "sleeper_rank",
+    "espn": "espn_rank",
+    "yahoo": "yahoo_rank",
+}
+NAME_COLUMNS = ("full_name", "name", "player", "player_name")
+POSITION_COLUMNS = ("position", "pos")
+
+# How many unmatched rows are echoed back in the report
+UNMATCHED_SAMPLE = 50
+
+_SUFFIX = re.compile(r"\s+(jr|sr|ii|iii|iv|v)$")
+_AMBIGUOUS = object()
+
+
+def normalize_name(name: Optional[str]) -> str:
+    """Name key that survives punctuation, accents and Jr./III suffixes"""
+    return _SUFFIX.sub("", normalize(name)).replace(" ", "")
+
+
+def iter_json_objects(stream: IO[str], chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    """Stream objects out of a JSON array or JSON Lines file.
+
+    Only one read chunk plus the object being decoded is held in memory, so
+    the size of the file doesn't matter. A row that isn't an object raises
+    ValueError.
+    """
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                return
+            buffer, pos = stream.read(chunk_size), 0
+            eof = not buffer
+            continue
+        try:
+            obj, pos = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            more = stream.read(chunk_size)
+            eof = not more
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        if not isinstance(obj, dict):
+            raise ValueError(f"Expected a JSON object per row, got {obj!r:.40}")
+        yield obj
+
+
+def _first(row: Dict, keys) -> Optional[str]:
+    for key in keys:
+        value = row.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _parse_rank(value) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    try:
+        rank = int(float(value))
+    except (TypeError, ValueError):
+        return None
+    return rank if rank > 0 else None
+
+
+class RankingImporter:
+    """Stream a ranking file into the ``*_rank`` columns of ``players``.
+
+    Rows are matched by ``sleeper_id`` first, then by normalized name (and
+    position, when the name alone is ambiguous) against lookup maps built once
+    from the catalog. Matches are buffered and written with bulk UPDATEs of
+    ``chunk_size`` rows, so memory is bounded by the catalog, not the file.
+    """
+
+    def __init__(self, db: Session, chunk_size: int = 1000):
+        self.db = db
+        self.chunk_size = chunk_size
+        self.by_sleeper_id: Dict[str, str] = {}
+        self.by_name: Dict[str, object] = {}
+        self.by_name_position: Dict[Tuple[str, str], object] = {}
+        self._build_lookup()
+
+    def _build_lookup(self):
+        rows = self.db.query(
+            Player.id, Player.sleeper_id, Player.full_name, Player.position
+        )
+        for player_id, sleeper_id, full_name, position in rows:
+            if sleeper_id:
+                self.by_sleeper_id[sleeper_id] = player_id
+            name = normalize_name(full_name)
+            if not name:
+                continue
+            for lookup, key in (
+                (self.by_name, name),
+                (self.by_name_position, (name, position)),
+            ):
+                lookup[key] = _AMBIGUOUS if key in lookup else player_id
+
+    def match(self, row: Dict) -> Optional[str]:
+        """Player id for a ranking row, or None when unmatched or ambiguous"""
+        sleeper_id = _first(row, ("sleeper_id",))
+        if sleeper_id is not None:
+            player_id = self.by_sleeper_id.get(str(sleeper_id))
+            if player_id:
+                return player_id
+
+        name = normalize_name(_first(row, NAME_COLUMNS))
+        if not name:
+            return None
+        player_id = self.by_name.get(name)
+        if player_id is _AMBIGUOUS:
+            position = _first(row, POSITION_COLUMNS)
+            player_id = self.by_name_position.get((name, str(position).upper()))
+        return None if player_id is _AMBIGUOUS else player_id
+
+    def rows(self, stream: IO[str], fmt: str) -> Iterator[Dict]:
+        if fmt == "csv":
+            return csv.DictReader(stream)
+        if fmt in ("json", "jsonl"):
+            return iter_json_objects(stream)
+        raise ValueError(f"Unsupported ranking file format: {fmt}")
+
+    def run(self, stream: IO[str], fmt: str = "csv", source: Optional[str] = None):
+        """Import every row and return a match report.
+
+        With ``source`` the file's ``rank`` column feeds that source's column;
+        otherwise ``sleeper_rank``/``espn_rank``/``yahoo_rank`` are read as-is.
+        """
+        if source is not None and source not in RANK_COLUMNS:
+            raise ValueError(f"Unknown ranking source: {source}")
+
+        report = {"rows": 0, "matched": 0, "unmatched": 0, "unmatched_rows": []}
+        buffers: Dict[Tuple[str, ...], Dict[str, Dict]] = {}
+
+        for number, row in enumerate(self.rows(stream, fmt), start=1):
+            report["rows"] += 1
+            if source is not None:
+                values = {RANK_COLUMNS[source]: _parse_rank(row.get("rank"))}
+            else:
+                values = {
+                    col: _parse_rank(row.get(col)) for col in RANK_COLUMNS.values()
+                }
+            values = {col: rank for col, rank in values.items() if rank is not None}
+
+            player_id = self.match(row) if values else None
+            if player_id is None:
+                report["unmatched"] += 1
+                if len(report["unmatched_rows"]) < UNMATCHED_SAMPLE:
+                    report["unmatched_rows"].append(
+                        {
+                            "row": number,
+                            "sleeper_id": row.get("sleeper_id"),
+                            "name": _first(row, NAME_COLUMNS),
+                        }
+                    )
+                continue
+
+            report["matched"] += 1
+            key = tuple(sorted(values))
+            buffer = buffers.setdefault(key, {})
+            # A player listed twice in a chunk is written once, last row wins
+            buffer[player_id] = {"id": player_id, **values}
+            if len(buffer) >= self.chunk_size:
+                self._flush(buffer)
+
+        for buffer in buffers.values():
+            self._flush(buffer)
+        self.db.commit()
+        return report
+
+    def _flush(self, buffer: Dict[str, Dict]):
+        if buffer:
+            # ORM bulk UPDATE by primary key: one executemany per chunk
+            self.db.execute(update(Player), list(buffer.values()))
+            buffer.clear()
@@ -33,8 +33,8 @@ class SleeperAPI:
         self, season: int, week: int, positions: Optional[List[str]] = None
     ) -> Dict:
         """Get player projections for a specific week"""
-        # Note: Sleeper doesn't provide projections via API, this is a placeholder
-        # You'd need to integrate with another source or use historical data
+        # Note: Sleeper doesn't provide projections via API, this is a placeholder.
+        # Local projections come from app.services.projections.projections_engine
         return {}
 
     async def close(self):
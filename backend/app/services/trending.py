@@ -0,0 +1,294 @@
+import asyncio
+import logging
+import math
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import (
+    Player,
+    TrendingAggregate,
+    TrendingPoll,
+    TrendingSample,
+    TrendingWindow,
+)
+from app.services.sleeper_api import sleeper_api
+
+logger = logging.getLogger(__name__)
+
+WINDOWS = {"24h": 24, "7d": 168}
+RETENTION_HOURS = max(WINDOWS.values())
+
+# Keeps IN (...) lists well under SQLite's bound parameter limit
+CHUNK_SIZE = 500
+
+Counts = Dict[str, Tuple[int, int]]
+
+
+def current_bucket(now: Optional[float] = None) -> int:
+    """Hour bucket (hours since the Unix epoch) for a timestamp"""
+    return int((time.time() if now is None else now) // 3600)
+
+
+def poll_bucket(poll_time: float) -> Tuple[int, float]:
+    """The bucket a poll's one-hour lookback is recorded in, and the share of
+    that hour the poll has seen.
+
+    A poll at the top of an hour covers exactly the hour that just ended, so
+    it records that bucket's final counts (share 1.0). A poll later in the
+    hour records a provisional count for the hour in progress.
+    """
+    bucket = math.ceil(poll_time / 3600) - 1
+    return bucket, (poll_time - bucket * 3600) / 3600
+
+
+class TrendingService:
+    """Rolling trending add/drop totals fed from the Sleeper trending feed.
+
+    Each poll asks Sleeper for the last hour and lands in an hourly
+    ``trending_samples`` bucket (see ``poll_bucket``); polls on a grid that
+    divides the hour end each bucket with a top-of-the-hour poll, so final
+    buckets tile time without overlap. The 24h and 7d
+    ``trending_aggregates`` are kept up to date incrementally: new samples are
+    added as they arrive, and only the buckets that just slid out of a window
+    are read back and subtracted. Samples older than the longest window are
+    then deleted, so the table never holds more than a week of buckets.
+    """
+
+    def __init__(self, api=sleeper_api, limit: int = 200):
+        self.api = api
+        self.limit = limit
+
+    async def ingest(self, db: Session, poll_time: Optional[float] = None) -> int:
+        """Pull the last hour of trending adds and drops and record them.
+
+        ``poll_time`` is when the poll was scheduled (default now). Mid-hour
+        the lookback still covers the end of the previous hour, so the share
+        of that hour's final counts it overlaps is subtracted, spread evenly
+        over the hour; the top-of-the-hour poll replaces the estimate. The
+        database work runs on a thread, off the event loop.
+        """
+        poll_time = time.time() if poll_time is None else poll_time
+        adds = await self.api.get_trending_players(
+            type="add", hours=1, limit=self.limit
+        )
+        drops = await self.api.get_trending_players(
+            type="drop", hours=1, limit=self.limit
+        )
+
+        counts: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        for entry in adds:
+            counts[entry["player_id"]][0] += entry.get("count", 0)
+        for entry in drops:
+            counts[entry["player_id"]][1] += entry.get("count", 0)
+
+        await asyncio.to_thread(self._store, db, poll_time, counts)
+        return len(counts)
+
+    def _store(self, db: Session, poll_time: float, counts: Dict[str, List[int]]):
+        bucket, seen = poll_bucket(poll_time)
+        if seen < 1:
+            self._exclude_previous_hour(db, bucket, counts, 1 - seen)
+        self.record(db, bucket, {k: tuple(v) for k, v in counts.items()})
+
+    def claim(self, db: Session, poll_at: int) -> bool:
+        """Claim the poll grid slot starting at ``poll_at``; False when another
+        worker already has it"""
+        db.add(TrendingPoll(poll_at=poll_at, claimed_at=int(time.time())))
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return False
+        db.query(TrendingPoll).filter(
+            TrendingPoll.poll_at <= poll_at - RETENTION_HOURS * 3600
+        ).delete(synchronize_session=False)
+        db.commit()
+        return True
+
+    def _exclude_previous_hour(
+        self, db: Session, bucket: int, counts: Dict[str, List[int]], share: float
+    ):
+        ids = list(counts)
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[start : start + CHUNK_SIZE]
+            for sample in db.query(TrendingSample).filter(
+                TrendingSample.bucket == bucket - 1,
+                TrendingSample.sleeper_id.in_(chunk),
+            ):
+                count = counts[sample.sleeper_id]
+                count[0] = max(0, count[0] - round(sample.adds * share))
+                count[1] = max(0, count[1] - round(sample.drops * share))
+
+    def record(self, db: Session, bucket: int, counts: Counts):
+        """Store one bucket of (adds, drops) per player and roll the windows.
+
+        Re-recording a bucket replaces its earlier values; only the difference
+        is applied to the aggregates.
+        """
+        existing = {}
+        ids = list(counts)
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[start : start + CHUNK_SIZE]
+            for sample in db.query(TrendingSample).filter(
+                TrendingSample.bucket == bucket, TrendingSample.sleeper_id.in_(chunk)
+            ):
+                existing[sample.sleeper_id] = sample
+
+        deltas: Counts = {}
+        for sleeper_id, (adds, drops) in counts.items():
+            sample = existing.get(sleeper_id)
+            if sample is None:
+                db.add(
+                    TrendingSample(
+                        sleeper_id=sleeper_id, bucket=bucket, adds=adds, drops=drops
+                    )
+                )
+                deltas[sleeper_id] = (adds, drops)
+            else:
+                deltas[sleeper_id] = (adds - sample.adds, drops - sample.drops)
+                sample.adds, sample.drops = adds, drops
+
+        for window_hours in WINDOWS.values():
+            self._roll_window(db, window_hours, bucket, deltas)
+
+        db.query(TrendingSample).filter(
+            TrendingSample.bucket <= bucket - RETENTION_HOURS
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    def _roll_window(self, db: Session, window_hours: int, bucket: int, deltas: Counts):
+        first_bucket = bucket - window_hours + 1
+        window = db.get(TrendingWindow, window_hours)
+        if window is None:
+            window = TrendingWindow(
+                window_hours=window_hours, first_bucket=first_bucket
+            )
+            db.add(window)
+
+        changes: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+
+        if first_bucket > window.first_bucket:
+            # Subtract only the buckets that have just left the window
+            expired = (
+                db.query(
+                    TrendingSample.sleeper_id,
+                    func.sum(TrendingSample.adds),
+                    func.sum(TrendingSample.drops),
+                )
+                .filter(
+                    TrendingSample.bucket >= window.first_bucket,
+                    TrendingSample.bucket < first_bucket,
+                )
+                .group_by(TrendingSample.sleeper_id)
+            )
+            for sleeper_id, adds, drops in expired:
+                changes[sleeper_id][0] -= adds
+                changes[sleeper_id][1] -= drops
+            window.first_bucket = first_bucket
+
+        if bucket >= window.first_bucket:
+            for sleeper_id, (adds, drops) in deltas.items():
+                changes[sleeper_id][0] += adds
+                changes[sleeper_id][1] += drops
+
+        self._apply(db, window_hours, changes)
+
+    def _apply(self, db: Session, window_hours: int, changes: Dict[str, List[int]]):
+        ids = [sleeper_id for sleeper_id, change in changes.items() if any(change)]
+        for start in range(0, len(ids), CHUNK_SIZE):
+            chunk = ids[start : start + CHUNK_SIZE]
+            rows = {
+                row.sleeper_id: row
+                for row in db.query(TrendingAggregate).filter(
+                    TrendingAggregate.window_hours == window_hours,
+                    TrendingAggregate.sleeper_id.in_(chunk),
+                )
+            }
+            for sleeper_id in chunk:
+                adds, drops = changes[sleeper_id]
+                row = rows.get(sleeper_id)
+                if row is None:
+                    if adds > 0 or drops > 0:
+                        db.add(
+                            TrendingAggregate(
+                                sleeper_id=sleeper_id,
+                                window_hours=window_hours,
+                                adds=adds,
+                                drops=drops,
+                            )
+                        )
+                    continue
+                row.adds += adds
+                row.drops += drops
+                if row.adds <= 0 and row.drops <= 0:
+                    db.delete(row)
+
+    def top(
+        self, db: Session, window_hours: int, type: str = "add", limit: int = 25
+    ) -> List[Dict]:
+        """Most added (or dropped) players over a window, with player details"""
+        column = TrendingAggregate.adds if type == "add" else TrendingAggregate.drops
+        rows = (
+            db.query(
+                TrendingAggregate.sleeper_id,
+                TrendingAggregate.adds,
+                TrendingAggregate.drops,
+                Player.id,
+                Player.full_name,
+                Player.team,
+                Player.position,
+                Player.pool_assignment,
+            )
+            .outerjoin(Player, Player.sleeper_id == TrendingAggregate.sleeper_id)
+            .filter(TrendingAggregate.window_hours == window_hours, column > 0)
+            .order_by(column.desc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "sleeper_id": row.sleeper_id,
+                "adds": row.adds,
+                "drops": row.drops,
+                "net": row.adds - row.drops,
+                "player_id": row.id,
+                "full_name": row.full_name,
+                "team": row.team,
+                "position": row.position,
+                "pool_assignment": row.pool_assignment,
+            }
+            for row in rows
+        ]
+
+    async def run_periodically(self, interval_minutes: int):
+        """Background ingestion loop started from the app lifespan.
+
+        Polls once at startup, then on the clock grid of ``interval_minutes``,
+        which must divide 60 so every hour ends with a poll. Every worker runs
+        the loop, but each grid slot is polled only by the worker that claims
+        it first, so no window is ingested twice.
+        """
+        if interval_minutes <= 0 or 60 % interval_minutes:
+            raise ValueError("The trending poll interval must divide 60 minutes")
+        step = interval_minutes * 60
+        poll_time = None
+        while True:
+            try:
+                slot = int((time.time() if poll_time is None else poll_time) // step)
+                with SessionLocal() as db:
+                    if await asyncio.to_thread(self.claim, db, slot * step):
+                        count = await self.ingest(db, poll_time=poll_time)
+                        logger.info("Recorded trending counts for %d players", count)
+            except Exception:
+                logger.exception("Trending ingestion failed")
+            poll_time = (time.time() // step + 1) * step
+            await asyncio.sleep(max(0.0, poll_time - time.time()))
+
+
+trending_service = TrendingService()
@@ -0,0 +1,55 @@
+"""
+Helpers shared by the benchmark scripts: the backend import path, timing and
+a synthetic player catalog
+"""
+
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.pool_division import RANK_SOURCES  # noqa: E402
+
+# Share of a Sleeper-like catalog per position
+POSITION_MIX = {"QB": 0.12, "RB": 0.22, "WR": 0.33, "TE": 0.15, "K": 0.08, "DEF": 0.10}
+# Share of the catalog each source bothers to rank; the rest are unranked
+SOURCE_DEPTH = {"sleeper_rank": 0.6, "espn_rank": 0.45, "yahoo_rank": 0.35}
+# Spread of a source's rank around the consensus, as a share of the rank
+SOURCE_NOISE = 0.15
+
+
+def make_catalog(count: int, seed: int = 0) -> List[Dict]:
+    """A seeded catalog of ``count`` players shaped like real rankings.
+
+    Players get a random consensus order; every source ranks only its top
+    share of the catalog, with noise proportional to the rank, so stars agree
+    and deep players disagree or go unranked.
+    """
+    rng = random.Random(seed)
+    positions = rng.choices(list(POSITION_MIX), list(POSITION_MIX.values()), k=count)
+    talent = list(range(count))
+    rng.shuffle(talent)
+
+    players = [None] * count
+    for consensus, i in enumerate(talent, start=1):
+        player = {"id": str(i), "position": positions[i]}
+        for key in RANK_SOURCES:
+            depth = SOURCE_DEPTH[key] * count
+            rank = consensus * rng.lognormvariate(0, SOURCE_NOISE)
+            player[key] = max(1, round(rank)) if rank <= depth else None
+        players[i] = player
+    return players
+
+
+def best_of(repeat: int, run) -> float:
+    """Fastest of ``repeat`` calls of ``run``, in milliseconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000
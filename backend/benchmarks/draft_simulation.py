@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark the draft-fairness simulator across worker counts
+
+    python benchmarks/draft_simulation.py [--drafts 2000] [--workers 1 2 4 8]
+"""
+import argparse
+import os
+
+from common import make_catalog
+
+from app.services.draft_simulation import simulate_pools
+from app.services.pool_division import VectorizedPoolDivisionService
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Draft simulation benchmark")
+    parser.add_argument("--players", type=int, default=300)
+    parser.add_argument("--pools", type=int, default=6)
+    parser.add_argument("--drafts", type=int, default=2000)
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    service = VectorizedPoolDivisionService(args.pools)
+    pools, _ = service.divide_players_into_pools(make_catalog(args.players, args.seed))
+    rosters = {
+        idx: [(p["composite_value"], p["position"]) for p in players]
+        for idx, players in pools.items()
+    }
+
+    # The shared pool spawns its processes on first use; don't time that
+    simulate_pools(rosters, drafts=max(args.workers) * 4, workers=max(args.workers))
+
+    print(f"{'workers':>7} {'ms':>10} {'drafts/s':>10} {'speedup':>8}")
+    base = None
+    for workers in sorted(set(args.workers)):
+        result = simulate_pools(
+            rosters, drafts=args.drafts, seed=args.seed, workers=workers
+        )
+        elapsed = result["elapsed_ms"]
+        base = base or elapsed
+        rate = args.drafts * len(rosters) / elapsed * 1000
+        print(f"{workers:>7} {elapsed:>10.1f} {rate:>10.0f} {base / elapsed:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop latency while a burst of logins checks passwords, with
+bcrypt run inline on the loop versus on the hash executor
+
+    python benchmarks/login_storm.py [--logins 32] [--rounds 12]
+"""
+import argparse
+import asyncio
+import time
+
+import common  # noqa: F401  puts the backend on sys.path
+import numpy as np
+
+from app.auth import utils
+
+# How often the probe coroutine wants to run
+TICK_SECONDS = 0.005
+
+
+async def probe(stop: asyncio.Event, lags: list):
+    """Sleep for TICK_SECONDS at a time, recording how late each wake-up is"""
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append((time.perf_counter() - started - TICK_SECONDS) * 1000)
+
+
+async def storm(logins: int, hashed: str, offload: bool) -> dict:
+    async def login():
+        if offload:
+            return await utils.verify_password_async("password123", hashed)
+        return utils.pwd_context.verify_and_update("password123", hashed)
+
+    stop, lags = asyncio.Event(), []
+    ticker = asyncio.create_task(probe(stop, lags))
+    await asyncio.sleep(TICK_SECONDS * 4)
+    started = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+
+    lags = np.array(lags or [0.0])
+    return {
+        "mode": "offload" if offload else "inline",
+        "elapsed_ms": elapsed * 1000,
+        "logins_s": logins / elapsed,
+        "p50_lag_ms": float(np.percentile(lags, 50)),
+        "p99_lag_ms": float(np.percentile(lags, 99)),
+        "max_lag_ms": float(lags.max()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Login storm benchmark")
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--rounds", type=int, default=utils.settings.bcrypt_rounds)
+    args = parser.parse_args()
+
+    utils.pwd_context = utils.pwd_context.copy(bcrypt__rounds=args.rounds)
+    hashed = utils.pwd_context.hash("password123")
+    print(
+        f"{args.logins} logins, bcrypt cost {args.rounds}, "
+        f"{utils.settings.password_hash_workers} hash workers"
+    )
+    print(
+        f"{'mode':>8} {'ms':>9} {'logins/s':>9} "
+        f"{'p50 lag':>8} {'p99 lag':>8} {'max lag':>8}"
+    )
+    for offload in (False, True):
+        row = asyncio.run(storm(args.logins, hashed, offload))
+        print(
+            f"{row['mode']:>8} {row['elapsed_ms']:>9.1f} {row['logins_s']:>9.1f} "
+            f"{row['p50_lag_ms']:>8.1f} {row['p99_lag_ms']:>8.1f} "
+            f"{row['max_lag_ms']:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Benchmark pool division speed, memory and fairness on synthetic catalogs
+
+    python benchmarks/pool_balance.py [--sizes 1000 10000 100000] [--output out.json]
+    python benchmarks/pool_balance.py --baseline out.json
+
+Results are written as JSON. With ``--baseline`` each case is compared with
+the matching case of an earlier run and the script exits non-zero when it is
+slower, heavier or less balanced than the tolerances allow. ``make
+bench-baseline`` and ``make bench-check`` run exactly that pair.
+"""
+import argparse
+import copy
+import json
+import platform
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+from common import best_of, make_catalog
+
+from app.services.pool_division import (
+    PoolDivisionService,
+    VectorizedPoolDivisionService,
+    value_deviation,
+)
+
+BACKENDS = {
+    "reference": PoolDivisionService,
+    "vectorized": VectorizedPoolDivisionService,
+}
+
+
+def shortfalls(service: PoolDivisionService, pools: Dict[int, List[Dict]]) -> int:
+    """Missing players across all pools' position requirements"""
+    missing = 0
+    for players in pools.values():
+        counts = {}
+        for player in players:
+            counts[player["position"]] = counts.get(player["position"], 0) + 1
+        for position, required in service.position_requirements.items():
+            missing += max(0, required - counts.get(position, 0))
+    return missing
+
+
+def run_case(backend: str, players: List[Dict], num_pools: int, repeat: int) -> Dict:
+    service = BACKENDS[backend](num_pools)
+    # Warm up so one-off import and cache allocations don't count as peak
+    service.divide_players_into_pools(copy.copy(players))
+
+    tracemalloc.start()
+    try:
+        pools, pool_values = service.divide_players_into_pools(copy.copy(players))
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    divide_ms = best_of(
+        repeat, lambda: service.divide_players_into_pools(copy.copy(players))
+    )
+    validate_ms = best_of(
+        repeat, lambda: service.validate_pool_balance(pools, pool_values)
+    )
+    validation = service.validate_pool_balance(pools, pool_values)
+
+    return {
+        "backend": backend,
+        "players": len(players),
+        "pools": num_pools,
+        "divide_ms": round(divide_ms, 3),
+        "validate_ms": round(validate_ms, 3),
+        "peak_kb": round(peak / 1024, 1),
+        **{k: round(v, 6) for k, v in value_deviation(pool_values).items()},
+        "shortfalls": shortfalls(service, pools),
+        "balanced": validation["balanced"],
+    }
+
+
+def regressions(results: List[Dict], baseline: List[Dict], args) -> List[str]:
+    """Cases that got slower, heavier or less fair than the baseline"""
+    key = ("backend", "players", "pools")
+    previous = {tuple(case[k] for k in key): case for case in baseline}
+    found = []
+    for case in results:
+        old = previous.get(tuple(case[k] for k in key))
+        if old is None:
+            continue
+        name = "/".join(str(case[k]) for k in key)
+        for metric in ("divide_ms", "validate_ms"):
+            if case[metric] > old[metric] * args.max_slowdown:
+                found.append(f"{name}: {metric} {old[metric]} -> {case[metric]}")
+        if case["peak_kb"] > old["peak_kb"] * args.max_memory_growth:
+            found.append(f"{name}: peak_kb {old['peak_kb']} -> {case['peak_kb']}")
+        if case["max_deviation_pct"] > old["max_deviation_pct"] + args.deviation_pct:
+            found.append(
+                f"{name}: max_deviation_pct {old['max_deviation_pct']} -> "
+                f"{case['max_deviation_pct']}"
+            )
+        if case["shortfalls"] > old["shortfalls"]:
+            found.append(
+                f"{name}: shortfalls {old['shortfalls']} -> {case['shortfalls']}"
+            )
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pool division benchmark suite")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--pools", type=int, nargs="+", default=[6, 12])
+    parser.add_argument(
+        "--backends", nargs="+", choices=list(BACKENDS), default=list(BACKENDS)
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", type=Path, help="write JSON here, not stdout")
+    parser.add_argument("--baseline", type=Path, help="earlier JSON to compare to")
+    parser.add_argument("--max-slowdown", type=float, default=1.5)
+    parser.add_argument("--max-memory-growth", type=float, default=1.25)
+    parser.add_argument(
+        "--deviation-pct",
+        type=float,
+        default=0.5,
+        help="allowed increase of max_deviation_pct, in percentage points",
+    )
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        players = make_catalog(size, args.seed)
+        for num_pools in args.pools:
+            for backend in args.backends:
+                results.append(run_case(backend, players, num_pools, args.repeat))
+                print(json.dumps(results[-1]), file=sys.stderr)
+
+    report = {
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+        found = regressions(results, baseline, args)
+        for line in found:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if found:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
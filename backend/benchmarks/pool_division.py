@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark the list-of-dicts and NumPy pool division backends
+
+    python benchmarks/pool_division.py [--sizes 1000 10000 100000]
+"""
+import argparse
+import copy
+
+from common import best_of, make_catalog
+
+from app.services.pool_division import (
+    PoolDivisionService,
+    VectorizedPoolDivisionService,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pool division benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--pools", type=int, nargs="+", default=[6, 12, 32, 64])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'players':>8} {'pools':>5} {'dicts ms':>10} {'numpy ms':>10} "
+        f"{'arrays ms':>10} {'speedup':>8} {'arrays x':>8}"
+    )
+    for size in args.sizes:
+        players = make_catalog(size)
+        positions, ranks = VectorizedPoolDivisionService.player_arrays(players)
+
+        for num_pools in args.pools:
+            original = PoolDivisionService(num_pools)
+            vectorized = VectorizedPoolDivisionService(num_pools)
+
+            expected = original.divide_players_into_pools(copy.deepcopy(players))
+            actual = vectorized.divide_players_into_pools(copy.deepcopy(players))
+            assert expected[1] == actual[1], "pool values differ"
+
+            base = best_of(
+                args.repeat,
+                lambda: original.divide_players_into_pools(copy.copy(players)),
+            )
+            dicts = best_of(
+                args.repeat,
+                lambda: vectorized.divide_players_into_pools(copy.copy(players)),
+            )
+            arrays = best_of(args.repeat, lambda: vectorized.assign(positions, ranks))
+            print(
+                f"{size:>8} {num_pools:>5} {base:>10.2f} {dicts:>10.2f} "
+                f"{arrays:>10.2f} {base / dicts:>7.1f}x {base / arrays:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -66,6 +66,7 @@ def create_demo_data():
                     },
                     "scoring": "PPR",
                 },
+                member_count=1,
             )
             db.add(demo_league)
 
@@ -123,6 +124,7 @@ def create_demo_data():
                     display_name=f"Player {i+1}",
                 )
                 db.add(league_user)
+            demo_league.member_count += len(test_users)
             db.commit()
             print(f"✅ Added {len(test_users)} test users to demo league")
 
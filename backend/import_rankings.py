@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Import player rankings from a CSV, JSON or JSON Lines file
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add the backend directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+import app.models  # noqa: E402, F401
+from app.database import SessionLocal  # noqa: E402
+from app.services.ranking_import import RANK_COLUMNS, RankingImporter  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("path", type=Path)
+    parser.add_argument(
+        "--source",
+        choices=sorted(RANK_COLUMNS),
+        help="Write the file's 'rank' column to this source's rank column",
+    )
+    args = parser.parse_args()
+
+    fmt = args.path.suffix.lower().lstrip(".") or "csv"
+    db = SessionLocal()
+    try:
+        with args.path.open(encoding="utf-8-sig", newline="") as f:
+            report = RankingImporter(db).run(f, fmt=fmt, source=args.source)
+    except Exception as e:
+        print(f"❌ Error during import: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"✅ Matched {report['matched']} of {report['rows']} rows")
+    if report["unmatched"]:
+        print(f"⚠️  {report['unmatched']} unmatched rows, first few:")
+        for row in report["unmatched_rows"][:10]:
+            print(f"  - row {row['row']}: {row['name'] or row['sleeper_id']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,49 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api import auth, drafts, leagues, players
-from app.database import init_db
+from app.api import admin, auth, drafts, leagues, players
+from app.auth.revocation import revocation_list
+from app.config import get_settings
+from app.database import SessionLocal, init_db
+from app.services import draft_simulation, pool_search
+from app.services.player_catalog import player_catalog
+from app.services.trending import trending_service
 from app.websocket import manager
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     init_db()
+    with SessionLocal() as db:
+        player_catalog.refresh(db)
+        revocation_list.sync(db)
+
+    settings = get_settings()
+    tasks = []
+    if settings.trending_poll_minutes > 0:
+        tasks.append(
+            asyncio.create_task(
+                trending_service.run_periodically(settings.trending_poll_minutes)
+            )
+        )
+    if settings.revocation_sync_seconds > 0:
+        tasks.append(
+            asyncio.create_task(
+                revocation_list.run_periodically(settings.revocation_sync_seconds)
+            )
+        )
+
     yield
 
+    for task in tasks:
+        task.cancel()
+    pool_search.shutdown_executor()
+    draft_simulation.shutdown_executor()
+
 
 app = FastAPI(
     title="FantasyDuel API",
@@ -28,12 +58,15 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Cursor pagination and revalidation headers read by the frontend
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 app.include_router(auth.router, prefix="/api/auth", tags=["auth"])
 app.include_router(players.router, prefix="/api/players", tags=["players"])
 app.include_router(leagues.router, prefix="/api/leagues", tags=["leagues"])
 app.include_router(drafts.router, prefix="/api/drafts", tags=["drafts"])
+app.include_router(admin.router, prefix="/api/admin", tags=["admin"])
 
 
 @app.get("/")
@@ -3,6 +3,7 @@ Pytest configuration and fixtures
 """
 
 import asyncio
+import random
 import uuid
 from typing import Generator
 
@@ -12,9 +13,13 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.auth.utils import get_password_hash
+from app.auth.principal_cache import principal_cache
+from app.auth.revocation import revocation_list
+from app.auth.utils import get_password_hash, token_cache
 from app.database import Base, get_db
 from app.models import League, Player, User
+from app.services.league_cache import league_detail_cache
+from app.services.player_catalog import player_catalog
 from main import app
 
 # Test database setup
@@ -40,6 +45,26 @@ def db() -> Generator[Session, None, None]:
         Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(autouse=True)
+def reset_caches() -> Generator[None, None, None]:
+    """In-memory catalog, index and response caches are process-wide; start
+    every test cold"""
+    player_catalog.wait()
+    player_catalog.clear()
+    league_detail_cache.clear()
+    principal_cache.clear()
+    token_cache.clear()
+    token_cache.reset_stats()
+    revocation_list.clear()
+    yield
+    player_catalog.wait()
+    player_catalog.clear()
+    league_detail_cache.clear()
+    principal_cache.clear()
+    token_cache.clear()
+    revocation_list.clear()
+
+
 @pytest.fixture(scope="function")
 def client(db: Session) -> Generator[TestClient, None, None]:
     """Create a test client with the test database"""
@@ -53,6 +78,10 @@ def client(db: Session) -> Generator[TestClient, None, None]:
     app.dependency_overrides[get_db] = override_get_db
 
     with TestClient(app) as test_client:
+        # Startup loaded the catalog and revocations from the app database,
+        # not the test one
+        player_catalog.clear()
+        revocation_list.clear()
         yield test_client
 
     app.dependency_overrides.clear()
@@ -143,6 +172,36 @@ def sample_players(db: Session) -> list[Player]:
     return players
 
 
+@pytest.fixture
+def ranked_players(db: Session) -> list[Player]:
+    """Enough ranked players (300) for divide-pools"""
+    rng = random.Random(42)
+    positions = ["QB"] * 2 + ["RB"] * 5 + ["WR"] * 5 + ["TE"] * 2 + ["K", "DEF"]
+    players = []
+
+    for i in range(300):
+        position = positions[i % len(positions)]
+        player = Player(
+            id=str(uuid.uuid4()),
+            sleeper_id=f"ranked_{i}",
+            first_name="Ranked",
+            last_name=f"Player{i}",
+            full_name=f"Ranked Player{i}",
+            team=f"TM{i % 32}",
+            position=position,
+            fantasy_positions=[position],
+            status="active",
+            sleeper_rank=rng.randint(1, 400),
+            espn_rank=rng.randint(1, 400),
+            yahoo_rank=rng.choice([None, rng.randint(1, 400)]),
+        )
+        players.append(player)
+        db.add(player)
+
+    db.commit()
+    return players
+
+
 # Event loop configuration for async tests
 @pytest.fixture(scope="session")
 def event_loop():
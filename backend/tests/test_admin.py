@@ -0,0 +1,139 @@
+"""
+Test admin bulk provisioning
+"""
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.api.admin import settings
+from app.auth.utils import verify_password
+from app.models import Draft, DraftPair, League, LeagueUser, User
+
+ADMIN_KEY = "test-admin-key"
+
+
+@pytest.fixture
+def admin_headers(mocker) -> dict:
+    mocker.patch.object(settings, "admin_api_key", ADMIN_KEY)
+    return {"X-Admin-Key": ADMIN_KEY}
+
+
+def league_spec(n: int, num_pools: int = 2, start: int = 0) -> dict:
+    return {
+        "name": f"Bulk {n}",
+        "num_pools": num_pools,
+        "members": [
+            {"email": f"bulk{n}-{i}@example.com"}
+            for i in range(start, start + 2 * num_pools)
+        ],
+    }
+
+
+class TestBulkProvisioning:
+    """Test POST /api/admin/leagues/bulk"""
+
+    @pytest.mark.unit
+    def test_requires_admin_key(self, client: TestClient, mocker):
+        """Test that the endpoint is closed without a configured, matching key"""
+        body = {"leagues": [league_spec(0)], "password": "pw"}
+        response = client.post("/api/admin/leagues/bulk", json=body)
+        assert response.status_code == 403
+
+        mocker.patch.object(settings, "admin_api_key", ADMIN_KEY)
+        response = client.post(
+            "/api/admin/leagues/bulk", json=body, headers={"X-Admin-Key": "wrong"}
+        )
+        assert response.status_code == 403
+
+    @pytest.mark.unit
+    def test_provisions_leagues_pairs_and_drafts(
+        self, client: TestClient, db: Session, admin_headers: dict, test_user: User
+    ):
+        """Test that leagues, users, pairs and drafts are created together"""
+        specs = [league_spec(n) for n in range(20)]
+        specs[0]["members"][0] = {"email": test_user.email}
+        response = client.post(
+            "/api/admin/leagues/bulk",
+            json={"leagues": specs, "password": "bulkpass", "start_drafts": True},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["users_created"] == 20 * 4 - 1
+        assert data["users_attached"] == 1
+        assert len(data["leagues"]) == 20
+
+        assert db.query(League).count() == 20
+        assert db.query(LeagueUser).count() == 80
+        assert db.query(DraftPair).count() == 40
+        assert db.query(Draft).filter_by(status="active").count() == 40
+
+        first = data["leagues"][0]
+        league = db.get(League, first["id"])
+        assert league.commissioner_id == test_user.id
+        assert league.status == "draft_ready"
+        assert league.settings["num_pools"] == 2
+        for pair in first["pairs"]:
+            members = db.query(LeagueUser).filter_by(pair_id=pair["pair_id"]).all()
+            assert len(members) == 2
+            draft = db.get(Draft, pair["draft_id"])
+            assert draft.current_picker_id in {m.user_id for m in members}
+
+        created = db.query(User).filter_by(email="bulk3-1@example.com").one()
+        assert verify_password("bulkpass", created.password_hash)
+        hashes = {u.password_hash for u in db.query(User) if u.id != test_user.id}
+        assert len(hashes) == 1
+
+    @pytest.mark.unit
+    def test_rejects_bad_specs_atomically(
+        self, client: TestClient, db: Session, admin_headers: dict
+    ):
+        """Test validation errors and that a conflict writes nothing"""
+        short = league_spec(0)
+        short["members"].pop()
+        response = client.post(
+            "/api/admin/leagues/bulk",
+            json={"leagues": [short], "password": "pw"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 400
+
+        response = client.post(
+            "/api/admin/leagues/bulk",
+            json={"leagues": [short], "password": "pw", "create_pairs": False},
+            headers=admin_headers,
+        )
+        assert response.status_code == 200
+        assert db.query(LeagueUser).filter_by(pair_id=None).count() == 3
+
+        taken = league_spec(1)
+        taken["members"][1]["username"] = "bulk0-0@example.com"
+        response = client.post(
+            "/api/admin/leagues/bulk",
+            json={"leagues": [league_spec(2), taken], "password": "pw"},
+            headers=admin_headers,
+        )
+        assert response.status_code == 409
+        assert db.query(League).count() == 1
+
+
+class TestCacheStats:
+    """Test GET /api/admin/caches"""
+
+    @pytest.mark.unit
+    def test_reports_counters(
+        self, client: TestClient, admin_headers: dict, auth_headers: dict
+    ):
+        """Test token and principal cache counters after authenticated requests"""
+        for _ in range(3):
+            client.get("/api/auth/me", headers=auth_headers)
+
+        response = client.get("/api/admin/caches", headers=admin_headers)
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["tokens"]["hits"] == 2
+        assert data["principals"]["size"] == 1
+        assert set(data) == {"tokens", "principals", "league_detail"}
+        assert client.get("/api/admin/caches").status_code == 403
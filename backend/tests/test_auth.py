@@ -2,12 +2,30 @@
 Test authentication endpoints
 """
 
+import asyncio
+import threading
+import time
+from datetime import timedelta
+
 import pytest
 from fastapi.testclient import TestClient
+from jose import jwt
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from app.auth.utils import decode_token, verify_password
-from app.models import User
+from app.auth.principal_cache import principal_cache
+from app.auth.revocation import revocation_list
+from app.auth.utils import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    hash_password_async,
+    pwd_context,
+    token_cache,
+    verify_password,
+    verify_password_async,
+)
+from app.models import RefreshSession, RevokedToken, User
 
 
 class TestAuthEndpoints:
@@ -164,3 +182,321 @@ class TestAuthEndpoints:
 
         assert response.status_code == 200
         assert response.json()["message"] == "Successfully logged out"
+
+
+class TestPasswordHashing:
+    """Test bcrypt work is kept off the event loop and costs are upgraded"""
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_verify_runs_on_hash_executor(self, mocker):
+        """Test password checks run on the bcrypt threads, not the loop's"""
+        threads = []
+        original = pwd_context.verify_and_update
+
+        def record(*args):
+            threads.append(threading.current_thread().name)
+            return original(*args)
+
+        mocker.patch.object(pwd_context, "verify_and_update", side_effect=record)
+        hashed = await hash_password_async("secret")
+
+        assert await verify_password_async("secret", hashed) == (True, None)
+        assert await verify_password_async("wrong", hashed) == (False, None)
+        assert all(name.startswith("bcrypt") for name in threads)
+
+    @pytest.mark.unit
+    def test_login_rehashes_outdated_cost(
+        self, client: TestClient, db: Session, test_user: User
+    ):
+        """Test logging in upgrades a hash made with a different bcrypt cost"""
+        test_user.password_hash = pwd_context.copy(bcrypt__rounds=4).hash("testpass123")
+        db.commit()
+        assert pwd_context.needs_update(test_user.password_hash)
+
+        response = client.post(
+            "/api/auth/login",
+            data={"username": test_user.username, "password": "testpass123"},
+        )
+
+        assert response.status_code == 200
+        db.refresh(test_user)
+        assert not pwd_context.needs_update(test_user.password_hash)
+        assert verify_password("testpass123", test_user.password_hash)
+
+
+class TestPrincipalCache:
+    """Test authenticated requests resolve the caller from the principal cache"""
+
+    def _user_queries(self, db: Session, client: TestClient, headers: dict):
+        statements = []
+        engine = db.get_bind()
+
+        def count(conn, cursor, statement, *args):
+            if "FROM users" in statement:
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = client.get("/api/auth/me", headers=headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        return response, statements
+
+    @pytest.mark.unit
+    def test_cached_caller_needs_no_query(
+        self, client: TestClient, db: Session, test_user: User, auth_headers: dict
+    ):
+        """Test only the first request after login loads the user"""
+        response, statements = self._user_queries(db, client, auth_headers)
+        assert response.status_code == 200
+        assert len(statements) == 1
+        assert principal_cache.get(test_user.id) is not None
+
+        db.expunge_all()
+        response, statements = self._user_queries(db, client, auth_headers)
+        assert response.status_code == 200
+        assert statements == []
+        assert response.json()["username"] == test_user.username
+        assert response.json()["created_at"]
+
+    @pytest.mark.unit
+    def test_update_invalidates(
+        self, client: TestClient, db: Session, test_user: User, auth_headers: dict
+    ):
+        """Test updating the user drops the cached principal"""
+        client.get("/api/auth/me", headers=auth_headers)
+        assert principal_cache.get(test_user.id) is not None
+
+        test_user.theme = "light"
+        db.commit()
+        assert principal_cache.get(test_user.id) is None
+
+        response = client.get("/api/auth/me", headers=auth_headers)
+        assert response.json()["theme"] == "light"
+
+    @pytest.mark.unit
+    def test_deactivated_user_is_rejected(
+        self, client: TestClient, db: Session, test_user: User, auth_headers: dict
+    ):
+        """Test deactivating a user takes effect on their next request"""
+        assert client.get("/api/auth/me", headers=auth_headers).status_code == 200
+
+        test_user.is_active = False
+        db.commit()
+
+        response = client.get("/api/auth/me", headers=auth_headers)
+        assert response.status_code == 400
+        assert principal_cache.get(test_user.id) is None
+
+
+class TestTokenCache:
+    """Test verified tokens are served from the digest cache until they expire"""
+
+    @pytest.mark.unit
+    def test_repeat_decode_skips_verification(self, mocker):
+        """Test only the first decode of a token runs the JWT verify"""
+        verify = mocker.spy(jwt, "decode")
+        token = create_access_token({"sub": "user-1"})
+
+        first = decode_token(token)
+        second = decode_token(token)
+
+        assert first == second and second["sub"] == "user-1"
+        assert verify.call_count == 1
+        assert token_cache.stats()["hits"] == 1
+
+    @pytest.mark.unit
+    def test_entry_expires_with_token(self, mocker):
+        """Test a cached token is verified again once its exp has passed"""
+        verify = mocker.spy(jwt, "decode")
+        token = create_access_token({"sub": "user-1"}, timedelta(seconds=30))
+        decode_token(token)
+
+        now = time.monotonic()
+        mocker.patch("app.cache.time.monotonic", return_value=now + 31)
+        decode_token(token)
+
+        assert verify.call_count == 2
+
+    @pytest.mark.unit
+    def test_invalid_tokens_are_not_cached(self):
+        """Test tampered and expired tokens are rejected and never stored"""
+        token = create_access_token({"sub": "user-1"})
+        expired = create_access_token({"sub": "user-1"}, timedelta(seconds=-1))
+
+        assert decode_token(token[:-2] + "xx") is None
+        assert decode_token(expired) is None
+        assert len(token_cache) == 0
+
+
+class TestTokenRevocation:
+    """Test logout revocation by jti and refresh rotation by session"""
+
+    def _login(self, client: TestClient, user: User) -> dict:
+        response = client.post(
+            "/api/auth/login",
+            data={"username": user.username, "password": "testpass123"},
+        )
+        return response.json()
+
+    @pytest.mark.unit
+    def test_tokens_carry_unique_ids(self):
+        """Test every issued token gets its own jti"""
+        tokens = [create_access_token({"sub": "user-1"}) for _ in range(3)]
+        tokens.append(create_refresh_token({"sub": "user-1"}))
+
+        assert len({decode_token(token)["jti"] for token in tokens}) == 4
+
+    @pytest.mark.unit
+    def test_logout_revokes_tokens(
+        self, client: TestClient, db: Session, test_user: User
+    ):
+        """Test logging out rejects the access and refresh tokens afterwards"""
+        tokens = self._login(client, test_user)
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+
+        response = client.post(
+            "/api/auth/logout",
+            headers=headers,
+            json={"refresh_token": tokens["refresh_token"]},
+        )
+
+        assert response.status_code == 200
+        assert db.query(RevokedToken).count() == 1
+        assert db.query(RefreshSession).count() == 0
+        assert client.get("/api/auth/me", headers=headers).status_code == 401
+        response = client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert response.status_code == 401
+
+    @pytest.mark.unit
+    def test_refresh_rotates(self, client: TestClient, test_user: User):
+        """Test a refresh token works once and its replacement works after"""
+        tokens = self._login(client, test_user)
+
+        first = client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        reused = client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        second = client.post(
+            "/api/auth/refresh", json={"refresh_token": first.json()["refresh_token"]}
+        )
+
+        assert first.status_code == 200
+        assert reused.status_code == 401
+        assert second.status_code == 200
+
+    @pytest.mark.unit
+    def test_refresh_storage_bounded(
+        self, client: TestClient, db: Session, test_user: User
+    ):
+        """Test refreshing keeps one session row and revokes nothing"""
+        refresh_token = self._login(client, test_user)["refresh_token"]
+        for _ in range(20):
+            response = client.post(
+                "/api/auth/refresh", json={"refresh_token": refresh_token}
+            )
+            assert response.status_code == 200
+            refresh_token = response.json()["refresh_token"]
+
+        assert db.query(RefreshSession).count() == 1
+        assert db.query(RevokedToken).count() == 0
+        assert len(revocation_list) == 0
+
+    @pytest.mark.unit
+    def test_refresh_without_session_rejected(
+        self, client: TestClient, test_user: User
+    ):
+        """Test refresh tokens issued without a session are refused"""
+        legacy = create_refresh_token({"sub": test_user.id})
+        response = client.post("/api/auth/refresh", json={"refresh_token": legacy})
+        assert response.status_code == 401
+
+    @pytest.mark.unit
+    def test_other_workers_revocations_arrive_on_sync(
+        self, client: TestClient, db: Session, auth_headers: dict
+    ):
+        """Test the hot path reads only the mirror, which sync brings up to date"""
+        jti = decode_token(auth_headers["Authorization"].split()[1])["jti"]
+        now = int(time.time())
+        db.add(RevokedToken(jti=jti, expires_at=now + 60, revoked_at=now))
+        db.commit()
+
+        statements = []
+        engine = db.get_bind()
+
+        def count(conn, cursor, statement, *args):
+            if "revoked_tokens" in statement:
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            before = client.get("/api/auth/me", headers=auth_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        revocation_list.sync(db)
+        after = client.get("/api/auth/me", headers=auth_headers)
+
+        assert statements == []
+        assert before.status_code == 200
+        assert after.status_code == 401
+
+    @pytest.mark.unit
+    def test_compaction_drops_expired(self, db: Session):
+        """Test revocations of expired tokens leave the table and the mirror"""
+        now = int(time.time())
+        db.add_all(
+            [
+                RevokedToken(jti="expired", expires_at=now - 1, revoked_at=now - 90),
+                RevokedToken(jti="live", expires_at=now + 60, revoked_at=now - 90),
+            ]
+        )
+        db.commit()
+        revocation_list.revoke(db, {"jti": "short", "sub": "user-1", "exp": now + 60})
+
+        assert revocation_list.sync(db) == 2
+        assert revocation_list.compact(db) == 1
+        assert revocation_list.is_revoked("live")
+        assert not revocation_list.is_revoked("expired")
+        assert {row.jti for row in db.query(RevokedToken)} == {"live", "short"}
+
+    @pytest.mark.unit
+    def test_compaction_drops_expired_sessions(self, db: Session):
+        """Test refresh sessions leave the table once their token expired"""
+        now = int(time.time())
+        db.add_all(
+            [
+                RefreshSession(id="old", user_id="u", jti="a", expires_at=now - 1),
+                RefreshSession(id="new", user_id="u", jti="b", expires_at=now + 60),
+            ]
+        )
+        db.commit()
+
+        assert revocation_list.compact(db) == 1
+        assert [row.id for row in db.query(RefreshSession)] == ["new"]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_sync_loop_runs_off_event_loop(self, mocker):
+        """Test the periodic sync and compaction run on a worker thread"""
+        threads = []
+        called = threading.Event()
+
+        def work():
+            threads.append(threading.get_ident())
+            called.set()
+            return 0
+
+        mocker.patch.object(revocation_list, "_sync_and_compact", side_effect=work)
+        task = asyncio.create_task(revocation_list.run_periodically(0.01))
+        try:
+            while not called.is_set():
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+
+        assert threads and threads[0] != threading.get_ident()
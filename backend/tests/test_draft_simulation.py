@@ -0,0 +1,102 @@
+"""
+Test the Monte Carlo draft-fairness simulator
+"""
+
+import random
+
+import pytest
+
+from app.models.draft import DRAFT_PICKS
+from app.services.draft_simulation import (
+    STRATEGIES,
+    get_executor,
+    shutdown_executor,
+    simulate_draft,
+    simulate_pools,
+)
+
+
+@pytest.fixture
+def rosters():
+    """Two small pools, one of them lopsided towards a single star"""
+    rng = random.Random(7)
+    positions = ["QB", "RB", "RB", "WR", "WR", "TE", "K", "DEF"]
+    even = [(float(v), rng.choice(positions)) for v in range(10, 410, 10)]
+    lopsided = [(1.0, "QB")] + [(500.0, rng.choice(positions)) for _ in range(39)]
+    return {0: even, 1: lopsided}
+
+
+class TestDraftSimulation:
+    """Test bots, single drafts and the parallel report"""
+
+    @pytest.mark.unit
+    def test_best_available_alternates(self):
+        """Test that best-available bots split a ranked pool odd/even"""
+        values = [float(v) for v in range(1, 41)]
+        pair = (STRATEGIES["best_available"], STRATEGIES["best_available"])
+        first, second = simulate_draft(values, ["WR"] * 40, pair, random.Random(0))
+
+        assert first == sum(range(1, DRAFT_PICKS + 1, 2))
+        assert second == sum(range(2, DRAFT_PICKS + 1, 2))
+
+    @pytest.mark.unit
+    def test_positional_need_fills_roster(self):
+        """Test that a need bot takes its kicker ahead of better players"""
+        values = [float(v) for v in range(1, 41)]
+        positions = ["WR"] * 39 + ["K"]
+        bot = STRATEGIES["positional_need"]
+        board = bot.board(values, random.Random(0))
+        taken = [False] * 40
+        roster = {"QB": 2, "RB": 4, "WR": 4, "TE": 2, "DEF": 1}
+
+        assert bot.pick(board, taken, positions, roster) == 39
+        roster["K"] = 1
+        assert bot.pick(board, taken, positions, roster) == 0
+
+    @pytest.mark.unit
+    def test_report_independent_of_workers(self, rosters):
+        """Test reproducible reports across worker counts and a sane gap"""
+        serial = simulate_pools(rosters, drafts=60, seed=3, workers=1)
+        parallel = simulate_pools(rosters, drafts=60, seed=3, workers=2)
+
+        assert serial["pools"] == parallel["pools"]
+        assert serial["pools"][0]["drafts"] == 60
+        even = serial["pools"][0]
+        assert even["p50_gap"] <= even["p90_gap"] <= even["max_gap"]
+
+    @pytest.mark.unit
+    def test_shared_spawned_pool(self, rosters):
+        """Test that simulations reuse one spawned pool until it is shut down"""
+        executor = get_executor()
+        assert executor._mp_context.get_start_method() == "spawn"
+
+        simulate_pools(rosters, drafts=20, workers=2)
+        assert get_executor() is executor
+
+        shutdown_executor()
+        assert get_executor() is not executor
+        report = simulate_pools(rosters, drafts=20, workers=2)
+        assert report["drafts_played"] == 20 * len(rosters)
+
+    @pytest.mark.unit
+    def test_first_pick_edge(self, rosters):
+        """Test that a lone star shows up as a first-pick edge"""
+        report = simulate_pools(
+            {1: rosters[1]}, drafts=10, strategies=["best_available"], workers=1
+        )["pools"][1]
+        assert report["first_pick_edge"] == 499.0
+        assert report["max_gap"] == report["p50_gap"] == 499.0
+
+    @pytest.mark.unit
+    def test_time_limit(self, rosters):
+        """Test that drafts stop at the time limit, spread over every pool"""
+        report = simulate_pools(rosters, drafts=100000, time_limit_ms=200, workers=1)
+        assert 0 < report["drafts_played"] < 2 * 100000
+        assert report["elapsed_ms"] < 1500
+        assert set(report["pools"]) == set(rosters)
+
+    @pytest.mark.unit
+    def test_unknown_strategy(self, rosters):
+        """Test that unknown strategy names are rejected"""
+        with pytest.raises(ValueError):
+            simulate_pools(rosters, drafts=1, strategies=["coin_flip"])
@@ -0,0 +1,93 @@
+"""
+Test the set-based league membership cleanup
+"""
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.models import League, LeagueUser
+from app.services.league_maintenance import (
+    cleanup_duplicate_memberships,
+    membership_report,
+)
+
+
+@pytest.fixture
+def duplicated(db: Session) -> list[League]:
+    """Two leagues with duplicated memberships, as old databases have them"""
+    db.execute(text("DROP INDEX ix_league_users_league_id_user_id"))
+    leagues = [
+        League(id=f"league-{i}", name=f"League {i}", commissioner_id="c")
+        for i in range(2)
+    ]
+    db.add_all(leagues)
+    rows = [
+        ("league-0", "u1"),
+        ("league-0", "u1"),
+        ("league-0", "u1"),
+        ("league-0", "u2"),
+        ("league-0", None),
+        ("league-0", None),
+        ("league-1", "u1"),
+        ("league-1", "u3"),
+        ("league-1", "u3"),
+    ]
+    for league_id, user_id in rows:
+        db.add(
+            LeagueUser(
+                league_id=league_id,
+                user_id=user_id,
+                email=f"{user_id}@example.com",
+                display_name=str(user_id),
+            )
+        )
+    leagues[1].member_count = 3
+    db.commit()
+    return leagues
+
+
+class TestMembershipCleanup:
+    """Test duplicate removal, counter resync and the report"""
+
+    @pytest.mark.unit
+    def test_dry_run_writes_nothing(self, db: Session, duplicated):
+        """Test that a dry run only counts"""
+        result = cleanup_duplicate_memberships(db, dry_run=True)
+        assert result == {"duplicates": 3, "counters": 2, "dry_run": True}
+        assert db.query(LeagueUser).count() == 9
+
+    @pytest.mark.unit
+    def test_removes_later_rows_and_resyncs(self, db: Session, duplicated):
+        """Test that the first row of each group survives and counts match"""
+        first_ids = {
+            (row.league_id, row.user_id): row.id
+            for row in db.query(LeagueUser).order_by(LeagueUser.id.desc())
+        }
+
+        result = cleanup_duplicate_memberships(db)
+        assert result == {"duplicates": 3, "counters": 2, "dry_run": False}
+
+        remaining = db.query(LeagueUser).all()
+        assert len(remaining) == 6
+        assert {row.id for row in remaining if row.user_id is not None} == {
+            key_id for key, key_id in first_ids.items() if key[1] is not None
+        }
+
+        db.expire_all()
+        assert [league.member_count for league in duplicated] == [4, 2]
+        assert cleanup_duplicate_memberships(db)["duplicates"] == 0
+
+    @pytest.mark.unit
+    def test_report(self, db: Session, duplicated):
+        """Test totals and the fullest leagues from the grouped query"""
+        db.add(League(id="empty", name="Empty", commissioner_id="c"))
+        db.commit()
+        report = membership_report(db, limit=1)
+
+        assert report["leagues"] == 3
+        assert report["leagues_with_members"] == 2
+        assert report["members"] == 9
+        assert report["fullest"] == [
+            {"id": "league-0", "name": "League 0", "members": 6}
+        ]
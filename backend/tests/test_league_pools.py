@@ -0,0 +1,216 @@
+"""
+Test league-scoped pool assignments
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import (
+    Draft,
+    DraftPair,
+    League,
+    LeaguePoolAssignment,
+    LeagueUser,
+    Player,
+    User,
+)
+
+SMALL_REQUIREMENTS = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "K": 1, "DEF": 1}
+
+
+def make_league(db: Session, num_pools: int, requirements=None) -> League:
+    """A league with its own pool settings and 2 * num_pools members"""
+    league = League(
+        id=str(uuid.uuid4()),
+        name=f"{num_pools} pools",
+        commissioner_id="commissioner",
+        status="setup",
+        settings={"num_pools": num_pools, "position_requirements": requirements},
+    )
+    db.add(league)
+    for i in range(2 * num_pools):
+        user = User(
+            id=str(uuid.uuid4()),
+            email=f"{league.id}-{i}@example.com",
+            username=f"{league.id}-{i}",
+            password_hash="dummy",
+            is_active=True,
+        )
+        db.add(user)
+        db.add(
+            LeagueUser(
+                league_id=league.id,
+                user_id=user.id,
+                email=user.email,
+                display_name=user.username,
+            )
+        )
+    db.commit()
+    return league
+
+
+def layout(db: Session, league: League) -> dict:
+    rows = db.query(LeaguePoolAssignment).filter_by(league_id=league.id)
+    return {row.player_id: row.pool_number for row in rows}
+
+
+class TestLeaguePools:
+    """Test per-league division, pairs and draft reads"""
+
+    @pytest.mark.unit
+    def test_divide_uses_league_settings(
+        self, client: TestClient, db: Session, ranked_players: list[Player]
+    ):
+        """Test that each league gets its own layout from its settings"""
+        small = make_league(db, 4, SMALL_REQUIREMENTS)
+        default = make_league(db, 6)
+
+        response = client.post(f"/api/leagues/{small.id}/divide-pools")
+        assert response.status_code == 200
+        assert response.json()["pools_created"] == 4
+        assert set(layout(db, small).values()) == {0, 1, 2, 3}
+        assert layout(db, default) == {}
+
+        client.post(f"/api/leagues/{default.id}/divide-pools")
+        assert set(layout(db, default).values()) == set(range(6))
+        assert len(layout(db, small)) == len(ranked_players)
+
+        # Global assignments are untouched
+        db.expire_all()
+        assert db.query(Player).filter(Player.pool_assignment.isnot(None)).count() == 0
+
+    @pytest.mark.unit
+    def test_pairs_follow_num_pools(self, client: TestClient, db: Session):
+        """Test that create-pairs needs 2 * num_pools members"""
+        league = make_league(db, 3)
+        response = client.post(f"/api/leagues/{league.id}/create-pairs")
+        assert response.status_code == 200
+        assert [p["pool_number"] for p in response.json()["pairs"]] == [0, 1, 2]
+
+        bigger = make_league(db, 3)
+        bigger.settings = {"num_pools": 4}
+        db.commit()
+        response = client.post(f"/api/leagues/{bigger.id}/create-pairs")
+        assert response.status_code == 400
+        assert "exactly 8 users" in response.json()["detail"]
+
+    @pytest.mark.unit
+    def test_draft_reads_league_layout(
+        self, client: TestClient, db: Session, ranked_players: list[Player]
+    ):
+        """Test available players and pick validation against league pools"""
+        league = make_league(db, 4, SMALL_REQUIREMENTS)
+        client.post(f"/api/leagues/{league.id}/divide-pools")
+        pairs = client.post(f"/api/leagues/{league.id}/create-pairs").json()["pairs"]
+        start = client.post(
+            "/api/drafts/start", json={"pair_id": pairs[0]["pair_id"]}
+        ).json()
+        draft_id = start["draft"]["id"]
+        pools = layout(db, league)
+
+        available = client.get(f"/api/drafts/{draft_id}").json()["available_players"]
+        in_pool = {pid for pid, pool in pools.items() if pool == start["pool_number"]}
+        assert {p["id"] for p in available} == in_pool
+        assert all(p["pool_assignment"] == start["pool_number"] for p in available)
+        ranks = [p["composite_rank"] for p in available]
+        assert ranks == sorted(ranks)
+
+        picker = start["draft"]["current_picker_id"]
+        other_pool = next(pid for pid, pool in pools.items() if pid not in in_pool)
+        response = client.post(
+            "/api/drafts/pick",
+            json={"draft_id": draft_id, "user_id": picker, "player_id": other_pool},
+        )
+        assert response.status_code == 400
+
+        response = client.post(
+            "/api/drafts/pick",
+            json={
+                "draft_id": draft_id,
+                "user_id": picker,
+                "player_id": available[0]["id"],
+            },
+        )
+        assert response.status_code == 200
+        available = client.get(f"/api/drafts/{draft_id}").json()["available_players"]
+        assert len(available) == len(in_pool) - 1
+
+    @pytest.mark.unit
+    def test_repool_refused_during_active_draft(
+        self, client: TestClient, db: Session, ranked_players: list[Player]
+    ):
+        """Test that a league with an active draft keeps its layout"""
+        league = make_league(db, 4, SMALL_REQUIREMENTS)
+        client.post(f"/api/leagues/{league.id}/divide-pools")
+        pair = DraftPair(league_id=league.id, pool_number=0)
+        db.add(pair)
+        db.flush()
+        db.add(Draft(id=str(uuid.uuid4()), pair_id=pair.id, status="active"))
+        db.commit()
+
+        response = client.post(f"/api/leagues/{league.id}/divide-pools")
+        assert response.status_code == 400
+
+    @pytest.mark.unit
+    def test_not_enough_players(self, client: TestClient, db: Session, sample_players):
+        """Test that requirements * num_pools players are needed"""
+        league = make_league(db, 6)
+        response = client.post(f"/api/leagues/{league.id}/divide-pools")
+        assert response.status_code == 400
+
+        small = make_league(db, 4, SMALL_REQUIREMENTS)
+        response = client.post(f"/api/leagues/{small.id}/divide-pools")
+        assert response.status_code == 200
+
+    @pytest.mark.unit
+    def test_incremental_writes_changes(
+        self, client: TestClient, db: Session, ranked_players: list[Player]
+    ):
+        """Test that an incremental re-divide only touches changed rows"""
+        league = make_league(db, 4, SMALL_REQUIREMENTS)
+        client.post(f"/api/leagues/{league.id}/divide-pools")
+        before = layout(db, league)
+
+        ranked_players[0].status = "Retired"
+        db.commit()
+        response = client.post(
+            f"/api/leagues/{league.id}/divide-pools", params={"incremental": True}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["incremental"]["removed"] == 1
+
+        after = layout(db, league)
+        assert ranked_players[0].id not in after
+        unchanged = [pid for pid in after if after[pid] == before[pid]]
+        assert len(unchanged) == len(after) - data["incremental"]["moved"]
+
+    @pytest.mark.unit
+    def test_simulate_league_pools(
+        self, client: TestClient, db: Session, ranked_players: list[Player]
+    ):
+        """Test a report per league pool and parameter validation"""
+        league = make_league(db, 4, SMALL_REQUIREMENTS)
+        url = f"/api/leagues/{league.id}/simulate-drafts"
+        assert client.post(url).status_code == 400
+
+        client.post(f"/api/leagues/{league.id}/divide-pools")
+        response = client.post(
+            url,
+            params={
+                "drafts": 20,
+                "strategies": "noisy_adp,positional_need",
+                "time_limit_ms": 30000,
+            },
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["strategies"] == ["noisy_adp", "positional_need"]
+        assert sorted(data["pools"]) == ["0", "1", "2", "3"]
+        assert all(pool["drafts"] == 20 for pool in data["pools"].values())
+
+        response = client.post(url, params={"strategies": "coin_flip"})
+        assert response.status_code == 400
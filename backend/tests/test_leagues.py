@@ -4,9 +4,11 @@ Test league endpoints
 
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app.models import DraftPair, League, LeagueUser, User
+from app.models import Draft, DraftPair, League, LeagueUser, User
 
 
 class TestLeagueEndpoints:
@@ -114,6 +116,7 @@ class TestLeagueEndpoints:
                 display_name=f"User {i}",
             )
             db.add(user)
+        test_league.member_count = 12
         db.commit()
 
         response = client.post(
@@ -210,3 +213,243 @@ class TestLeagueEndpoints:
 
         assert response.status_code == 400
         assert "needs exactly 12 users" in response.json()["detail"]
+
+
+class TestMyLeagues:
+    """Test GET /api/leagues/my-leagues"""
+
+    @pytest.mark.unit
+    def test_one_query_for_many_leagues(
+        self, client: TestClient, db: Session, auth_headers: dict, test_user: User
+    ):
+        """Test counts and active drafts across leagues in a single query"""
+        for i in range(5):
+            league = League(
+                id=f"league-{i}", name=f"League {i}", commissioner_id="someone"
+            )
+            db.add(league)
+            pair = DraftPair(league_id=league.id, pool_number=0)
+            db.add(pair)
+            db.flush()
+            db.add(
+                LeagueUser(
+                    league_id=league.id,
+                    user_id=test_user.id,
+                    email=test_user.email,
+                    display_name=test_user.username,
+                    pair_id=pair.id if i % 2 else None,
+                )
+            )
+            for j in range(i):
+                db.add(
+                    LeagueUser(
+                        league_id=league.id,
+                        user_id=f"other-{j}",
+                        email=f"other{j}@example.com",
+                        display_name=f"Other {j}",
+                    )
+                )
+            status = "active" if i == 1 else "completed"
+            db.add(Draft(id=f"draft-{i}", pair_id=pair.id, status=status))
+        db.commit()
+
+        statements = []
+        engine = db.get_bind()
+
+        def count(conn, cursor, statement, *args):
+            if "league" in statement:
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = client.get("/api/leagues/my-leagues", headers=auth_headers)
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+
+        assert response.status_code == 200
+        assert len(statements) == 1
+        data = response.json()
+        assert [item["league"]["id"] for item in data] == [
+            f"league-{i}" for i in range(5)
+        ]
+        assert [item["user_count"] for item in data] == [1, 2, 3, 4, 5]
+        assert data[1]["active_draft"] == {"id": "draft-1", "status": "active"}
+        assert all(item["active_draft"] is None for item in data if item is not data[1])
+        assert data[0]["my_pair_id"] is None and data[1]["my_pair_id"] is not None
+        assert not any(item["is_commissioner"] for item in data)
+
+
+class TestLeagueDetail:
+    """Test GET /api/leagues/{league_id} loading and caching"""
+
+    @pytest.fixture
+    def eleven_members(self, db: Session, test_league: League) -> League:
+        for i in range(11):
+            db.add(
+                LeagueUser(
+                    league_id=test_league.id,
+                    user_id=f"user-{i}",
+                    email=f"user{i}@example.com",
+                    display_name=f"User {i}",
+                )
+            )
+        db.commit()
+        return test_league
+
+    @staticmethod
+    def count_queries(db: Session, request) -> tuple:
+        statements = []
+        engine = db.get_bind()
+
+        def count(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", count)
+        try:
+            response = request()
+        finally:
+            event.remove(engine, "before_cursor_execute", count)
+        return response, len(statements)
+
+    @pytest.mark.unit
+    def test_cached_and_invalidated(
+        self,
+        client: TestClient,
+        db: Session,
+        eleven_members: League,
+        test_user: User,
+        auth_headers: dict,
+    ):
+        """Test bounded queries, cache hits and invalidation on writes"""
+        url = f"/api/leagues/{eleven_members.id}"
+        for i in range(6):
+            pair = DraftPair(league_id=eleven_members.id, pool_number=i)
+            db.add(pair)
+            db.flush()
+            if i < 3:
+                db.add(Draft(id=f"draft-{i}", pair_id=pair.id, status="completed"))
+        db.commit()
+
+        first, queries = self.count_queries(db, lambda: client.get(url))
+        assert first.status_code == 200
+        assert queries == 4
+        data = first.json()
+        assert data["user_count"] == 11
+        assert len(data["pairs"]) == 6
+        assert len(data["drafts"]) == 3
+
+        cached, queries = self.count_queries(db, lambda: client.get(url))
+        assert queries == 0
+        assert cached.json() == data
+
+        response = client.post(
+            "/api/leagues/join",
+            json={"league_id": eleven_members.id, "user_name": "late", "email": "x"},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        assert client.get(url).json()["user_count"] == 12
+
+    @pytest.mark.unit
+    def test_draft_start_invalidates(
+        self, client: TestClient, db: Session, eleven_members: League
+    ):
+        """Test that pair creation and draft starts show up on the next read"""
+        db.add(
+            LeagueUser(
+                league_id=eleven_members.id,
+                user_id="user-11",
+                email="user11@example.com",
+                display_name="User 11",
+            )
+        )
+        db.commit()
+        url = f"/api/leagues/{eleven_members.id}"
+        assert client.get(url).json()["pairs"] == []
+
+        pairs = client.post(f"/api/leagues/{eleven_members.id}/create-pairs").json()
+        data = client.get(url).json()
+        assert len(data["pairs"]) == 6 and data["drafts"] == {}
+        assert data["league"]["status"] == "draft_ready"
+
+        pair_id = pairs["pairs"][0]["pair_id"]
+        client.post("/api/drafts/start", json={"pair_id": pair_id})
+        drafts = client.get(url).json()["drafts"]
+        assert drafts[str(pair_id)]["status"] == "active"
+
+
+class TestSeatAllocation:
+    """Test the seat counter and unique memberships behind join"""
+
+    @staticmethod
+    def join(client: TestClient, league: League, headers: dict):
+        return client.post(
+            "/api/leagues/join",
+            json={"league_id": league.id, "user_name": "j", "email": "j@x.com"},
+            headers=headers,
+        )
+
+    @pytest.mark.unit
+    def test_join_claims_a_seat_once(
+        self, client: TestClient, db: Session, test_league: League, auth_headers: dict
+    ):
+        """Test that a repeat join is rejected without taking another seat"""
+        assert self.join(client, test_league, auth_headers).status_code == 200
+        response = self.join(client, test_league, auth_headers)
+        assert response.status_code == 400
+        assert "already in this league" in response.json()["detail"]
+
+        db.expire_all()
+        assert test_league.member_count == 1
+        assert db.query(LeagueUser).filter_by(league_id=test_league.id).count() == 1
+
+    @pytest.mark.unit
+    def test_last_seat(
+        self,
+        client: TestClient,
+        db: Session,
+        test_league: League,
+        auth_headers: dict,
+        test_user: User,
+    ):
+        """Test that only one of two joiners gets the final seat"""
+        test_league.member_count = 11
+        other = User(
+            id="other",
+            email="other@example.com",
+            username="other",
+            password_hash=test_user.password_hash,
+        )
+        db.add(other)
+        db.commit()
+        other_headers = {
+            "Authorization": "Bearer "
+            + client.post(
+                "/api/auth/login", data={"username": "other", "password": "testpass123"}
+            ).json()["access_token"]
+        }
+
+        assert self.join(client, test_league, auth_headers).status_code == 200
+        response = self.join(client, test_league, other_headers)
+        assert response.status_code == 400
+        assert "League is full" in response.json()["detail"]
+
+        db.expire_all()
+        assert test_league.member_count == 12
+        assert db.query(LeagueUser).filter_by(user_id="other").count() == 0
+
+    @pytest.mark.unit
+    def test_unique_membership(self, db: Session, test_league: League):
+        """Test that the database rejects a duplicate membership"""
+        for _ in range(2):
+            db.add(
+                LeagueUser(
+                    league_id=test_league.id,
+                    user_id="dup",
+                    email="dup@example.com",
+                    display_name="Dup",
+                )
+            )
+        with pytest.raises(IntegrityError):
+            db.commit()
+        db.rollback()
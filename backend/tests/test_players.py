@@ -0,0 +1,495 @@
+"""
+Test player endpoints
+"""
+
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import Player
+from app.services.player_catalog import (
+    PlayerCatalogStore,
+    player_catalog,
+    read_catalog_version,
+)
+from app.services.player_search import PlayerSearchIndex
+
+
+class TestPlayerSearch:
+    """Test the player search index and endpoint"""
+
+    @pytest.fixture
+    def named_players(self, db: Session) -> list[Player]:
+        """Create players with realistic names for search tests"""
+        rows = [
+            ("Justin", "Jefferson", "MIN", "WR", 0, 1.0),
+            ("Justin", "Herbert", "LAC", "QB", 1, 5.0),
+            ("Amon-Ra", "St. Brown", "DET", "WR", 1, 3.0),
+            ("Ja'Marr", "Chase", "CIN", "WR", 2, 2.0),
+            ("Jerry", "Jeudy", "CLE", "WR", 0, 40.0),
+        ]
+        players = []
+        for i, (first, last, team, position, pool, rank) in enumerate(rows):
+            player = Player(
+                id=str(uuid.uuid4()),
+                sleeper_id=f"search_{i}",
+                first_name=first,
+                last_name=last,
+                full_name=f"{first} {last}",
+                team=team,
+                position=position,
+                fantasy_positions=[position],
+                status="Active",
+                composite_rank=rank,
+                pool_assignment=pool,
+            )
+            players.append(player)
+            db.add(player)
+
+        db.commit()
+        return players
+
+    @pytest.mark.unit
+    def test_prefix_match(self, named_players):
+        """Test that partial names match by prefix"""
+        index = PlayerSearchIndex()
+        index.rebuild(named_players)
+
+        names = [p["full_name"] for p in index.search("jus")]
+        assert names == ["Justin Jefferson", "Justin Herbert"]  # ordered by rank
+
+        names = [p["full_name"] for p in index.search("jus her")]
+        assert names == ["Justin Herbert"]
+
+    @pytest.mark.unit
+    def test_typo_tolerance(self, named_players):
+        """Test that a single typo still finds the player"""
+        index = PlayerSearchIndex()
+        index.rebuild(named_players)
+
+        assert index.search("jeferson")[0]["full_name"] == "Justin Jefferson"
+        assert index.search("jeffresron") == []  # two edits is too far
+        assert index.search("herbret")[0]["full_name"] == "Justin Herbert"
+
+    @pytest.mark.unit
+    def test_exact_match_ranks_first(self, named_players):
+        """Test that exact token matches outrank prefix matches"""
+        index = PlayerSearchIndex()
+        index.rebuild(named_players)
+
+        results = index.search("je")
+        assert {p["full_name"] for p in results} == {
+            "Justin Jefferson",
+            "Jerry Jeudy",
+        }
+        assert index.search("jeudy")[0]["full_name"] == "Jerry Jeudy"
+
+    @pytest.mark.unit
+    def test_punctuation_and_team(self, named_players):
+        """Test normalized names and team abbreviations"""
+        index = PlayerSearchIndex()
+        index.rebuild(named_players)
+
+        assert index.search("jamarr")[0]["full_name"] == "Ja'Marr Chase"
+        assert index.search("st brown")[0]["full_name"] == "Amon-Ra St. Brown"
+        assert index.search("det")[0]["team"] == "DET"
+
+    @pytest.mark.unit
+    def test_search_endpoint(self, client: TestClient, named_players):
+        """Test the search endpoint with pool and position scoping"""
+        response = client.get("/api/players/search", params={"q": "justin"})
+        assert response.status_code == 200
+        assert len(response.json()) == 2
+
+        response = client.get("/api/players/search", params={"q": "justin", "pool": 1})
+        assert [p["full_name"] for p in response.json()] == ["Justin Herbert"]
+
+        response = client.get(
+            "/api/players/search", params={"q": "j", "position": "WR", "limit": 2}
+        )
+        data = response.json()
+        assert len(data) == 2
+        assert all(p["position"] == "WR" for p in data)
+
+    @pytest.mark.unit
+    def test_search_requires_query(self, client: TestClient):
+        """Test that an empty query is rejected"""
+        response = client.get("/api/players/search", params={"q": ""})
+        assert response.status_code == 422
+
+
+class TestPlayerListing:
+    """Test paginated player listings"""
+
+    @pytest.mark.unit
+    def test_keyset_pagination_walks_all_players(
+        self, client: TestClient, db: Session, sample_players: list[Player]
+    ):
+        """Test that following cursors returns every player exactly once"""
+        unranked = sample_players[0]
+        unranked.composite_rank = None
+        db.commit()
+
+        seen = []
+        cursor = None
+        while True:
+            params = {"limit": 7}
+            if cursor:
+                params["cursor"] = cursor
+            response = client.get("/api/players/", params=params)
+            assert response.status_code == 200
+            seen.extend(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+
+        assert len(seen) == len(sample_players)
+        assert len({p["id"] for p in seen}) == len(sample_players)
+        ranks = [p["composite_rank"] for p in seen]
+        assert ranks[:-1] == sorted(ranks[:-1])
+        assert seen[-1]["id"] == unranked.id  # nulls sort last
+
+    @pytest.mark.unit
+    def test_sparse_fields(self, client: TestClient, sample_players: list[Player]):
+        """Test that fields= limits the columns returned"""
+        response = client.get(
+            "/api/players/", params={"fields": "id,full_name", "limit": 3}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert len(data) == 3
+        assert all(set(p) == {"id", "full_name"} for p in data)
+
+        response = client.get("/api/players/", params={"fields": "metadata_json"})
+        assert response.status_code == 400
+
+    @pytest.mark.unit
+    def test_invalid_cursor(self, client: TestClient, sample_players: list[Player]):
+        """Test that a malformed cursor is rejected"""
+        response = client.get("/api/players/", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+    @pytest.mark.unit
+    def test_pool_pagination(self, client: TestClient, sample_players: list[Player]):
+        """Test paging through a single pool"""
+        first = client.get("/api/players/pools/0", params={"limit": 4}).json()
+        assert first["total_players"] == 10
+        assert len(first["players"]) == 4
+        assert first["next_cursor"]
+
+        rest = client.get(
+            "/api/players/pools/0",
+            params={"limit": 100, "cursor": first["next_cursor"]},
+        ).json()
+        assert len(rest["players"]) == 6
+        assert rest["next_cursor"] is None
+        assert all(p["pool_assignment"] == 0 for p in rest["players"])
+
+        response = client.get("/api/players/pools/42")
+        assert response.status_code == 404
+
+    @pytest.mark.unit
+    def test_pool_without_paging_params_is_whole(
+        self, client: TestClient, ranked_players: list[Player]
+    ):
+        """Test that a pool larger than one page is returned whole by default"""
+        client.post("/api/players/divide-pools")
+        pool = client.get("/api/players/pools/0")
+        paged = client.get("/api/players/pools/0", params={"limit": 10})
+
+        assert pool.status_code == 200
+        assert len(pool.json()["players"]) == pool.json()["total_players"] > 10
+        assert pool.json()["next_cursor"] is None
+        assert "X-Next-Cursor" not in pool.headers
+        assert paged.headers["X-Next-Cursor"] == paged.json()["next_cursor"]
+
+    @pytest.mark.unit
+    def test_cursor_header_exposed_to_browsers(
+        self, client: TestClient, sample_players: list[Player]
+    ):
+        """Test that CORS lets the frontend read the cursor and ETag headers"""
+        response = client.get(
+            "/api/players/",
+            params={"limit": 5},
+            headers={"Origin": "http://localhost:3000"},
+        )
+
+        exposed = response.headers["access-control-expose-headers"]
+        assert {"X-Next-Cursor", "ETag"} <= {h.strip() for h in exposed.split(",")}
+        assert response.headers["X-Next-Cursor"]
+
+
+class TestCatalogCaching:
+    """Test versioned caching of player catalog responses"""
+
+    @pytest.mark.unit
+    def test_etag_revalidation(self, client: TestClient, sample_players: list[Player]):
+        """Test that a matching If-None-Match returns 304 without a body"""
+        first = client.get("/api/players/", params={"limit": 5})
+        etag = first.headers["ETag"]
+
+        second = client.get(
+            "/api/players/", params={"limit": 5}, headers={"If-None-Match": etag}
+        )
+        assert second.status_code == 304
+        assert second.content == b""
+
+        other = client.get(
+            "/api/players/", params={"limit": 6}, headers={"If-None-Match": etag}
+        )
+        assert other.status_code == 200
+        assert other.headers["ETag"] != etag
+
+    @pytest.mark.unit
+    def test_cached_until_catalog_write(
+        self, client: TestClient, db: Session, sample_players: list[Player]
+    ):
+        """Test that responses revalidate until any write to players commits"""
+        first = client.get("/api/players/pools/0", params={"fields": "id"})
+        assert first.json()["total_players"] == 10
+        etag = first.headers["ETag"]
+
+        cached = client.get(
+            "/api/players/pools/0",
+            params={"fields": "id"},
+            headers={"If-None-Match": etag},
+        )
+        assert cached.status_code == 304
+
+        # Any committed write bumps the shared version, even a bulk UPDATE
+        db.query(Player).filter(Player.pool_assignment == 0).update(
+            {Player.pool_assignment: 5}
+        )
+        db.commit()
+        response = client.get(
+            "/api/players/pools/0",
+            params={"fields": "id"},
+            headers={"If-None-Match": etag},
+        )
+        # The old snapshot is served while the new one builds off the loop
+        assert response.status_code == 304
+        player_catalog.wait()
+        response = client.get(
+            "/api/players/pools/0",
+            params={"fields": "id"},
+            headers={"If-None-Match": etag},
+        )
+        assert response.status_code == 404
+
+
+class TestCatalogVersion:
+    """Test the shared catalog version that keeps every worker's catalog current"""
+
+    @pytest.mark.unit
+    def test_other_worker_reloads_after_write(
+        self, db: Session, sample_players: list[Player]
+    ):
+        """Test a second store sees a write once its version check runs"""
+        other = PlayerCatalogStore(check_seconds=0)
+        lagging = PlayerCatalogStore(check_seconds=3600)
+        before = other.get(db)
+        lagging.get(db)
+
+        sample_players[0].composite_rank = 0.5
+        db.commit()
+
+        assert other.get(db) is before  # rebuilding in the background
+        other.wait()
+        after = other.get(db)
+        assert after.version != before.version
+        assert after.value("composite_rank", after.row_by_id[sample_players[0].id])
+        assert after.version == read_catalog_version(db)
+        assert lagging.get(db).version == before.version
+
+    @pytest.mark.unit
+    def test_search_sees_writes_from_any_session(
+        self, client: TestClient, db: Session, sample_players: list[Player]
+    ):
+        """Test the catalog and search index reload after a write made outside
+        the API, like a ranking import or a script"""
+        assert client.get("/api/players/search", params={"q": "First1"}).json()
+
+        with Session(bind=db.get_bind()) as other:
+            player = other.get(Player, sample_players[1].id)
+            player.full_name = "Zebulon Quartermaine"
+            other.commit()
+
+        client.get("/api/players/search", params={"q": "First1"})
+        player_catalog.wait()
+        found = client.get("/api/players/search", params={"q": "Quartermaine"})
+        assert [p["id"] for p in found.json()] == [sample_players[1].id]
+
+    @pytest.mark.unit
+    def test_etags_match_across_workers(
+        self, client: TestClient, db: Session, sample_players: list[Player]
+    ):
+        """Test ETags come from the shared version, not the worker"""
+        first = client.get("/api/players/", params={"limit": 5})
+        player_catalog.clear()  # as if the next request hit a fresh worker
+        second = client.get(
+            "/api/players/",
+            params={"limit": 5},
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+        assert second.status_code == 304
+
+    @pytest.mark.unit
+    def test_rollback_keeps_version(self, db: Session, sample_players: list[Player]):
+        """Test that uncommitted player writes don't bump the version"""
+        version = read_catalog_version(db)
+        sample_players[0].team = "XXX"
+        db.flush()
+        db.rollback()
+
+        assert read_catalog_version(db) == version
+
+
+class TestDividePools:
+    """Test POST /api/players/divide-pools"""
+
+    @pytest.mark.unit
+    def test_divide_pools(
+        self, client: TestClient, db: Session, ranked_players: list[Player]
+    ):
+        """Test that every player is assigned and the result is reported"""
+        response = client.post("/api/players/divide-pools")
+        assert response.status_code == 200
+        data = response.json()
+        assert sum(data["pool_sizes"].values()) == len(ranked_players)
+        assert data["optimization"] is None
+
+        db.expire_all()
+        assert db.query(Player).filter(Player.pool_assignment.is_(None)).count() == 0
+
+    @pytest.mark.unit
+    def test_optimized_divide_pools(
+        self, client: TestClient, db: Session, ranked_players: list[Player]
+    ):
+        """Test that the optimizer reports and persists a tighter balance"""
+        response = client.post(
+            "/api/players/divide-pools", params={"optimize": True, "budget_ms": 500}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        report = data["optimization"]
+        assert report["after"]["max_deviation"] < report["before"]["max_deviation"]
+
+        stats = data["validation"]["pool_stats"]
+        db.expire_all()
+        for pool_idx, pool_stats in stats.items():
+            players = db.query(Player).filter_by(pool_assignment=int(pool_idx)).all()
+            assert len(players) == pool_stats["total_players"]
+            assert sum(p.composite_rank for p in players) == pytest.approx(
+                pool_stats["total_value"]
+            )
+
+    @pytest.mark.unit
+    def test_not_enough_players(self, client: TestClient, sample_players):
+        """Test that small player sets are rejected"""
+        response = client.post("/api/players/divide-pools")
+        assert response.status_code == 400
+
+
+class TestIncrementalRepool:
+    """Test incremental divide-pools and sync retirement"""
+
+    @staticmethod
+    def layout(db: Session) -> dict:
+        db.expire_all()
+        return {p.id: p.pool_assignment for p in db.query(Player)}
+
+    @pytest.mark.unit
+    def test_small_delta_keeps_layout(
+        self, client: TestClient, db: Session, ranked_players: list[Player]
+    ):
+        """Test that only added and removed players are written"""
+        client.post("/api/players/divide-pools")
+        before = self.layout(db)
+
+        retired = ranked_players[:2]
+        for player in retired:
+            player.status = "Retired"
+        added = [
+            Player(
+                id=str(uuid.uuid4()),
+                sleeper_id=f"rookie_{i}",
+                first_name="Rookie",
+                last_name=str(i),
+                full_name=f"Rookie {i}",
+                position=position,
+                fantasy_positions=[position],
+                status="active",
+                sleeper_rank=50 + i,
+                espn_rank=60 + i,
+            )
+            for i, position in enumerate(["WR", "RB", "QB"])
+        ]
+        db.add_all(added)
+        db.commit()
+
+        response = client.post(
+            "/api/players/divide-pools", params={"incremental": True}
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["incremental"]["mode"] == "incremental"
+        assert data["incremental"]["added"] == 3
+        assert data["incremental"]["removed"] == 2
+
+        after = self.layout(db)
+        changed = {pid for pid in after if after[pid] != before.get(pid)}
+        assert {p.id for p in retired + added} <= changed
+        assert data["rows_written"] == len(changed)
+        assert all(after[p.id] is None for p in retired)
+        assert all(after[p.id] is not None for p in added)
+
+    @pytest.mark.unit
+    def test_falls_back_to_full_division(
+        self, client: TestClient, db: Session, ranked_players: list[Player]
+    ):
+        """Test that a deviation over the threshold re-divides everything"""
+        client.post("/api/players/divide-pools")
+        ranked_players[0].sleeper_rank = 1
+        ranked_players[0].espn_rank = 1
+        db.commit()
+
+        response = client.post(
+            "/api/players/divide-pools",
+            params={"incremental": True, "threshold_pct": 0.0001},
+        )
+        assert response.status_code == 200
+        assert response.json()["incremental"]["mode"] == "full"
+
+    @pytest.mark.unit
+    def test_sync_retires_missing_players(
+        self, client: TestClient, db: Session, ranked_players: list[Player], mocker
+    ):
+        """Test that sync keeps ids, retires unseen players and repools"""
+        client.post("/api/players/divide-pools")
+        feed = {
+            p.sleeper_id: {
+                "active": True,
+                "position": p.position,
+                "first_name": p.first_name,
+                "last_name": p.last_name,
+                "full_name": p.full_name,
+                "team": p.team,
+                "status": "Active",
+            }
+            for p in ranked_players[1:]
+        }
+        mocker.patch("app.api.players.sleeper_api.get_all_players", return_value=feed)
+        ids = {p.sleeper_id: p.id for p in ranked_players}
+
+        response = client.post("/api/players/sync", params={"repool": True})
+        assert response.status_code == 200
+        data = response.json()
+        assert data["retired"] == 1
+        assert data["repool"]["incremental"]["removed"] == 1
+
+        db.expire_all()
+        assert {p.sleeper_id: p.id for p in db.query(Player)} == ids
+        gone = db.get(Player, ranked_players[0].id)
+        assert gone.status == "Retired" and gone.pool_assignment is None
@@ -2,37 +2,47 @@
 Test pool division service
 """
 
+import copy
+import random
+from collections import Counter
+
+import numpy as np
 import pytest
 
-from app.services.pool_division import PoolDivisionService
+from app.services.pool_division import (
+    PoolDivisionService,
+    VectorizedPoolDivisionService,
+    value_deviation,
+)
 
 
-class TestPoolDivisionService:
-    """Test the pool division algorithm"""
+@pytest.fixture
+def sample_player_data():
+    """Create sample player data for testing"""
+    players = []
 
-    @pytest.fixture
-    def sample_player_data(self):
-        """Create sample player data for testing"""
-        players = []
+    # Create more players than minimum requirements
+    # QB: 30, RB: 70, WR: 70, TE: 30, K: 20, DEF: 20 (240 total)
+    player_counts = {"QB": 30, "RB": 70, "WR": 70, "TE": 30, "K": 20, "DEF": 20}
 
-        # Create more players than minimum requirements
-        # QB: 30, RB: 70, WR: 70, TE: 30, K: 20, DEF: 20 (240 total)
-        player_counts = {"QB": 30, "RB": 70, "WR": 70, "TE": 30, "K": 20, "DEF": 20}
-
-        rank = 1
-        for position, count in player_counts.items():
-            for i in range(count):
-                player = {
-                    "id": f"{position}_{i}",
-                    "position": position,
-                    "sleeper_rank": rank,
-                    "espn_rank": rank + 5,
-                    "yahoo_rank": rank - 3,
-                }
-                players.append(player)
-                rank += 1
+    rank = 1
+    for position, count in player_counts.items():
+        for i in range(count):
+            player = {
+                "id": f"{position}_{i}",
+                "position": position,
+                "sleeper_rank": rank,
+                "espn_rank": rank + 5,
+                "yahoo_rank": rank - 3,
+            }
+            players.append(player)
+            rank += 1
 
-        return players
+    return players
+
+
+class TestPoolDivisionService:
+    """Test the pool division algorithm"""
 
     @pytest.mark.unit
     def test_pool_division_creates_six_pools(self, sample_player_data):
@@ -161,3 +171,174 @@ class TestPoolDivisionService:
             assert "total_value" in stats
             assert "value_deviation" in stats
             assert "positions" in stats
+
+
+class TestVectorizedPoolDivision:
+    """Test that the NumPy backend matches the reference implementation"""
+
+    @staticmethod
+    def random_players(rng: random.Random, count: int) -> list[dict]:
+        positions = ["QB", "RB", "WR", "TE", "K", "DEF", "LB", None]
+        players = []
+        for i in range(count):
+            player = {"id": i, "position": rng.choice(positions)}
+            for key in ("sleeper_rank", "espn_rank", "yahoo_rank"):
+                # Small integer ranks give plenty of ties to break
+                player[key] = rng.choice(
+                    [None, 0, rng.randint(1, 25), rng.random() * 50]
+                )
+            players.append(player)
+        return players
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("seed", range(8))
+    def test_identical_to_reference(self, seed):
+        """Test identical pools, player order, values and dict mutations"""
+        rng = random.Random(seed)
+        num_pools = rng.choice([1, 2, 6, 7, 12, 64])
+        players = self.random_players(rng, rng.choice([0, 5, 300, 2500]))
+        if seed % 2:
+            requirements = {"DEF": 1, "WR": 3, "LB": 2, "QB": 2}
+        else:
+            requirements = PoolDivisionService().position_requirements
+
+        expected_players = copy.deepcopy(players)
+        reference = PoolDivisionService(num_pools)
+        reference.position_requirements = requirements
+        expected = reference.divide_players_into_pools(expected_players)
+
+        actual_players = copy.deepcopy(players)
+        vectorized = VectorizedPoolDivisionService(num_pools)
+        vectorized.position_requirements = requirements
+        actual = vectorized.divide_players_into_pools(actual_players)
+
+        assert actual[1] == expected[1]
+        assert {k: [p["id"] for p in v] for k, v in actual[0].items()} == {
+            k: [p["id"] for p in v] for k, v in expected[0].items()
+        }
+        assert actual_players == expected_players
+
+    @pytest.mark.unit
+    def test_array_interface(self, sample_player_data):
+        """Test assign() on arrays against the dict interface"""
+        service = VectorizedPoolDivisionService()
+        positions = np.array([p["position"] for p in sample_player_data])
+        ranks = np.array(
+            [
+                [p["sleeper_rank"], p["espn_rank"], p["yahoo_rank"]]
+                for p in sample_player_data
+            ],
+            dtype=float,
+        )
+        result = service.assign(positions, ranks)
+        pools, pool_values = PoolDivisionService().divide_players_into_pools(
+            sample_player_data
+        )
+
+        assert result.pool_values.tolist() == list(pool_values.values())
+        assert result.assignment.tolist() == [
+            p["pool_assignment"] for p in sample_player_data
+        ]
+        assert result.values.tolist() == [
+            p["composite_value"] for p in sample_player_data
+        ]
+
+
+class TestPoolOptimizer:
+    """Test swap-based rebalancing of divided pools"""
+
+    @pytest.fixture
+    def unbalanced(self):
+        """Random ranks split into 12 pools, which the snake balances poorly"""
+        rng = random.Random(3)
+        positions = ["QB", "RB", "RB", "WR", "WR", "WR", "TE", "K", "DEF"]
+        players = [
+            {
+                "id": i,
+                "position": rng.choice(positions),
+                "sleeper_rank": rng.randint(1, 500),
+                "espn_rank": rng.randint(1, 500),
+                "yahoo_rank": None,
+            }
+            for i in range(1500)
+        ]
+        service = PoolDivisionService(num_pools=12)
+        pools, pool_values = service.divide_players_into_pools(players)
+        return service, pools, pool_values
+
+    @pytest.mark.unit
+    def test_reduces_deviation(self, unbalanced):
+        """Test that deviation drops and the report matches the result"""
+        service, pools, pool_values = unbalanced
+        before = value_deviation(pool_values)
+
+        pools, pool_values, report = service.optimize_pools(
+            pools, pool_values, budget_ms=1000
+        )
+
+        assert report["before"] == before
+        assert report["after"] == value_deviation(pool_values)
+        assert report["after"]["max_deviation"] < before["max_deviation"] / 10
+        assert report["swaps"] > 0
+        assert service.validate_pool_balance(pools, pool_values)["balanced"]
+
+    @pytest.mark.unit
+    def test_keeps_positions_and_players(self, unbalanced):
+        """Test that swaps preserve each pool's position counts"""
+        service, pools, pool_values = unbalanced
+        counts = {i: Counter(p["position"] for p in v) for i, v in pools.items()}
+        ids = sorted(p["id"] for v in pools.values() for p in v)
+
+        pools, pool_values, _ = service.optimize_pools(pools, pool_values)
+
+        after = {i: Counter(p["position"] for p in v) for i, v in pools.items()}
+        assert after == counts
+        assert sorted(p["id"] for v in pools.values() for p in v) == ids
+        for pool_idx, players in pools.items():
+            assert all(p["pool_assignment"] == pool_idx for p in players)
+            assert pool_values[pool_idx] == pytest.approx(
+                sum(p["composite_value"] for p in players)
+            )
+
+    @pytest.mark.unit
+    def test_respects_budget(self, unbalanced):
+        """Test that the search stops when the budget runs out"""
+        service, pools, pool_values = unbalanced
+        _, _, report = service.optimize_pools(pools, pool_values, budget_ms=1)
+        assert report["elapsed_ms"] < 100
+
+
+class TestIncrementalPlacement:
+    """Test patching an existing layout for a changed player set"""
+
+    @pytest.mark.unit
+    def test_places_delta_only(self, sample_player_data):
+        """Test that kept players stay put and requirements still hold"""
+        service = PoolDivisionService()
+        pools, _ = service.divide_players_into_pools(copy.deepcopy(sample_player_data))
+        current = {p["id"]: idx for idx, v in pools.items() for p in v}
+
+        players = copy.deepcopy(sample_player_data)
+        removed = {p["id"] for p in players if p["position"] == "QB"}
+        removed = set(sorted(removed)[:3])
+        players = [p for p in players if p["id"] not in removed]
+        players.append(
+            {"id": "QB_new", "position": "QB", "sleeper_rank": 2, "espn_rank": 2}
+        )
+
+        pools, pool_values, report = service.place_incremental(players, current)
+
+        assert report["added"] == 1 and report["removed"] == 3
+        placed = {p["id"]: idx for idx, v in pools.items() for p in v}
+        assert set(placed) == {p["id"] for p in players}
+        moved = [
+            pid for pid in placed if pid in current and placed[pid] != current[pid]
+        ]
+        assert len(moved) == report["moved"]
+        assert service.validate_pool_balance(pools, pool_values)["pool_stats"]
+        for v in pools.values():
+            counts = Counter(p["position"] for p in v)
+            assert all(
+                counts[pos] >= need
+                for pos, need in service.position_requirements.items()
+            )
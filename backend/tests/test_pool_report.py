@@ -0,0 +1,89 @@
+"""
+Test the pool fairness report
+"""
+
+import statistics
+from collections import defaultdict
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import Player
+from app.services.player_catalog import PlayerCatalog
+from app.services.pool_report import pool_report
+
+
+class TestPoolReport:
+    """Test the grouped statistics against a plain Python version"""
+
+    @pytest.mark.unit
+    def test_matches_naive_statistics(
+        self, client: TestClient, db: Session, ranked_players: list[Player]
+    ):
+        """Test sums, means, variances, top-N and tier counts per group"""
+        client.post("/api/players/divide-pools")
+        report = pool_report(PlayerCatalog.load(db), top_n=3, tiers=4)
+
+        db.expire_all()
+        groups = defaultdict(list)
+        for player in db.query(Player):
+            groups[player.pool_assignment].append(player)
+        assert sorted(report["pools"]) == sorted(groups)
+        assert len(report["tier_edges"]) == 5
+
+        for pool_number, players in groups.items():
+            entry = report["pools"][pool_number]
+            values = [p.composite_rank for p in players]
+            assert entry["count"] == len(players)
+            assert entry["sum"] == pytest.approx(sum(values))
+            assert entry["variance"] == pytest.approx(statistics.pvariance(values))
+            assert entry["top_n_sum"] == pytest.approx(sum(sorted(values)[:3]))
+            assert sum(entry["tiers"]) == len(players)
+
+            for position, stats in entry["positions"].items():
+                values = [p.composite_rank for p in players if p.position == position]
+                assert stats["count"] == len(values)
+                assert stats["mean"] == pytest.approx(statistics.fmean(values))
+                assert stats["top_n_sum"] == pytest.approx(sum(sorted(values)[:3]))
+
+        total_tiers = [
+            sum(entry["tiers"][t] for entry in report["pools"].values())
+            for t in range(4)
+        ]
+        assert max(total_tiers) - min(total_tiers) <= 1
+
+    @pytest.mark.unit
+    def test_without_pools(self, db: Session, ranked_players: list[Player]):
+        """Test an empty report before any division"""
+        report = pool_report(PlayerCatalog.load(db))
+        assert report["pools"] == {} and report["spread"] is None
+
+
+class TestPoolReportEndpoint:
+    """Test GET /api/players/pools/report"""
+
+    @pytest.mark.unit
+    def test_cached_per_pool_version(
+        self, client: TestClient, db: Session, ranked_players: list[Player]
+    ):
+        """Test that the report is served from cache until the pools change"""
+        client.post("/api/players/divide-pools")
+        first = client.get("/api/players/pools/report", params={"top_n": 2})
+        assert first.status_code == 200
+        assert sorted(first.json()["pools"]) == [str(i) for i in range(6)]
+
+        again = client.get(
+            "/api/players/pools/report",
+            params={"top_n": 2},
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+        assert again.status_code == 304
+
+        client.post("/api/players/divide-pools", params={"seeds": 2})
+        changed = client.get(
+            "/api/players/pools/report",
+            params={"top_n": 2},
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+        assert changed.status_code == 200
@@ -0,0 +1,137 @@
+"""
+Test the parallel multi-seed pool search
+"""
+
+import random
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+from app.services.pool_division import VectorizedPoolDivisionService
+from app.services.pool_search import (
+    MAX_SEEDS,
+    get_executor,
+    score_assignment,
+    search_seeds,
+    shutdown_executor,
+)
+
+
+@pytest.fixture
+def player_arrays():
+    """Half ranked, half unranked players, so ties matter"""
+    rng = random.Random(5)
+    positions = ["QB", "RB", "RB", "WR", "WR", "WR", "TE", "K", "DEF"]
+    players = []
+    for _ in range(600):
+        rank = rng.randint(1, 400) if rng.random() < 0.5 else 999
+        players.append(
+            {"position": rng.choice(positions), "sleeper_rank": rank, "espn_rank": rank}
+        )
+    service = VectorizedPoolDivisionService(num_pools=6)
+    return (service, *service.player_arrays(players))
+
+
+class TestPoolSearch:
+    """Test seeded divisions and the process pool search"""
+
+    @pytest.mark.unit
+    def test_seeded_assign(self, player_arrays):
+        """Test that seeds are reproducible, distinct and complete"""
+        service, positions, ranks = player_arrays
+        first = service.assign(positions, ranks, seed=1)
+        again = service.assign(positions, ranks, seed=1)
+        other = service.assign(positions, ranks, seed=2)
+
+        assert np.array_equal(first.assignment, again.assignment)
+        assert not np.array_equal(first.assignment, other.assignment)
+        assert (first.assignment >= 0).all()
+        assert first.pool_values.sum() == pytest.approx(
+            service.assign(positions, ranks).pool_values.sum()
+        )
+
+    @pytest.mark.unit
+    def test_search_keeps_best(self, player_arrays):
+        """Test that the winner scores best of every seed and the baseline"""
+        service, positions, ranks = player_arrays
+        result = search_seeds(service, positions, ranks, 24, 30000, workers=2)
+
+        scores = [
+            score_assignment(service, positions, service.assign(positions, ranks, s))
+            for s in [None, *range(24)]
+        ]
+        assert result.seeds_tried == 24
+        assert result.score == min(scores)
+        assert result.score == score_assignment(service, positions, result.assignment)
+
+        serial = search_seeds(service, positions, ranks, 24, 30000, workers=1)
+        assert serial.seed == result.seed
+
+    @pytest.mark.unit
+    def test_wall_clock_limit(self, player_arrays):
+        """Test that the search stops at the time limit"""
+        service, positions, ranks = player_arrays
+        # The shared pool spawns its workers on first use; don't time that
+        search_seeds(service, positions, ranks, 4, 30000, workers=2)
+        result = search_seeds(service, positions, ranks, 100000, 300, workers=2)
+
+        assert 0 < result.seeds_tried < 100000
+        assert result.elapsed_ms < 1500
+
+    @pytest.mark.unit
+    def test_no_seeds_is_baseline(self, player_arrays):
+        """Test that zero seeds returns the deterministic division"""
+        service, positions, ranks = player_arrays
+        result = search_seeds(service, positions, ranks, 0, 1000)
+
+        assert result.seed is None and result.seeds_tried == 0
+        assert np.array_equal(
+            result.assignment.assignment, service.assign(positions, ranks).assignment
+        )
+
+    @pytest.mark.unit
+    def test_shared_spawned_pool(self, player_arrays):
+        """Test that searches reuse one spawned pool until it is shut down"""
+        service, positions, ranks = player_arrays
+        executor = get_executor()
+        assert executor._mp_context.get_start_method() == "spawn"
+
+        search_seeds(service, positions, ranks, 4, 30000, workers=2)
+        assert get_executor() is executor
+
+        shutdown_executor()
+        assert get_executor() is not executor
+        assert search_seeds(service, positions, ranks, 4, 30000).seeds_tried == 4
+
+
+class TestDividePoolsSearch:
+    """Test the seed search through POST /api/players/divide-pools"""
+
+    @pytest.mark.integration
+    def test_endpoint_search(self, client: TestClient, ranked_players):
+        """Test that the search result is reported and never worse"""
+        plain = client.post("/api/players/divide-pools").json()
+        response = client.post(
+            "/api/players/divide-pools", params={"seeds": 8, "time_limit_ms": 20000}
+        )
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["search"]["seeds_tried"] == 8
+        assert len(data["validation"]["warnings"]) <= len(
+            plain["validation"]["warnings"]
+        )
+        assert max(
+            s["value_deviation"] for s in data["validation"]["pool_stats"].values()
+        ) <= max(
+            s["value_deviation"] for s in plain["validation"]["pool_stats"].values()
+        )
+
+    @pytest.mark.unit
+    def test_seed_budget(self, client: TestClient):
+        """Test that a request can't ask for more than MAX_SEEDS seeds"""
+        response = client.post(
+            "/api/players/divide-pools", params={"seeds": MAX_SEEDS + 1}
+        )
+        assert response.status_code == 422
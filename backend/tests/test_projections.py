@@ -0,0 +1,173 @@
+"""
+Test the local projections engine
+"""
+
+import json
+import random
+import time
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import Player, Projection
+from app.services.projections import ProjectionsEngine
+
+
+@pytest.fixture
+def stats_dir(tmp_path):
+    """One CSV season file plus a Sleeper-style weekly JSON dump"""
+    (tmp_path / "2023.csv").write_text(
+        "sleeper_id,season,week,fantasy_points\n"
+        "sleeper_0,2023,16,20.0\n"
+        "sleeper_0,2023,17,30.0\n"
+        "sleeper_1,2023,17,10.0\n"
+    )
+    (tmp_path / "2023_week18.json").write_text(
+        json.dumps({"sleeper_0": {"pts_ppr": 25.0}, "sleeper_2": {"pts_ppr": 4.0}})
+    )
+    return tmp_path
+
+
+class TestProjectionsEngine:
+    """Test projection math and storage"""
+
+    @pytest.mark.unit
+    def test_compute_matches_reference(self, stats_dir):
+        """Test the vectorized math against a straightforward per-player loop"""
+        engine = ProjectionsEngine(decay=0.5, prior_weight=1.0)
+        stats = engine.load_stats(str(stats_dir))
+        assert len(stats) == 5
+        assert engine.next_week(stats) == (2024, 1)
+
+        ids, weekly, games = engine.compute(stats, 2024, 1)
+        result = dict(zip(ids, weekly))
+        assert dict(zip(ids, games)) == {"sleeper_0": 3, "sleeper_1": 1, "sleeper_2": 1}
+
+        prior = (20 + 30 + 10 + 25 + 4) / 5
+        # sleeper_0: weeks 16, 17, 18 are 3, 2 and 1 weeks before 2024 week 1
+        num = 0.125 * 20 + 0.25 * 30 + 0.5 * 25 + prior
+        assert result["sleeper_0"] == pytest.approx(num / (0.875 + 1.0))
+        assert result["sleeper_1"] == pytest.approx((0.25 * 10 + prior) / 1.25)
+
+    @pytest.mark.unit
+    def test_compute_ignores_future_weeks(self, stats_dir):
+        """Test that projecting a past week only uses the weeks before it"""
+        engine = ProjectionsEngine()
+        ids, _, games = engine.compute(engine.load_stats(str(stats_dir)), 2023, 17)
+        assert dict(zip(ids, games)) == {"sleeper_0": 1}
+
+    @pytest.mark.unit
+    def test_recompute_replaces_rows(self, db: Session, stats_dir):
+        """Test that recompute stores weekly and season rows, replacing old ones"""
+        engine = ProjectionsEngine(season_games=10)
+        db.add(Projection(sleeper_id="stale", season=2024, week=0, points=1.0))
+        db.commit()
+
+        result = engine.recompute(db, path=str(stats_dir))
+        assert result == {"players": 3, "season": 2024, "week": 1, "skipped": 0}
+
+        weekly = engine.lookup(db, 2024, 1)
+        season = engine.lookup(db, 2024)
+        assert set(season) == {"sleeper_0", "sleeper_1", "sleeper_2"}
+        assert season["sleeper_0"] == pytest.approx(weekly["sleeper_0"] * 10)
+
+    @pytest.mark.unit
+    def test_invalid_rows_skipped(self, tmp_path):
+        """Test that rows with bad points or weeks are skipped and counted"""
+        (tmp_path / "bad.csv").write_text(
+            "sleeper_id,season,week,fantasy_points\n"
+            "sleeper_0,2023,1,12.5\n"
+            "sleeper_1,2023,1,DNP\n"
+            "sleeper_2,2023,0,40.0\n"
+            "sleeper_3,2023,19,8.0\n"
+            "sleeper_4,2023,abc,8.0\n"
+            "sleeper_5,2023,2,nan\n"
+        )
+        stats = ProjectionsEngine().load_stats(str(tmp_path))
+        assert list(stats.sleeper_ids) == ["sleeper_0"]
+        assert stats.skipped == 5
+
+    @pytest.mark.unit
+    def test_recompute_season_without_week(self, db: Session, stats_dir):
+        """Test that a season alone projects the week after its latest stats"""
+        engine = ProjectionsEngine()
+        result = engine.recompute(db, path=str(stats_dir), season=2025)
+        assert (result["season"], result["week"]) == (2025, 1)
+        with pytest.raises(ValueError):
+            engine.recompute(db, path=str(stats_dir), season=2023)
+
+        (stats_dir / "2023_week18.json").unlink()
+        result = engine.recompute(db, path=str(stats_dir), season=2023)
+        assert (result["season"], result["week"]) == (2023, 18)
+        assert set(engine.lookup(db, 2023, 18)) == {"sleeper_0", "sleeper_1"}
+
+    @pytest.mark.slow
+    def test_recompute_speed(self, db: Session, tmp_path):
+        """Test that five seasons for 2,000 players recompute in under a second"""
+        rng = random.Random(3)
+        lines = ["sleeper_id,season,week,fantasy_points"]
+        for season in range(2019, 2024):
+            for week in range(1, 18):
+                for player in range(2000):
+                    lines.append(f"p{player},{season},{week},{rng.random() * 30:.2f}")
+        (tmp_path / "history.csv").write_text("\n".join(lines))
+
+        engine = ProjectionsEngine()
+        stats = engine.load_stats(str(tmp_path))
+        started = time.perf_counter()
+        ids, weekly, _ = engine.compute(stats, 2024, 1)
+        assert time.perf_counter() - started < 1.0
+        assert len(ids) == 2000 and np.isfinite(weekly).all()
+
+
+class TestProjectionEndpoints:
+    """Test the projection endpoints"""
+
+    @pytest.mark.unit
+    def test_recompute_and_read(
+        self,
+        client: TestClient,
+        sample_players: list[Player],
+        stats_dir,
+        monkeypatch,
+    ):
+        """Test recomputing from stats_dir and filtering by position"""
+        monkeypatch.setattr(
+            "app.services.projections.settings.stats_dir", str(stats_dir)
+        )
+
+        result = client.post("/api/players/projections/recompute").json()
+        assert result["players"] == 3
+        assert "elapsed_ms" in result
+
+        data = client.get("/api/players/projections", params={"season": 2024}).json()
+        assert set(data["projections"]) == {"sleeper_0", "sleeper_1", "sleeper_2"}
+
+        data = client.get(
+            "/api/players/projections",
+            params={"season": 2024, "week": 1, "position": "RB"},
+        ).json()
+        assert set(data["projections"]) == {"sleeper_1"}  # sample player 1 is an RB
+
+    @pytest.mark.unit
+    def test_recompute_bad_rows(self, client: TestClient, stats_dir, monkeypatch):
+        """Test that bad stat rows are skipped and a finished season is a 400"""
+        (stats_dir / "extra.csv").write_text(
+            "sleeper_id,season,week,fantasy_points\n"
+            "sleeper_9,2023,0,40.0\n"
+            "sleeper_9,2023,5,n/a\n"
+        )
+        monkeypatch.setattr(
+            "app.services.projections.settings.stats_dir", str(stats_dir)
+        )
+
+        response = client.post("/api/players/projections/recompute")
+        assert response.status_code == 200
+        assert response.json()["skipped"] == 2
+
+        response = client.post(
+            "/api/players/projections/recompute", params={"season": 2023}
+        )
+        assert response.status_code == 400
@@ -0,0 +1,316 @@
+"""
+Regression tests for query plans: every endpoint's filtered queries must be
+answered from an index, never a full table scan
+"""
+
+import uuid
+from typing import List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.api.admin import settings as admin_settings
+from app.auth.revocation import revocation_list
+from app.database import Base
+from app.models import League, LeagueUser, Player, User
+from app.services.sleeper_api import sleeper_api
+from app.services.trending import trending_service
+
+TABLES = set(Base.metadata.tables)
+
+
+def full_scans(db: Session, queries: List[Tuple[str, tuple]]) -> List[str]:
+    """Run EXPLAIN QUERY PLAN on each captured query and collect table scans.
+
+    Statements without a WHERE clause are skipped: plain INSERTs have no plan
+    to check, and unfiltered reads (the player catalog load, the ranking
+    importer's lookup of every player) scan by design. Batched statements
+    are explained with their first parameter set. ``SCAN x USING INDEX``
+    walks an index in order and is allowed.
+    """
+    problems = []
+    with db.get_bind().connect() as conn:
+        for statement, params in queries:
+            verb = statement.lstrip().split(None, 1)[0].upper()
+            if verb not in ("SELECT", "UPDATE", "DELETE") or "WHERE" not in statement:
+                continue
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", params)
+            for row in plan:
+                detail = row[-1]
+                words = detail.split()
+                if words[0] == "SCAN" and words[1] in TABLES and "USING" not in words:
+                    problems.append(f"{detail}\n    {' '.join(statement.split())}")
+    return problems
+
+
+@pytest.fixture
+def captured_queries(db: Session):
+    """Record every statement executed against the test engine"""
+    queries: List[Tuple[str, tuple]] = []
+    engine = db.get_bind()
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if executemany:
+            parameters = parameters[0] if parameters else ()
+        queries.append((statement, tuple(parameters or ())))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    yield queries
+    event.remove(engine, "before_cursor_execute", capture)
+
+
+@pytest.fixture
+def full_league(db: Session, test_league: League, test_user: User) -> League:
+    """Fill the test league to 12 members, commissioner included"""
+    members = [test_user]
+    for i in range(11):
+        user = User(
+            id=str(uuid.uuid4()),
+            email=f"member{i}@example.com",
+            username=f"member{i}",
+            password_hash="dummy",
+            is_active=True,
+        )
+        db.add(user)
+        members.append(user)
+
+    for user in members:
+        db.add(
+            LeagueUser(
+                league_id=test_league.id,
+                user_id=user.id,
+                email=user.email,
+                display_name=user.username,
+            )
+        )
+    db.commit()
+    return test_league
+
+
+class TestQueryPlans:
+    """EXPLAIN QUERY PLAN over the queries each endpoint runs"""
+
+    @pytest.mark.integration
+    def test_player_endpoints(
+        self,
+        client: TestClient,
+        db: Session,
+        ranked_players: list[Player],
+        captured_queries,
+        mocker,
+    ):
+        """Test player listing, search, sync and pool endpoints"""
+        feed = {
+            p.sleeper_id: {
+                "active": True,
+                "position": p.position,
+                "full_name": p.full_name,
+            }
+            for p in ranked_players
+        }
+        feed["new_1"] = {"active": True, "position": "WR", "full_name": "C D"}
+        mocker.patch.object(sleeper_api, "get_all_players", return_value=feed)
+
+        assert client.post("/api/players/sync").status_code == 200
+        # Enough players that the global divide and its bulk update really run
+        assert client.post("/api/players/divide-pools").status_code == 200
+        assert client.get("/api/players/", params={"position": "QB"}).status_code == 200
+        assert client.get("/api/players/pools/0").status_code == 200
+        assert client.get("/api/players/search", params={"q": "la"}).status_code == 200
+
+        assert full_scans(db, captured_queries) == []
+
+    @pytest.mark.integration
+    def test_league_endpoints(
+        self,
+        client: TestClient,
+        db: Session,
+        full_league: League,
+        auth_headers: dict,
+        captured_queries,
+    ):
+        """Test league create, join, listing, detail and pair creation"""
+        created = client.post(
+            "/api/leagues/create",
+            json={
+                "name": "Plans",
+                "commissioner_name": "c",
+                "commissioner_email": "c@example.com",
+            },
+            headers=auth_headers,
+        )
+        assert created.status_code == 200
+        client.post(
+            "/api/leagues/join",
+            json={"league_id": full_league.id, "user_name": "x", "email": "x@x.com"},
+            headers=auth_headers,
+        )
+        assert client.get("/api/leagues/my-leagues", headers=auth_headers).json()
+        assert client.post(f"/api/leagues/{full_league.id}/create-pairs").json()
+        assert client.get(f"/api/leagues/{full_league.id}").status_code == 200
+
+        assert full_scans(db, captured_queries) == []
+
+    @pytest.mark.integration
+    def test_draft_endpoints(
+        self,
+        client: TestClient,
+        db: Session,
+        full_league: League,
+        sample_players: list[Player],
+        auth_headers: dict,
+        captured_queries,
+    ):
+        """Test draft start, picks, detail and rosters"""
+        pairs = client.post(f"/api/leagues/{full_league.id}/create-pairs").json()
+        pair = pairs["pairs"][0]
+
+        start = client.post(
+            "/api/drafts/start", json={"pair_id": pair["pair_id"]}, headers=auth_headers
+        ).json()
+        draft_id = start["draft"]["id"]
+        player = next(
+            p for p in sample_players if p.pool_assignment == start["pool_number"]
+        )
+        pick = client.post(
+            "/api/drafts/pick",
+            json={
+                "draft_id": draft_id,
+                "user_id": start["draft"]["current_picker_id"],
+                "player_id": player.id,
+            },
+            headers=auth_headers,
+        )
+        assert pick.status_code == 200
+        assert client.get(f"/api/drafts/{draft_id}").status_code == 200
+        assert client.get(f"/api/drafts/{draft_id}/rosters").status_code == 200
+
+        assert full_scans(db, captured_queries) == []
+
+    @pytest.mark.integration
+    def test_league_pool_endpoints(
+        self,
+        client: TestClient,
+        db: Session,
+        full_league: League,
+        ranked_players: list[Player],
+        auth_headers: dict,
+        captured_queries,
+    ):
+        """Test league division and draft reads against league pools"""
+        assert client.post(f"/api/leagues/{full_league.id}/divide-pools").json()
+        pair = client.post(f"/api/leagues/{full_league.id}/create-pairs").json()
+        start = client.post(
+            "/api/drafts/start",
+            json={"pair_id": pair["pairs"][0]["pair_id"]},
+            headers=auth_headers,
+        ).json()
+        draft_id = start["draft"]["id"]
+        available = client.get(f"/api/drafts/{draft_id}").json()["available_players"]
+        pick = client.post(
+            "/api/drafts/pick",
+            json={
+                "draft_id": draft_id,
+                "user_id": start["draft"]["current_picker_id"],
+                "player_id": available[0]["id"],
+            },
+        )
+        assert pick.status_code == 200
+
+        assert full_scans(db, captured_queries) == []
+
+    @pytest.mark.integration
+    def test_auth_endpoints(self, client: TestClient, db: Session, captured_queries):
+        """Test register, login, refresh, me, logout and revocation sync"""
+        client.post(
+            "/api/auth/register",
+            json={"email": "p@example.com", "username": "plans", "password": "pw"},
+        )
+        tokens = client.post(
+            "/api/auth/login", data={"username": "p@example.com", "password": "pw"}
+        ).json()
+        headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+        assert client.get("/api/auth/me", headers=headers).status_code == 200
+        refreshed = client.post(
+            "/api/auth/refresh", json={"refresh_token": tokens["refresh_token"]}
+        )
+        assert refreshed.status_code == 200
+        assert client.post("/api/auth/logout", headers=headers).status_code == 200
+        revocation_list.sync(db)
+        revocation_list.sync(db)
+        revocation_list.compact(db)
+
+        assert full_scans(db, captured_queries) == []
+
+    @pytest.mark.integration
+    def test_trending_and_projections(
+        self,
+        client: TestClient,
+        db: Session,
+        sample_players: list[Player],
+        captured_queries,
+        mocker,
+        tmp_path,
+    ):
+        """Test trending ingestion and reads, projection recompute and lookup"""
+        for bucket in range(1000, 1000 + 200, 7):
+            trending_service.record(
+                db, bucket, {"sleeper_0": (5, 1), f"sleeper_{bucket % 9}": (2, 3)}
+            )
+        for window in ("24h", "7d"):
+            response = client.get("/api/players/trending", params={"window": window})
+            assert response.status_code == 200
+
+        (tmp_path / "2023.csv").write_text(
+            "sleeper_id,season,week,fantasy_points\n"
+            "sleeper_0,2023,1,10\nsleeper_1,2023,1,7\nsleeper_0,2023,2,12\n"
+        )
+        mocker.patch("app.services.projections.settings.stats_dir", str(tmp_path))
+        assert client.post("/api/players/projections/recompute").status_code == 200
+        response = client.get(
+            "/api/players/projections",
+            params={"season": 2023, "week": 3, "position": "QB"},
+        )
+        assert response.status_code == 200
+
+        assert full_scans(db, captured_queries) == []
+
+    @pytest.mark.integration
+    def test_rankings_import_and_admin_bulk(
+        self,
+        client: TestClient,
+        db: Session,
+        sample_players: list[Player],
+        test_user: User,
+        captured_queries,
+        mocker,
+    ):
+        """Test the ranking importer's batched updates and bulk provisioning"""
+        files = {
+            "file": (
+                "ranks.csv",
+                b"sleeper_id,sleeper_rank,espn_rank\nsleeper_0,3,4\nsleeper_1,5,6\n",
+                "text/csv",
+            )
+        }
+        response = client.post("/api/players/rankings/import", files=files)
+        assert response.json()["matched"] == 2
+
+        mocker.patch.object(admin_settings, "admin_api_key", "plans")
+        members = [{"email": test_user.email}] + [
+            {"email": f"bulk{i}@example.com"} for i in range(3)
+        ]
+        response = client.post(
+            "/api/admin/leagues/bulk",
+            headers={"X-Admin-Key": "plans"},
+            json={
+                "leagues": [{"name": "Bulk", "num_pools": 2, "members": members}],
+                "password": "pw",
+                "start_drafts": True,
+            },
+        )
+        assert response.status_code == 200
+
+        assert full_scans(db, captured_queries) == []
@@ -0,0 +1,222 @@
+"""
+Test the streaming ranking importer
+"""
+
+import io
+import json
+import tracemalloc
+import uuid
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models import Player
+from app.services.player_catalog import player_catalog, read_catalog_version
+from app.services.ranking_import import RankingImporter, iter_json_objects
+
+
+@pytest.fixture
+def named_players(db: Session) -> list[Player]:
+    """Players with real-world name shapes, including a shared name"""
+    players = [
+        Player(
+            id=str(uuid.uuid4()),
+            sleeper_id="4046",
+            full_name="Patrick Mahomes",
+            position="QB",
+        ),
+        Player(
+            id=str(uuid.uuid4()),
+            sleeper_id="4866",
+            full_name="Saquon Barkley",
+            position="RB",
+        ),
+        Player(
+            id=str(uuid.uuid4()),
+            sleeper_id="6794",
+            full_name="Ja'Marr Chase",
+            position="WR",
+        ),
+        Player(
+            id=str(uuid.uuid4()),
+            sleeper_id="7000",
+            full_name="Mike Williams",
+            position="WR",
+        ),
+        Player(
+            id=str(uuid.uuid4()),
+            sleeper_id="7001",
+            full_name="Mike Williams",
+            position="TE",
+        ),
+        Player(
+            id=str(uuid.uuid4()),
+            sleeper_id="8000",
+            full_name="Kenneth Walker III",
+            position="RB",
+        ),
+    ]
+    db.add_all(players)
+    db.commit()
+    return players
+
+
+def ranks(db: Session, column: str) -> dict:
+    db.expire_all()
+    return {p.full_name + p.position: getattr(p, column) for p in db.query(Player)}
+
+
+class TestRankingImporter:
+    """Test matching, bulk updates and the report"""
+
+    @pytest.mark.unit
+    def test_csv_matches_by_id_and_normalized_name(self, db: Session, named_players):
+        """Test sleeper id, punctuation/suffix and position-disambiguated matches"""
+        csv_text = (
+            "sleeper_id,name,position,espn_rank,yahoo_rank\n"
+            "4046,,QB,3,5\n"
+            ",saquon barkley,RB,1,\n"
+            ",Jamarr Chase,WR,2,2\n"
+            ",Kenneth Walker,RB,40,38\n"
+            ",Mike Williams,TE,120,\n"
+            ",Mike Williams,,90,\n"
+            ",Nobody Atall,WR,7,7\n"
+        )
+        report = RankingImporter(db, chunk_size=2).run(io.StringIO(csv_text))
+
+        assert report["rows"] == 7
+        assert report["matched"] == 5
+        assert report["unmatched"] == 2
+        assert [r["row"] for r in report["unmatched_rows"]] == [6, 7]
+
+        espn = ranks(db, "espn_rank")
+        assert espn["Patrick MahomesQB"] == 3
+        assert espn["Saquon BarkleyRB"] == 1
+        assert espn["Ja'Marr ChaseWR"] == 2
+        assert espn["Kenneth Walker IIIRB"] == 40
+        assert espn["Mike WilliamsTE"] == 120
+        assert espn["Mike WilliamsWR"] is None
+
+        yahoo = ranks(db, "yahoo_rank")
+        assert yahoo["Patrick MahomesQB"] == 5
+        assert yahoo["Saquon BarkleyRB"] is None
+
+    @pytest.mark.unit
+    def test_json_array_and_lines_with_source(self, db: Session, named_players):
+        """Test that both JSON shapes stream into the chosen source column"""
+        array = json.dumps(
+            [{"sleeper_id": "4866", "rank": 4}, {"player": "Ja'Marr Chase", "rank": 9}]
+        )
+        RankingImporter(db).run(io.StringIO(array), fmt="json", source="sleeper")
+        lines = (
+            '{"sleeper_id": "4046", "rank": 11}\n{"sleeper_id": "9999", "rank": 1}\n'
+        )
+        report = RankingImporter(db).run(
+            io.StringIO(lines), fmt="jsonl", source="yahoo"
+        )
+
+        assert report["matched"] == 1 and report["unmatched"] == 1
+        assert ranks(db, "sleeper_rank")["Saquon BarkleyRB"] == 4
+        assert ranks(db, "sleeper_rank")["Ja'Marr ChaseWR"] == 9
+        assert ranks(db, "yahoo_rank")["Patrick MahomesQB"] == 11
+
+    @pytest.mark.unit
+    def test_json_stream_across_chunk_boundaries(self):
+        """Test that objects split across reads decode correctly"""
+        rows = [
+            {"sleeper_id": str(i), "name": f"Player {i} é", "rank": i}
+            for i in range(200)
+        ]
+        stream = io.StringIO(json.dumps(rows, indent=2))
+        assert list(iter_json_objects(stream, chunk_size=7)) == rows
+
+        with pytest.raises(ValueError):
+            list(
+                iter_json_objects(io.StringIO('[{"rank": 1}, {"rank": '), chunk_size=4)
+            )
+        for text in ('[{"rank": 1}, [1, 2]]', '{"rank": 1}\n"x"\n', "[7]"):
+            with pytest.raises(ValueError):
+                list(iter_json_objects(io.StringIO(text)))
+
+    @pytest.mark.unit
+    def test_large_file_in_bounded_memory(self, db: Session, sample_players):
+        """Test that a 50k-row file streams without holding the rows"""
+
+        class Rows(io.RawIOBase):
+            """50k CSV rows generated on demand"""
+
+            def __init__(self):
+                self.lines = (
+                    "sleeper_id,espn_rank\n" if i < 0 else f"sleeper_{i % 80},{i + 1}\n"
+                    for i in range(-1, 50_000)
+                )
+                self.pending = b""
+
+            def readable(self):
+                return True
+
+            def readinto(self, buffer):
+                while len(self.pending) < len(buffer):
+                    line = next(self.lines, None)
+                    if line is None:
+                        break
+                    self.pending += line.encode()
+                size = min(len(buffer), len(self.pending))
+                buffer[:size] = self.pending[:size]
+                self.pending = self.pending[size:]
+                return size
+
+        stream = io.TextIOWrapper(io.BufferedReader(Rows()), newline="")
+        tracemalloc.start()
+        try:
+            report = RankingImporter(db).run(stream)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        assert report["rows"] == 50_000
+        assert report["matched"] == 60 * 50_000 // 80
+        assert report["unmatched"] == 50_000 - report["matched"]
+        assert len(report["unmatched_rows"]) == 50
+        assert peak < 5 * 1024 * 1024
+        assert ranks(db, "espn_rank")["First0 Last0QB"] == 49_921
+
+
+class TestRankingImportEndpoint:
+    """Test POST /api/players/rankings/import"""
+
+    @pytest.mark.unit
+    def test_upload(self, client: TestClient, db: Session, named_players):
+        """Test a CSV upload and rejected files"""
+        files = {
+            "file": (
+                "espn.csv",
+                b"\xef\xbb\xbfname,rank\nPatrick Mahomes,2\n",
+                "text/csv",
+            )
+        }
+        response = client.post(
+            "/api/players/rankings/import", params={"source": "espn"}, files=files
+        )
+        assert response.status_code == 200
+        assert response.json()["matched"] == 1
+        assert ranks(db, "espn_rank")["Patrick MahomesQB"] == 2
+        assert player_catalog.get(db).version == read_catalog_version(db)
+
+        files = {"file": ("ranks.xlsx", b"", "application/octet-stream")}
+        assert (
+            client.post("/api/players/rankings/import", files=files).status_code == 400
+        )
+        files = {"file": ("ranks.json", b'[{"rank": ', "application/json")}
+        assert (
+            client.post("/api/players/rankings/import", files=files).status_code == 400
+        )
+        files = {"file": ("ranks.jsonl", b'{"rank": 1}\n"x"\n', "application/json")}
+        assert (
+            client.post("/api/players/rankings/import", files=files).status_code == 400
+        )
+        response = client.post(
+            "/api/players/rankings/import", params={"source": "cbs"}, files=files
+        )
+        assert response.status_code == 422
@@ -0,0 +1,237 @@
+"""
+Test trending ingestion and rolling aggregates
+"""
+
+import asyncio
+import random
+import threading
+from collections import defaultdict
+
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.config import Settings
+from app.database import Base
+from app.models import Player, TrendingAggregate, TrendingPoll, TrendingSample
+from app.services.trending import (
+    RETENTION_HOURS,
+    WINDOWS,
+    TrendingService,
+    poll_bucket,
+)
+
+
+def aggregates(db: Session, window_hours: int) -> dict:
+    rows = db.query(TrendingAggregate).filter_by(window_hours=window_hours)
+    return {row.sleeper_id: (row.adds, row.drops) for row in rows}
+
+
+class TestTrendingService:
+    """Test the incremental rolling windows"""
+
+    @pytest.mark.unit
+    def test_rolling_windows_match_full_rescan(self, db: Session):
+        """Test that incremental aggregates equal a recount of the raw history"""
+        rng = random.Random(7)
+        service = TrendingService()
+        history = {}  # (bucket, sleeper_id) -> (adds, drops)
+
+        bucket = 480_000
+        for _ in range(60):
+            bucket += rng.choice([0, 1, 1, 3, 20])  # repeats, gaps, long outages
+            counts = {
+                f"p{rng.randrange(15)}": (rng.randrange(50), rng.randrange(20))
+                for _ in range(rng.randrange(1, 8))
+            }
+            service.record(db, bucket, counts)
+            for sleeper_id, value in counts.items():
+                history[(bucket, sleeper_id)] = value
+
+            for window_hours in WINDOWS.values():
+                expected = defaultdict(lambda: [0, 0])
+                for (b, sleeper_id), (adds, drops) in history.items():
+                    if b > bucket - window_hours:
+                        expected[sleeper_id][0] += adds
+                        expected[sleeper_id][1] += drops
+                expected = {k: tuple(v) for k, v in expected.items() if any(v)}
+                assert aggregates(db, window_hours) == expected
+
+        oldest = db.query(TrendingSample.bucket).order_by(TrendingSample.bucket).first()
+        assert oldest[0] > bucket - RETENTION_HOURS
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_ingest_from_sleeper(self, db: Session, mocker):
+        """Test that a poll records adds and drops for the current hour"""
+        api = mocker.Mock()
+        api.get_trending_players = mocker.AsyncMock(
+            side_effect=[
+                [{"player_id": "1", "count": 40}, {"player_id": "2", "count": 5}],
+                [{"player_id": "2", "count": 9}],
+            ]
+        )
+
+        assert await TrendingService(api=api).ingest(db) == 2
+        assert aggregates(db, 24) == {"1": (40, 0), "2": (5, 9)}
+        assert aggregates(db, 168) == {"1": (40, 0), "2": (5, 9)}
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_ingest_writes_off_event_loop(self, db: Session, mocker):
+        """Test that the database part of a poll runs on a worker thread"""
+        api = mocker.Mock()
+        api.get_trending_players = mocker.AsyncMock(return_value=[])
+        service = TrendingService(api=api)
+        threads = []
+        mocker.patch.object(
+            service,
+            "_store",
+            side_effect=lambda *a: threads.append(threading.get_ident()),
+        )
+
+        await service.ingest(db)
+        assert threads and threads[0] != threading.get_ident()
+
+
+class TestPollAlignment:
+    """Test polls land in hourly buckets without counting any hour twice"""
+
+    def _feed(self, mocker, events, clock):
+        """A fake Sleeper feed: counts of events in the hour before the clock"""
+
+        async def trending(type, hours, limit):
+            counts = defaultdict(int)
+            for at, sleeper_id, kind in events:
+                if kind == type and clock["now"] - hours * 3600 <= at < clock["now"]:
+                    counts[sleeper_id] += 1
+            return [{"player_id": k, "count": v} for k, v in counts.items()]
+
+        api = mocker.Mock()
+        api.get_trending_players = mocker.AsyncMock(side_effect=trending)
+        return api
+
+    @pytest.mark.unit
+    def test_poll_bucket(self):
+        """Test top-of-hour polls finish the hour that just ended"""
+        assert poll_bucket(10 * 3600) == (9, 1.0)
+        assert poll_bucket(10 * 3600 + 900) == (10, 0.25)
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_quarter_hour_polls_count_each_event_once(self, db: Session, mocker):
+        """Test 15-minute polls leave final buckets equal to exact hourly counts"""
+        rng = random.Random(3)
+        start = 480_000 * 3600
+        events = [
+            (start + rng.randrange(5 * 3600), f"p{rng.randrange(6)}", kind)
+            for kind in ("add", "drop")
+            for _ in range(400)
+        ]
+        clock = {"now": start}
+        service = TrendingService(api=self._feed(mocker, events, clock))
+
+        for step in range(1, 5 * 4 + 1):
+            clock["now"] = start + step * 900
+            await service.ingest(db, poll_time=clock["now"])
+
+        expected = defaultdict(lambda: [0, 0])
+        for _, sleeper_id, kind in events:
+            expected[sleeper_id][kind == "drop"] += 1
+        expected = {k: tuple(v) for k, v in expected.items()}
+        assert aggregates(db, 24) == expected
+        assert aggregates(db, 168) == expected
+
+    @pytest.mark.unit
+    def test_interval_must_divide_hour(self):
+        """Test a 45-minute interval, whose lookbacks would overlap, is refused"""
+        with pytest.raises(ValidationError):
+            Settings(trending_poll_minutes=45)
+        assert Settings(trending_poll_minutes=15).trending_poll_minutes == 15
+
+    @pytest.mark.unit
+    def test_claim_once_per_slot(self, db: Session):
+        """Test a poll slot can be claimed once, and old claims are pruned"""
+        service = TrendingService()
+        assert service.claim(db, 7200)
+        assert not service.claim(db, 7200)
+        assert service.claim(db, 7200 + RETENTION_HOURS * 3600)
+        assert [row.poll_at for row in db.query(TrendingPoll)] == [
+            7200 + RETENTION_HOURS * 3600
+        ]
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_workers_poll_each_slot_once(self, tmp_path, mocker):
+        """Test two workers' loops ingest a shared slot once, not twice"""
+        engine = create_engine(f"sqlite:///{tmp_path / 'trending.db'}")
+        Base.metadata.create_all(engine)
+        mocker.patch("app.services.trending.SessionLocal", sessionmaker(bind=engine))
+        api = mocker.Mock()
+        api.get_trending_players = mocker.AsyncMock(
+            side_effect=lambda type, hours, limit: (
+                [{"player_id": "1", "count": 4}] if type == "add" else []
+            )
+        )
+        claim = mocker.spy(TrendingService, "claim")
+
+        workers = [
+            asyncio.create_task(TrendingService(api=api).run_periodically(60))
+            for _ in range(2)
+        ]
+        try:
+            for _ in range(500):
+                if claim.call_count == 2 and api.get_trending_players.await_count:
+                    break
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.2)
+        finally:
+            for task in workers:
+                task.cancel()
+
+        with Session(engine) as db:
+            assert aggregates(db, 24) == {"1": (4, 0)}
+            assert db.query(TrendingPoll).count() == 1
+        assert api.get_trending_players.await_count == 2
+        engine.dispose()
+
+    @pytest.mark.unit
+    @pytest.mark.asyncio
+    async def test_loop_refuses_misaligned_interval(self):
+        """Test the ingestion loop also refuses an interval not dividing 60"""
+        with pytest.raises(ValueError):
+            await TrendingService().run_periodically(45)
+
+
+class TestTrendingEndpoint:
+    """Test GET /api/players/trending"""
+
+    @pytest.mark.unit
+    def test_trending_endpoint(
+        self, client: TestClient, db: Session, sample_players: list[Player]
+    ):
+        """Test ordering, player details and window selection"""
+        service = TrendingService()
+        service.record(db, 1000, {"sleeper_0": (5, 1), "sleeper_1": (9, 0)})
+        service.record(db, 1030, {"sleeper_2": (3, 7)})
+
+        data = client.get("/api/players/trending").json()
+        assert [p["sleeper_id"] for p in data] == ["sleeper_2"]
+
+        data = client.get("/api/players/trending", params={"window": "7d"}).json()
+        assert [p["sleeper_id"] for p in data] == [
+            "sleeper_1",
+            "sleeper_0",
+            "sleeper_2",
+        ]
+        assert data[0]["full_name"] == sample_players[1].full_name
+
+        data = client.get(
+            "/api/players/trending", params={"window": "7d", "type": "drop"}
+        ).json()
+        assert [p["net"] for p in data] == [-4, 4]
+
+        response = client.get("/api/players/trending", params={"window": "30d"})
+        assert response.status_code == 422